@@ -0,0 +1 @@
+"""Offline benchmarks against a local mock of the Deepcoin REST and WebSocket APIs (see benchmarks.run)."""
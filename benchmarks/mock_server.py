@@ -0,0 +1,232 @@
+"""
+Local stand-in for api.deepcoin.com and stream.deepcoin.com.
+
+Serves canned REST responses, answers SendTopicAction subscriptions with
+RecvTopicAction and pushes synthetic PushMarketTrade / PushMarketOrder
+bursts on request. Every push carries ``SendTimeNs`` (time.time_ns() when
+it was written) for end-to-end latency.
+
+Run standalone:
+    python -m benchmarks.mock_server --port 8765
+
+or from a benchmark, in a separate process so the server does not compete
+with the code being measured:
+    with MockServerProcess() as server:
+        Client(base_endpoint=server.rest_url)
+        DeepcoinWebsocketManager(server.ws_url)
+        server.burst("PushMarketTrade", 10000)
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+
+SYMBOL = "BTCUSDT"
+INST_ID = "BTC-USDT-SWAP"
+
+
+def _ok(data: Any) -> Dict[str, Any]:
+    return {"code": "0", "msg": "", "data": data}
+
+
+TICKERS = _ok([
+    {
+        "instType": "SWAP", "instId": f"{base}-USDT-SWAP", "last": "65000.5", "lastSz": "0.1",
+        "askPx": "65000.6", "askSz": "12", "bidPx": "65000.4", "bidSz": "9",
+        "open24h": "64000", "high24h": "66000", "low24h": "63500",
+        "volCcy24h": "123456.7", "vol24h": "1900000", "ts": "1700000000000",
+    }
+    for base in ("BTC", "ETH", "SOL", "XRP", "DOGE", "ADA", "LTC", "DOT", "LINK", "AVAX")
+])
+BOOK = _ok({
+    "bids": [[f"{65000 - i * 0.5:.1f}", str(i + 1)] for i in range(25)],
+    "asks": [[f"{65000.5 + i * 0.5:.1f}", str(i + 1)] for i in range(25)],
+})
+CANDLES = _ok([
+    [str(1700000000000 - i * 60000), "65000", "65010", "64990", "65005", "120", "7.8e6", "", "1"]
+    for i in range(100)
+])
+BALANCES = _ok([{"ccy": "USDT", "bal": "1000", "frozenBal": "0", "availBal": "1000"}])
+ORDER = _ok({"ordId": "1000595855275418", "clOrdId": "", "tag": "", "sCode": "0", "sMsg": ""})
+
+ROUTES = {
+    ("GET", "/deepcoin/market/tickers"): TICKERS,
+    ("GET", "/deepcoin/market/books"): BOOK,
+    ("GET", "/deepcoin/market/candles"): CANDLES,
+    ("GET", "/deepcoin/account/balances"): BALANCES,
+    ("POST", "/deepcoin/trade/order"): ORDER,
+}
+
+
+def trade_frame(seq: int) -> str:
+    data = {
+        "InstrumentID": SYMBOL, "Direction": "0" if seq % 2 else "1", "Price": 65000.5 + seq % 10,
+        "Volume": 0.01, "TradeID": str(seq), "TradeTime": int(time.time()), "SendTimeNs": time.time_ns(),
+    }
+    return json.dumps({"action": "PushMarketTrade", "result": [{"table": "Trade", "data": data}]})
+
+
+def orderbook_frame(seq: int, levels: int = 5) -> str:
+    now = time.time_ns()
+    rows = [
+        {
+            "table": "MarketOrder",
+            "data": {
+                "InstrumentID": SYMBOL, "Direction": "0" if i % 2 == 0 else "1",
+                "Price": 65000.0 + (i // 2 + 1) * (-0.5 if i % 2 == 0 else 0.5),
+                "Volume": (seq + i) % 7, "SendTimeNs": now,
+            },
+        }
+        for i in range(levels)
+    ]
+    return json.dumps({"action": "PushMarketOrder", "result": rows})
+
+
+FRAMES = {"PushMarketTrade": trade_frame, "PushMarketOrder": orderbook_frame}
+
+
+class MockDeepcoinServer:
+    """aiohttp application serving REST on ``/deepcoin/...``, WS on ``/public/ws`` and control on ``/_bench``."""
+
+    def __init__(self):
+        self.sockets: List[web.WebSocketResponse] = []
+        self.subscriptions: List[Dict[str, Any]] = []
+        self.app = web.Application()
+        self.app.router.add_route("*", "/deepcoin/{tail:.*}", self._rest)
+        self.app.router.add_get("/public/ws", self._ws)
+        self.app.router.add_get("/public/spotws", self._ws)
+        self.app.router.add_post("/_bench/burst", self._burst)
+        self.app.router.add_get("/_bench/state", self._state)
+
+    async def _rest(self, request: web.Request) -> web.Response:
+        body = ROUTES.get((request.method, request.path))
+        if body is None:
+            return web.json_response({"code": "50001", "msg": "not mocked", "data": None}, status=404)
+        if request.method != "GET":
+            await request.read()
+        return web.json_response(body)
+
+    async def _ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                if msg.data == "ping":
+                    await ws.send_str("pong")
+                    continue
+                action = json.loads(msg.data).get("SendTopicAction")
+                if action:
+                    self.subscriptions.append(action)
+                    ack = {"action": "RecvTopicAction", "result": [
+                        {"table": "Action", "data": {**action, "ErrorID": 0, "ErrorMsg": ""}},
+                    ]}
+                    await ws.send_str(json.dumps(ack))
+        finally:
+            self.sockets.remove(ws)
+        return ws
+
+    async def _burst(self, request: web.Request) -> web.Response:
+        """POST /_bench/burst?action=PushMarketTrade&count=1000 -> pushes to every connected socket."""
+        action = request.query.get("action", "PushMarketTrade")
+        count = int(request.query.get("count", "1000"))
+        build = FRAMES[action]
+        sent = 0
+        for seq in range(count):
+            frame = build(seq)
+            for ws in list(self.sockets):
+                await ws.send_str(frame)
+                sent += 1
+            if seq % 256 == 255:
+                await asyncio.sleep(0)  # let the control response and pings through
+        return web.json_response({"sent": sent})
+
+    async def _state(self, request: web.Request) -> web.Response:
+        return web.json_response({"sockets": len(self.sockets), "subscriptions": len(self.subscriptions)})
+
+
+class MockServerProcess:
+    """Runs the mock server in a child process; ``rest_url`` / ``ws_url`` point at it."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/public/ws"
+
+    def start(self):
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.mock_server", "--host", self.host, "--port", str(self.port)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        line = self._process.stdout.readline()
+        if not line.startswith("listening"):
+            self.stop()
+            raise RuntimeError(f"Mock server failed to start: {line!r}")
+        self.port = int(line.split()[-1])
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait(timeout=5)
+            self._process = None
+
+    def _control(self, method: str, path: str) -> Dict[str, Any]:
+        request = urllib.request.Request(f"{self.rest_url}{path}", method=method)
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return json.loads(response.read())
+
+    def burst(self, action: str, count: int) -> int:
+        """Push ``count`` synthetic ``action`` frames to every connected socket; returns frames sent."""
+        return self._control("POST", f"/_bench/burst?action={action}&count={count}")["sent"]
+
+    def state(self) -> Dict[str, Any]:
+        return self._control("GET", "/_bench/state")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+async def _serve(host: str, port: int):
+    runner = web.AppRunner(MockDeepcoinServer().app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound = runner.addresses[0][1]
+    print(f"listening on {bound}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
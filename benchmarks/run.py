@@ -0,0 +1,271 @@
+"""
+Offline benchmark suite.
+
+Measures REST requests/sec (Client and AsyncClient), request signing cost,
+WS frames/sec through the dispatcher and end-to-end callback latency
+against the local mock server, and writes the results as JSON:
+
+    python -m benchmarks.run                                   # all, -> benchmarks/results/<time>.json
+    python -m benchmarks.run --only signing dispatch --quick
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+With ``--compare``, every metric is compared with the baseline file and
+the exit status is 1 if any got worse by more than ``--threshold``.
+Requires aiohttp (``pip install python-deepcoin[async]``).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from deepcoin.async_client import AsyncClient
+from deepcoin.auth import DeepcoinAuth
+from deepcoin.client import Client
+from deepcoin.utils import codec
+from deepcoin.ws.enums import WSAction
+from deepcoin.ws.manager import DeepcoinWebsocketManager
+
+from .mock_server import SYMBOL, MockServerProcess, orderbook_frame, trade_frame
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# metric name suffix -> whether a larger value is better
+HIGHER_IS_BETTER = {"per_sec": True, "_us": False, "_ms": False}
+
+
+def _stats(samples: List[float], unit: str = "us") -> Dict[str, float]:
+    scale = 1e6 if unit == "us" else 1e3
+    if not samples:
+        return {}
+    values = sorted(samples)
+    pick = lambda q: values[min(len(values) - 1, int(len(values) * q))] * scale  # noqa: E731
+    return {
+        f"p50_{unit}": pick(0.5),
+        f"p99_{unit}": pick(0.99),
+        f"max_{unit}": values[-1] * scale,
+        f"mean_{unit}": sum(values) / len(values) * scale,
+    }
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+
+def bench_signing(n: int) -> Dict[str, Any]:
+    auth = DeepcoinAuth("key", "secret", "passphrase")
+    body = codec.dumps({"instId": "BTC-USDT-SWAP", "tdMode": "cross", "side": "buy", "ordType": "limit", "sz": "1"})
+    start = time.perf_counter()
+    for _ in range(n):
+        auth.sign("POST", "/deepcoin/trade/order", body)
+    elapsed = time.perf_counter() - start
+    return {"signs": n, "sign_us": elapsed / n * 1e6, "signs_per_sec": n / elapsed}
+
+
+def bench_rest(server: MockServerProcess, n: int) -> Dict[str, Any]:
+    client = Client("key", "secret", "passphrase", base_endpoint=server.rest_url)
+    client.get_tickers("SWAP")  # warm the connection pool
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        if i % 2:
+            client.get_balances("SWAP")
+        else:
+            client.get_tickers("SWAP")
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    return {"requests": n, "requests_per_sec": n / elapsed, **_stats(latencies)}
+
+
+def bench_rest_async(server: MockServerProcess, n: int, concurrency: int) -> Dict[str, Any]:
+    async def run():
+        async with AsyncClient("key", "secret", "passphrase", base_endpoint=server.rest_url) as client:
+            await client.get_tickers("SWAP")
+            remaining = iter(range(n))
+            latencies = []
+
+            async def worker():
+                for _ in remaining:
+                    t = time.perf_counter()
+                    await client.get_tickers("SWAP")
+                    latencies.append(time.perf_counter() - t)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return time.perf_counter() - start, latencies
+
+    elapsed, latencies = asyncio.run(run())
+    return {"requests": n, "concurrency": concurrency, "requests_per_sec": n / elapsed, **_stats(latencies)}
+
+
+def bench_dispatch(n: int) -> Dict[str, Any]:
+    """Raw frames fed straight into the connection (connection.feed): decode + manager + dispatcher."""
+    ws = DeepcoinWebsocketManager("ws://127.0.0.1:1/unused")
+    received = [0]
+
+    def on_push(message: dict):
+        received[0] += 1
+
+    ws.register_callback(WSAction.PUSH_LAST_TX, on_push)
+    ws.register_callback(WSAction.PUSH_ORDERBOOK, on_push, symbol=SYMBOL)
+    frames = [trade_frame(i) if i % 2 else orderbook_frame(i) for i in range(1024)]
+    feed = ws.connection.feed
+
+    start = time.perf_counter()
+    for i in range(n):
+        feed(frames[i & 1023])
+    elapsed = time.perf_counter() - start
+    assert received[0] == n, f"dispatched {received[0]} of {n}"
+    return {"frames": n, "frames_per_sec": n / elapsed, "frame_us": elapsed / n * 1e6}
+
+
+def bench_ws_end_to_end(server: MockServerProcess, n: int, timeout: float = 60.0) -> Dict[str, Any]:
+    """Bursts from the mock server through a real socket to a callback; latency is send -> callback."""
+    latencies: List[float] = []
+    done = threading.Event()
+    expected = [n]
+
+    def on_push(message: dict):
+        sent = message["result"][0]["data"].get("SendTimeNs")
+        if sent is not None:
+            latencies.append((time.time_ns() - sent) / 1e9)
+        if len(latencies) >= expected[0]:
+            done.set()
+
+    ws = DeepcoinWebsocketManager(server.ws_url)
+    ws.register_callback(WSAction.PUSH_LAST_TX, on_push)
+    ws.register_callback(WSAction.PUSH_ORDERBOOK, on_push)
+    ws.register_callback(WSAction.RECV_TOPIC_ACTION, lambda message: None)
+    # Subscriptions made before start() are sent once the socket opens.
+    ws.subscribe_trade(SYMBOL)
+    ws.subscribe_orderbook(SYMBOL)
+    ws.start()
+    try:
+        _wait_for(lambda: server.state()["subscriptions"] >= 2, timeout)
+
+        results: Dict[str, Any] = {}
+        for action in (WSAction.PUSH_LAST_TX.value, WSAction.PUSH_ORDERBOOK.value):
+            latencies.clear()
+            done.clear()
+            start = time.perf_counter()
+            expected[0] = server.burst(action, n)
+            if not done.wait(timeout):
+                raise RuntimeError(f"received {len(latencies)} of {expected[0]} {action} frames")
+            elapsed = time.perf_counter() - start
+            results[action] = {"frames": expected[0], "frames_per_sec": expected[0] / elapsed, **_stats(latencies)}
+        return results
+    finally:
+        ws.stop()
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.05)
+    raise TimeoutError("mock server did not see the subscriptions in time")
+
+
+# -------------------------
+# Results
+# -------------------------
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Metrics of ``current`` that are worse than ``baseline`` by more than ``threshold`` (a fraction)."""
+    now, before = _flatten(current["results"]), _flatten(baseline["results"])
+    regressions = []
+    for name, value in sorted(now.items()):
+        old = before.get(name)
+        direction = next((higher for suffix, higher in HIGHER_IS_BETTER.items() if name.endswith(suffix)), None)
+        if direction is None or not old:
+            continue
+        change = (value - old) / old
+        worse = -change if direction else change
+        marker = "REGRESSION" if worse > threshold else ""
+        print(f"{name:60s} {old:14.2f} -> {value:14.2f} {change:+8.1%} {marker}")
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="python-deepcoin offline benchmarks")
+    parser.add_argument("--only", nargs="+", choices=["signing", "rest", "rest_async", "dispatch", "ws"])
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    scale = 10 if args.quick else 1
+    selected = set(args.only or ["signing", "rest", "rest_async", "dispatch", "ws"])
+    results: Dict[str, Any] = {}
+
+    if "signing" in selected:
+        results["signing"] = bench_signing(200_000 // scale)
+    if "dispatch" in selected:
+        results["dispatch"] = bench_dispatch(200_000 // scale)
+    if selected & {"rest", "rest_async", "ws"}:
+        with MockServerProcess() as server:
+            if "rest" in selected:
+                results["rest"] = bench_rest(server, 5_000 // scale)
+            if "rest_async" in selected:
+                results["rest_async"] = bench_rest_async(server, 10_000 // scale, concurrency=50)
+            if "ws" in selected:
+                results["ws"] = bench_ws_end_to_end(server, 50_000 // scale)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "codec": codec.name,
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+NumPy columnar decoding of candles, order books and fills.
+
+Requires numpy (``pip install python-deepcoin[numpy]``). String fields are
+converted column by column inside NumPy (``astype`` on a string array), so
+no Python number object is created per value.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .utils.pagination import page_records
+
+CANDLE_DTYPE = np.dtype([
+    ("ts", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("volume_ccy", "f8"),
+])
+
+BOOK_DTYPE = np.dtype([("price", "f8"), ("size", "f8")])
+
+# output column -> (record key, dtype)
+FILL_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "ts": ("ts", "i8"),
+    "fill_px": ("fillPx", "f8"),
+    "fill_sz": ("fillSz", "f8"),
+    "fee": ("fee", "f8"),
+    "inst_id": ("instId", "U"),
+    "side": ("side", "U"),
+    "pos_side": ("posSide", "U"),
+    "ord_id": ("ordId", "U"),
+    "trade_id": ("tradeId", "U"),
+    "bill_id": ("billId", "U"),
+    "fee_ccy": ("feeCcy", "U"),
+    "exec_type": ("execType", "U"),
+}
+
+
+def _string_matrix(rows: Sequence[Sequence[Any]], width: int, required: int) -> np.ndarray:
+    """
+    rows -> 2-D string array of their first ``width`` columns (C-level conversion).
+    Rows with fewer than ``width`` but at least ``required`` columns are padded with "".
+    """
+    try:
+        matrix = np.array(rows, dtype=np.str_)
+    except ValueError:
+        matrix = None  # ragged rows
+    if matrix is not None and matrix.ndim == 2 and matrix.shape[1] >= width:
+        return matrix[:, :width]
+    short = min(len(row) for row in rows)
+    if short < required:
+        raise ValueError(f"Expected rows with at least {required} columns, got {short}")
+    return np.array([list(row[:width]) + [""] * (width - len(row)) for row in rows], dtype=np.str_)
+
+
+def _to_numeric(column: np.ndarray, dtype: str) -> np.ndarray:
+    if dtype == "i8":
+        column = np.where(column == "", "0", column)
+        # Timestamps may come as "1700000000000" or "1.7e12"-style strings.
+        try:
+            return column.astype(np.int64)
+        except ValueError:
+            return column.astype(np.float64).astype(np.int64)
+    column = np.where(column == "", "nan", column)
+    return column.astype(np.float64)
+
+
+def candles_to_array(response: Any) -> np.ndarray:
+    """get_candles() response (or its rows) -> structured array with CANDLE_DTYPE, oldest first."""
+    rows = page_records(response)
+    out = np.empty(len(rows), dtype=CANDLE_DTYPE)
+    if not rows:
+        return out
+    # ts and OHLC are required; missing volume columns decode to NaN.
+    matrix = _string_matrix(rows, len(CANDLE_DTYPE.names), 5)
+    for i, name in enumerate(CANDLE_DTYPE.names):
+        out[name] = _to_numeric(matrix[:, i], CANDLE_DTYPE[name].str[1:])
+    # The API returns newest first.
+    out.sort(order="ts")
+    return out
+
+
+def book_side_to_array(rows: Sequence[Sequence[Any]]) -> np.ndarray:
+    """[[px, sz, ...], ...] -> structured array with BOOK_DTYPE (price, size), in input order."""
+    out = np.empty(len(rows), dtype=BOOK_DTYPE)
+    if len(rows):
+        matrix = _string_matrix(rows, 2, 2)
+        out["price"] = _to_numeric(matrix[:, 0], "f8")
+        out["size"] = _to_numeric(matrix[:, 1], "f8")
+    return out
+
+
+def book_to_arrays(response: Any) -> Dict[str, np.ndarray]:
+    """get_order_book() response -> {"bids": array, "asks": array}."""
+    data = response.get("data") if isinstance(response, dict) else response
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    return {side: book_side_to_array(data.get(side) or []) for side in ("bids", "asks")}
+
+
+def fills_to_arrays(response: Any) -> Dict[str, np.ndarray]:
+    """get_fills() response (or a list of fill records) -> column name -> array."""
+    records: List[Dict[str, Any]] = page_records(response)
+    keys = [key for key, _ in FILL_COLUMNS.values()]
+    # One pass over the records; missing or null values become "" (NaN, or 0 for ts).
+    rows = [["" if (value := r.get(key)) is None else value for key in keys] for r in records]
+    matrix = np.array(rows, dtype=np.str_).reshape(len(rows), len(keys))
+    columns = {}
+    for i, (name, (_, dtype)) in enumerate(FILL_COLUMNS.items()):
+        if dtype == "U":
+            columns[name] = np.ascontiguousarray(matrix[:, i])
+        else:
+            columns[name] = _to_numeric(matrix[:, i], dtype) if len(rows) else np.empty(0, dtype)
+    return columns
@@ -0,0 +1,253 @@
+import asyncio
+import time
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+from yarl import URL
+
+from .base_client import BaseClient
+from .bulk import BulkResult, cancel_results, chunked
+from .cache import ResponseCache
+from .client import Client
+from .clock import ClockSync
+from .exceptions import (
+    DeepcoinAPIException,
+    DeepcoinRequestException,
+)
+from .metrics import Metrics
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .utils import codec
+from .utils.pagination import paginate_async
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncClient(Client):
+    """
+    asyncio counterpart of :class:`Client`.
+
+    Every public method of ``Client`` is available with the same arguments and
+    validation, but returns an awaitable resolving to the same response dict.
+    All requests share one ``aiohttp`` connection pool, so a single event loop
+    can keep many requests in flight:
+
+        async with AsyncClient(api_key, api_secret, passphrase) as client:
+            balances, positions = await asyncio.gather(
+                client.get_balances("SWAP"),
+                client.get_positions("SWAP"),
+            )
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        passphrase: Optional[str] = None,
+        requests_params: Optional[Dict[str, Any]] = None,
+        base_endpoint: str = BaseClient.BASE_ENDPOINT_DEFAULT,
+        pool_size: int = 100,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        clock: Optional[ClockSync] = None,
+        response_cache: Optional[ResponseCache] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        self._pool_size = pool_size
+        super().__init__(
+            api_key=api_key,
+            api_secret=api_secret,
+            passphrase=passphrase,
+            requests_params=requests_params,
+            base_endpoint=base_endpoint,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            clock=clock,
+            response_cache=response_cache,
+            metrics=metrics,
+        )
+
+    def _init_session(self) -> Optional[aiohttp.ClientSession]:
+        # aiohttp sessions must be created inside a running event loop, see _get_session().
+        return None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self._pool_size)
+            self.session = aiohttp.ClientSession(connector=connector, headers=self._get_headers())
+        return self.session
+
+    async def close(self):
+        """Close the underlying connection pool."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _map_result(self, result, fn):
+        async def mapped():
+            return fn(await result)
+
+        return mapped()
+
+    def _get(self, path, signed=False, version="v1", **kwargs):
+        if self.response_cache is not None and not signed:
+            return self.response_cache.get_or_fetch_async(
+                path,
+                kwargs.get("data") or kwargs.get("params"),
+                lambda: self._request_api("get", path, signed, version, **kwargs),
+            )
+        return self._request_api("get", path, signed, version, **kwargs)
+
+    async def _request_api(
+        self, method, path: str, signed: bool = False, version="v1", idempotent: Optional[bool] = None, **kwargs
+    ):
+        uri = self._create_api_uri(path, version)
+        retry = None
+        if self.retry_policy is not None:
+            retry = self.retry_policy.start(method.lower() == "get" if idempotent is None else idempotent)
+
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(path)
+            for hook in self._before_request:
+                hook(method, path)
+            start = time.perf_counter()
+            try:
+                response = await self._request(method, uri, signed, **kwargs)
+            except Exception as e:
+                if self._after_request:
+                    self._request_done(method, path, start, e)
+                delay = retry.next_delay(e) if retry is not None else None
+                if delay is None:
+                    raise
+                logger.warning(f"{method.upper()} {path} failed ({e}), retry {retry.attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            else:
+                if self._after_request:
+                    self._request_done(method, path, start, None)
+                return response
+
+    async def _request(
+        self, method: str, uri: str, signed: bool = False, force_params: bool = False, **kwargs
+    ):
+        headers = {}
+        if method.upper() in ["POST", "PUT", "DELETE"]:
+            headers.update({"Content-Type": "application/json"})
+
+        if "data" in kwargs and isinstance(kwargs["data"], dict):
+            if "headers" in kwargs["data"]:
+                headers.update(kwargs["data"]["headers"])
+                del kwargs["data"]["headers"]
+        kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
+
+        data = kwargs.pop("data", None)
+        params = kwargs.pop("params", None)
+        body = None
+        if method.upper() == "GET":
+            query = data if data is not None else params
+            if query:
+                uri = f"{uri}?{urlencode(query, doseq=True)}"
+        elif data is not None:
+            body = codec.dumps(data)
+
+        # Pre-encoded so the query string aiohttp sends is byte-identical to the signed one.
+        url = URL(uri, encoded=True)
+        if self.auth is not None:
+            headers.setdefault("Content-Type", "application/json")
+            headers.update(self.auth.sign(method, url.raw_path_qs, body))
+
+        if isinstance(kwargs.get("timeout"), (int, float)):
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=kwargs["timeout"])
+
+        session = await self._get_session()
+        try:
+            sent = time.time()
+            async with session.request(method.upper(), url, headers=headers, data=body, **kwargs) as response:
+                if self.clock is not None:
+                    self.clock.observe_response(sent, time.time(), response.headers.get("Date"))
+                self.response = response
+                return await self._handle_response(response)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise DeepcoinRequestException(f"Request failed: {e!r}") from e
+
+    @staticmethod
+    async def _handle_response(response: aiohttp.ClientResponse):
+        """Handle API responses from the Deepcoin server."""
+        content = await response.read()
+        if not (200 <= response.status < 300):
+            raise DeepcoinAPIException(response, response.status, content.decode("utf-8", "replace"))
+
+        if not content:
+            return {}
+
+        try:
+            data = codec.loads(content)
+        except ValueError:
+            raise DeepcoinRequestException(f"Invalid Response: {content.decode('utf-8', 'replace')}")
+
+        raw_code = data.get("code") or data.get("error_code")
+        if raw_code is None:
+            return data
+
+        if str(raw_code) in ("0", "00000"):
+            return data
+
+        raise DeepcoinAPIException(response, response.status, data=data)
+
+    async def _run_bulk(self, fn, requests_: List[Dict[str, Any]], max_workers: int) -> List[BulkResult]:
+        # place_orders() / replace_orders() are inherited and become awaitable through this override.
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run(request: Dict[str, Any]) -> BulkResult:
+            async with semaphore:
+                try:
+                    return BulkResult(request, response=await fn(**request))
+                except Exception as e:
+                    return BulkResult(request, error=e)
+
+        return list(await asyncio.gather(*(run(request) for request in requests_)))
+
+    async def cancel_orders(self, order_sys_ids: List[str], max_workers: int = 10) -> List[BulkResult]:
+        chunks = [{"order_sys_ids": list(chunk)} for chunk in chunked(order_sys_ids, 50)]
+        results: List[BulkResult] = []
+        for chunk in await self._run_bulk(self.batch_cancel_order, chunks, max_workers):
+            results.extend(cancel_results(chunk.request["order_sys_ids"], chunk.response, chunk.error))
+        return results
+
+    def _paginate(self, fetch_page, next_cursor, cursor=None, key=None, stop=None, prefetch=True):
+        # iter_* methods become async generators: `async for fill in client.iter_fills("SWAP")`.
+        return paginate_async(fetch_page, next_cursor, cursor, key=key, stop=stop, prefetch=prefetch)
+
+    # === Listen Key APIs (Only for private WS) ===
+
+    async def get_listenkey(self) -> str:
+        """
+        GET /deepcoin/listenkey/acquire
+        Get a new listenKey for private WebSocket connection.
+        """
+        resp = await self._get("/deepcoin/listenkey/acquire", signed=True)
+        return resp["data"]["listenkey"]
+
+    async def extend_listenkey(self, listenkey: str) -> str:
+        """
+        GET /deepcoin/listenkey/extend
+        Extend listenKey expiration time (sliding window).
+        """
+        if not listenkey:
+            raise ValueError("listenkey is required")
+
+        resp = await self._get(
+            "/deepcoin/listenkey/extend",
+            signed=True,
+            params={"listenkey": listenkey}
+        )
+        return resp["data"]["listenkey"]
@@ -1,37 +1,67 @@
 import time
 import hmac
-import base64
+import binascii
 from hashlib import sha256
-from urllib.parse import urlparse
+from typing import Callable, Dict, Optional, Union
 import requests
 
-def _iso_timestamp() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+# (millisecond, timestamp string) and (second, "%Y-%m-%dT%H:%M:%S" prefix) of the last call.
+_ts_cache = (-1, "")
+_prefix_cache = (-1, "")
+
+
+def _iso_timestamp(now: Optional[float] = None) -> str:
+    """ISO-8601 UTC timestamp with milliseconds, e.g. 2025-08-15T08:00:00.123Z (cached per millisecond)."""
+    global _ts_cache, _prefix_cache
+    ms = int((time.time() if now is None else now) * 1000)
+    cached_ms, cached = _ts_cache
+    if ms == cached_ms:
+        return cached
+
+    sec, msec = divmod(ms, 1000)
+    cached_sec, prefix = _prefix_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _prefix_cache = (sec, prefix)
+    ts = f"{prefix}.{msec:03d}Z"
+    _ts_cache = (ms, ts)
+    return ts
+
+
+def _request_path(url: str) -> str:
+    """Path plus query string of an absolute URL, without a full urlparse()."""
+    start = url.find("/", url.find("//") + 2)
+    return url[start:] if start != -1 else "/"
+
 
 class DeepcoinAuth(requests.auth.AuthBase):
     def __init__(self, api_key: str, api_secret: str, passphrase: str):
         self.api_key = api_key
         self.api_secret = api_secret.encode()
         self.passphrase = passphrase
+        # Keyed HMAC state computed once; every signature starts from a copy of it.
+        self._hmac = hmac.new(self.api_secret, digestmod=sha256)
+        # Epoch seconds used for DC-ACCESS-TIMESTAMP, e.g. ClockSync.now; local clock if None.
+        self.time_source: Optional[Callable[[], float]] = None
 
     def __call__(self, r: requests.PreparedRequest) -> requests.PreparedRequest:
-        ts = _iso_timestamp()
-
-        parsed = urlparse(r.url)
-        request_path = parsed.path
-        if parsed.query:
-            request_path += "?" + parsed.query
+        r.headers.setdefault("Content-Type", "application/json")
+        r.headers.update(self.sign(r.method, _request_path(r.url), r.body))
+        return r
 
-        body = r.body or ""
-        if isinstance(body, bytes):
-            body = body.decode("utf-8")
+    def sign(self, method: str, request_path: str, body: Union[bytes, str, None] = None) -> Dict[str, str]:
+        """Build the DC-ACCESS-* headers for a request path (including query string) and body."""
+        ts = _iso_timestamp(self.time_source() if self.time_source is not None else None)
 
-        prehash = f"{ts}{r.method.upper()}{request_path}{body}"
-        signature = base64.b64encode(hmac.new(self.api_secret, prehash.encode(), sha256).digest()).decode()
+        mac = self._hmac.copy()
+        mac.update(f"{ts}{method.upper()}{request_path}".encode())
+        if body:
+            mac.update(body if isinstance(body, bytes) else body.encode())
+        signature = binascii.b2a_base64(mac.digest(), newline=False).decode()
 
-        r.headers.setdefault("Content-Type", "application/json")
-        r.headers["DC-ACCESS-KEY"] = self.api_key
-        r.headers["DC-ACCESS-SIGN"] = signature
-        r.headers["DC-ACCESS-TIMESTAMP"] = ts
-        r.headers["DC-ACCESS-PASSPHRASE"] = self.passphrase
-        return r
+        return {
+            "DC-ACCESS-KEY": self.api_key,
+            "DC-ACCESS-SIGN": signature,
+            "DC-ACCESS-TIMESTAMP": ts,
+            "DC-ACCESS-PASSPHRASE": self.passphrase,
+        }
@@ -21,9 +21,13 @@ class BaseClient:
         self.BASE_ENDPOINT = base_endpoint
         self.TIME_UNIT = time_unit
 
-        self.session = self._init_session()
+        self.auth: Optional[DeepcoinAuth] = None
         if self.API_KEY and self.API_SECRET and self.PASSPHRASE:
-            self.session.auth = DeepcoinAuth(self.API_KEY, self.API_SECRET, self.PASSPHRASE)
+            self.auth = DeepcoinAuth(self.API_KEY, self.API_SECRET, self.PASSPHRASE)
+
+        self.session = self._init_session()
+        if self.auth is not None and self.session is not None:
+            self.session.auth = self.auth
 
     def _init_session(self) -> requests.Session:
         s = requests.session()
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .exceptions import DeepcoinAPIException
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one item of a bulk request: the response, or the exception it raised."""
+    request: Any
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _cancel_errors(response: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-order failures reported inside a successful batch-cancel response (orderSysId -> error)."""
+    data = (response or {}).get("data")
+    error_list = data.get("errorList") if isinstance(data, dict) else None
+    errors = {}
+    for item in error_list or []:
+        order_id = item.get("orderSysId") or item.get("OrderSysID") or item.get("ordId")
+        if order_id is not None:
+            errors[str(order_id)] = {"code": item.get("errorCode"), "msg": item.get("errorMsg")}
+    return errors
+
+
+def cancel_results(
+    order_sys_ids: Sequence[str], response: Optional[Dict[str, Any]], error: Optional[Exception]
+) -> List[BulkResult]:
+    """Split one batch-cancel outcome into a BulkResult per order ID."""
+    if error is not None:
+        return [BulkResult(order_id, error=error) for order_id in order_sys_ids]
+    failed = _cancel_errors(response)
+    return [
+        BulkResult(order_id, response=response, error=DeepcoinAPIException(None, 200, data=failed[str(order_id)]))
+        if str(order_id) in failed
+        else BulkResult(order_id, response=response)
+        for order_id in order_sys_ids
+    ]
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# path -> seconds a response stays fresh
+DEFAULT_TTLS: Dict[str, float] = {
+    "/deepcoin/market/tickers": 0.5,
+    "/deepcoin/market/books": 0.1,
+    "/deepcoin/market/instruments": 60.0,
+}
+
+CacheKey = Tuple[str, Hashable]
+
+
+def _freeze(params: Any) -> Hashable:
+    if isinstance(params, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in params.items()))
+    if isinstance(params, (list, tuple)):
+        return tuple(_freeze(v) for v in params)
+    return params
+
+
+class _Flight:
+    """One in-flight request that concurrent identical callers wait on."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """
+    Single-flight coalescing plus a short-TTL LRU cache for unsigned GETs.
+
+    Identical requests (same path and parameters) made while one is in
+    flight wait for it and share its response or exception. Responses of
+    paths listed in ``ttls`` (or any path, with ``default_ttl``) are kept
+    for that many seconds, at most ``maxsize`` entries in LRU order.
+
+    Cached responses are shared between callers and must be treated as
+    read-only.
+
+    Usage:
+        client = Client(response_cache=ResponseCache())
+        client.get_tickers("SWAP")        # miss
+        client.get_tickers("SWAP")        # hit within 0.5 s
+        client.response_cache.stats()
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        maxsize: int = 1024,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()  # key -> (expires, response)
+        self._flights: Dict[CacheKey, _Flight] = {}
+        self._async_flights: Dict[CacheKey, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.coalesced: Counter = Counter()
+        self.evictions = 0
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        return self.ttls.get(path, self.default_ttl)
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+
+    def _lookup(self, key: CacheKey, now: float) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, response = entry
+        if expires <= now:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits[key[0]] += 1
+        return True, response
+
+    def _store(self, key: CacheKey, response: Any):
+        ttl = self.ttl_for(key[0])
+        if not ttl or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_fetch(self, path: str, params: Any, fetch: Callable[[], Any]) -> Any:
+        """Cached response for (path, params), else the result of ``fetch()`` shared with concurrent callers."""
+        key = (path, _freeze(params))
+        with self._lock:
+            found, response = self._lookup(key, time.monotonic())
+            if found:
+                return response
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses[path] += 1
+            else:
+                self.coalesced[path] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None:
+                    self._store(key, flight.result)
+            flight.event.set()
+        return flight.result
+
+    async def get_or_fetch_async(self, path: str, params: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """asyncio variant of get_or_fetch(); waiters share one task's result."""
+        key = (path, _freeze(params))
+        with self._lock:
+            found, response = self._lookup(key, time.monotonic())
+            if found:
+                return response
+            future = self._async_flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._async_flights[key] = asyncio.get_running_loop().create_future()
+                self.misses[path] += 1
+            else:
+                self.coalesced[path] += 1
+
+        if not leader:
+            # shield: one waiter being cancelled must not cancel the shared result.
+            return await asyncio.shield(future)
+
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_flights[key]
+                if not future.cancelled() and future.exception() is None:
+                    self._store(key, future.result())
+
+    # -------------------------
+    # Maintenance / stats
+    # -------------------------
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop cached responses of ``path`` (or all of them)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == path]:
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-path hits, misses, coalesced waits, hit ratio and configured TTL."""
+        paths = set(self.hits) | set(self.misses) | set(self.coalesced)
+        stats = {}
+        for path in sorted(paths):
+            total = self.hits[path] + self.misses[path] + self.coalesced[path]
+            stats[path] = {
+                "hits": self.hits[path],
+                "misses": self.misses[path],
+                "coalesced": self.coalesced[path],
+                "hit_ratio": (self.hits[path] + self.coalesced[path]) / total if total else 0.0,
+                "ttl": self.ttl_for(path),
+            }
+        return stats
@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BAR_MS: Dict[str, int] = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1H": 3_600_000,
+    "4H": 4 * 3_600_000,
+    "12H": 12 * 3_600_000,
+    "1D": 86_400_000,
+    "1W": 7 * 86_400_000,
+}
+
+# Bars open on multiples of their length counted from this point (ms since the epoch, UTC).
+# The epoch was a Thursday; weekly bars open on Monday.
+BAR_ANCHOR_MS: Dict[str, int] = {
+    "1W": 4 * 86_400_000,
+}
+
+# Column name -> (array typecode, index in a candle row [ts, o, h, l, c, vol, volCcy, ...])
+COLUMNS: Dict[str, Tuple[str, int]] = {
+    "ts": ("q", 0),
+    "open": ("d", 1),
+    "high": ("d", 2),
+    "low": ("d", 3),
+    "close": ("d", 4),
+    "volume": ("d", 5),
+    "volume_ccy": ("d", 6),
+}
+
+Columns = Dict[str, array]
+
+
+def _empty_columns() -> Columns:
+    return {name: array(typecode) for name, (typecode, _) in COLUMNS.items()}
+
+
+class CandleStore:
+    """
+    Historical candles backed by a local columnar cache.
+
+    get() splits the requested range into windows of ``window`` bars, fetches
+    the windows concurrently (through the client, so its RateLimiter and
+    RetryPolicy apply) and stores every closed candle on disk, one binary
+    ``array`` file per column under ``cache_dir/<inst_id>/<bar>/``. The cache
+    covers one contiguous time range per (inst_id, bar); later requests only
+    fetch what lies outside it.
+
+    Bars are aligned on the exchange's boundaries: ``utc_offset_hours`` is the
+    time zone daily and longer bars open in (e.g. 8 for UTC+8), weekly bars
+    open on Monday. A returned candle that has not closed yet is never cached,
+    whatever the alignment, and candles off the expected grid are logged.
+
+    Usage:
+        store = CandleStore(Client(rate_limiter=RateLimiter()), "~/.cache/deepcoin")
+        candles = store.get("BTC-USDT-SWAP", "1m", start_ms, end_ms)
+        closes = candles["close"]
+    """
+
+    def __init__(
+        self,
+        client,
+        cache_dir: str,
+        workers: int = 4,
+        window: int = 300,
+        utc_offset_hours: int = 0,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if not 1 <= window <= 300:
+            raise ValueError("window must be within 1..300")
+        if not -12 <= utc_offset_hours <= 14:
+            raise ValueError("utc_offset_hours must be within -12..14")
+        self.client = client
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.workers = workers
+        self.window = window
+        self.utc_offset_ms = int(utc_offset_hours * 3_600_000)
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    def get(self, inst_id: str, bar: str, start: int, end: Optional[int] = None) -> Columns:
+        """
+        Candles with ``start <= ts < end`` (ms, ``end`` defaults to now) in ascending order,
+        as a dict of column name -> array. Missing parts of the range are fetched first.
+        """
+        bar_ms = self._bar_ms(bar)
+        now = int(time.time() * 1000)
+        # Only closed candles are cached: the newest bar is still changing.
+        end = min(self.bar_open(bar, now), now if end is None else end)
+        start = self.bar_open(bar, start)
+        if start >= end:
+            return _empty_columns()
+
+        with self._lock(inst_id, bar):
+            coverage = self._read_meta(inst_id, bar)
+            gaps = self._missing(coverage, start, end)
+            if gaps:
+                fetched = self._fetch(inst_id, bar, bar_ms, gaps)
+                self._check_alignment(inst_id, bar, fetched)
+                # The exchange may close bars on another boundary than expected: a bar that is
+                # still open caps the coverage, so it is fetched again once it has closed.
+                open_from = min((int(row[0]) for row in fetched if int(row[0]) + bar_ms > now), default=end)
+                if open_from < end:
+                    fetched = [row for row in fetched if int(row[0]) < open_from]
+                    end = open_from
+                columns = self._merge(self._read_columns(inst_id, bar), fetched)
+                lo = min([start] + ([coverage[0]] if coverage else []))
+                hi = max([end] + ([coverage[1]] if coverage else []))
+                self._write(inst_id, bar, columns, (lo, hi))
+            else:
+                columns = self._read_columns(inst_id, bar)
+        return self._slice(columns, start, end)
+
+    def bar_open(self, bar: str, ts: int) -> int:
+        """Open time (ms) of the ``bar`` candle containing ``ts``."""
+        bar_ms = self._bar_ms(bar)
+        anchor = BAR_ANCHOR_MS.get(bar, 0) - self.utc_offset_ms
+        return ts - (ts - anchor) % bar_ms
+
+    def cached_range(self, inst_id: str, bar: str) -> Optional[Tuple[int, int]]:
+        """The (start, end) ms range held in the cache, or None."""
+        return self._read_meta(inst_id, bar)
+
+    def clear(self, inst_id: str, bar: str):
+        with self._lock(inst_id, bar):
+            path = self._path(inst_id, bar)
+            for name in list(COLUMNS) + ["meta"]:
+                try:
+                    os.remove(os.path.join(path, self._file(name)))
+                except FileNotFoundError:
+                    pass
+
+    # -------------------------
+    # Fetching
+    # -------------------------
+
+    @staticmethod
+    def _bar_ms(bar: str) -> int:
+        try:
+            return BAR_MS[bar]
+        except KeyError:
+            raise ValueError(f"bar must be one of {list(BAR_MS)}")
+
+    def _check_alignment(self, inst_id: str, bar: str, rows: List[list]):
+        misaligned = [int(row[0]) for row in rows if self.bar_open(bar, int(row[0])) != int(row[0])]
+        if misaligned:
+            logger.warning(
+                f"{len(misaligned)} {inst_id} {bar} candle(s) open off the expected boundary "
+                f"(first at {misaligned[0]}); check utc_offset_hours."
+            )
+
+    @staticmethod
+    def _missing(coverage: Optional[Tuple[int, int]], start: int, end: int) -> List[Tuple[int, int]]:
+        """Ranges to fetch so the cache stays one contiguous block covering [start, end)."""
+        if coverage is None:
+            return [(start, end)]
+        lo, hi = coverage
+        gaps = []
+        if start < lo:
+            gaps.append((start, lo))
+        if end > hi:
+            gaps.append((hi, end))
+        return gaps
+
+    def _fetch(self, inst_id: str, bar: str, bar_ms: int, gaps: List[Tuple[int, int]]) -> List[list]:
+        span = self.window * bar_ms
+        windows = [(ws, min(ws + span, ge)) for gs, ge in gaps for ws in range(gs, ge, span)]
+        logger.info(f"Fetching {len(windows)} candle window(s) for {inst_id} {bar}.")
+
+        def fetch_window(window: Tuple[int, int]) -> List[list]:
+            ws, we = window
+            resp = self.client.get_candles(inst_id, bar=bar, after=we, limit=self.window)
+            return [row for row in resp.get("data") or [] if ws <= int(row[0]) < we]
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="deepcoin-candles") as pool:
+            return [row for rows in pool.map(fetch_window, windows) for row in rows]
+
+    @staticmethod
+    def _merge(columns: Columns, rows: List[list]) -> Columns:
+        """Add fetched rows to the cached columns; fetched ranges never overlap the cached one."""
+        first = columns["ts"][0] if columns["ts"] else None
+        before, after = _empty_columns(), _empty_columns()
+        for ts, row in sorted({int(row[0]): row for row in rows}.items()):
+            out = before if first is not None and ts < first else after
+            for name, (_, index) in COLUMNS.items():
+                if name == "ts":
+                    out[name].append(ts)
+                else:
+                    out[name].append(float(row[index]) if index < len(row) else 0.0)
+        return {name: before[name] + columns[name] + after[name] for name in COLUMNS}
+
+    @staticmethod
+    def _slice(columns: Columns, start: int, end: int) -> Columns:
+        ts = columns["ts"]
+        lo, hi = bisect_left(ts, start), bisect_left(ts, end)
+        return {name: col[lo:hi] for name, col in columns.items()}
+
+    # -------------------------
+    # Cache files
+    # -------------------------
+
+    def _lock(self, inst_id: str, bar: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((inst_id, bar), threading.Lock())
+
+    def _path(self, inst_id: str, bar: str) -> str:
+        return os.path.join(self.cache_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", inst_id), bar)
+
+    @staticmethod
+    def _file(name: str) -> str:
+        return "meta.json" if name == "meta" else f"{name}.bin"
+
+    def _read_meta(self, inst_id: str, bar: str) -> Optional[Tuple[int, int]]:
+        path = self._path(inst_id, bar)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            # A write interrupted between column files leaves them out of step with the metadata.
+            for name, (typecode, _) in COLUMNS.items():
+                if os.path.getsize(os.path.join(path, self._file(name))) != meta["rows"] * array(typecode).itemsize:
+                    logger.warning(f"Candle cache for {inst_id} {bar} is inconsistent, refetching.")
+                    return None
+            return int(meta["start"]), int(meta["end"])
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def _read_columns(self, inst_id: str, bar: str) -> Columns:
+        if self._read_meta(inst_id, bar) is None:
+            return _empty_columns()
+        path = self._path(inst_id, bar)
+        columns = _empty_columns()
+        for name, col in columns.items():
+            filename = os.path.join(path, self._file(name))
+            with open(filename, "rb") as f:
+                col.fromfile(f, os.path.getsize(filename) // col.itemsize)
+        return columns
+
+    def _write(self, inst_id: str, bar: str, columns: Columns, coverage: Tuple[int, int]):
+        path = self._path(inst_id, bar)
+        os.makedirs(path, exist_ok=True)
+        # Columns first, metadata last: a crash leaves the old coverage, never a claim on missing rows.
+        for name, col in columns.items():
+            filename = os.path.join(path, self._file(name))
+            with open(filename + ".tmp", "wb") as f:
+                col.tofile(f)
+            os.replace(filename + ".tmp", filename)
+        filename = os.path.join(path, "meta.json")
+        with open(filename + ".tmp", "w") as f:
+            json.dump({"start": coverage[0], "end": coverage[1], "rows": len(columns["ts"])}, f)
+        os.replace(filename + ".tmp", filename)
@@ -1,12 +1,51 @@
-from typing import Dict, Optional, Any, List
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Any, List, Tuple
 import requests
 
 from .base_client import BaseClient
+from .bulk import BulkResult, cancel_results, chunked
+from .cache import ResponseCache
+from .clock import ClockSync
 from .exceptions import (
     DeepcoinAPIException,
     DeepcoinRequestException,
 )
+from .metrics import Metrics
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .utils import codec
+from .utils.pagination import paginate
 
+logger = logging.getLogger(__name__)
+
+
+def _after_last(limit: int, cursor_of):
+    """Next-page cursor taken from the last record of a full page (a short page is the last one)."""
+    return lambda cursor, records: cursor_of(records[-1]) if len(records) >= limit else None
+
+
+def _bills_after(limit: int):
+    """
+    Inclusive cursor for bills: ``after`` is exclusive, so the next page starts at the last bill's
+    millisecond again (repeats are dropped by billId). A full page that does not get past that
+    millisecond may hide more bills of it, so it raises instead of stopping early.
+    """
+    def next_cursor(cursor, records):
+        if len(records) < limit:
+            return None
+        ts = int(records[-1]["ts"])
+        if ts + 1 == cursor:
+            raise DeepcoinRequestException(
+                f"At least {limit} bills share timestamp {ts}; they cannot be paged by time (use a larger limit)."
+            )
+        return ts + 1
+    return next_cursor
+
+
+def _candle_ts(candle) -> int:
+    return int(candle[0] if isinstance(candle, (list, tuple)) else candle["ts"])
 
 class Client(BaseClient):
     def __init__(
@@ -16,7 +55,27 @@ class Client(BaseClient):
         passphrase: Optional[str] = None,
         requests_params: Optional[Dict[str, Any]] = None,
         base_endpoint: str = BaseClient.BASE_ENDPOINT_DEFAULT,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        clock: Optional[ClockSync] = None,
+        response_cache: Optional[ResponseCache] = None,
+        metrics: Optional[Metrics] = None,
     ):
+        """
+        rate_limiter: optional client-side throttling per endpoint group,
+                      e.g. RateLimiter() for the default limits. May be shared between clients.
+        retry_policy: optional automatic retries of failed requests, e.g. RetryPolicy().
+        clock: optional ClockSync fed by every response; requests are then signed with exchange time.
+        response_cache: optional ResponseCache coalescing and caching identical unsigned GETs.
+        metrics: optional Metrics recording the latency and errors of every request attempt.
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.clock = clock
+        self.response_cache = response_cache
+        self.metrics = metrics
+        self._before_request: Tuple[Callable[[str, str], Any], ...] = ()
+        self._after_request: Tuple[Callable[[str, str, float, Optional[BaseException]], Any], ...] = ()
         super().__init__(
             api_key=api_key,
             api_secret=api_secret,
@@ -24,6 +83,34 @@ class Client(BaseClient):
             requests_params=requests_params,
             base_endpoint=base_endpoint,
         )
+        if self.clock is not None and self.auth is not None:
+            self.auth.time_source = self.clock.now
+        if self.metrics is not None:
+            self.metrics.attach_client(self)
+
+    def add_request_hook(
+        self,
+        before: Optional[Callable[[str, str], Any]] = None,
+        after: Optional[Callable[[str, str, float, Optional[BaseException]], Any]] = None,
+    ):
+        """
+        Run ``before(method, path)`` ahead of every request attempt (retries included) and
+        ``after(method, path, seconds, error)`` once it completes, ``error`` being None on success.
+        Exceptions raised by hooks propagate to the caller.
+        """
+        if before is not None and before not in self._before_request:
+            self._before_request = self._before_request + (before,)
+        if after is not None and after not in self._after_request:
+            self._after_request = self._after_request + (after,)
+
+    def remove_request_hook(self, before=None, after=None):
+        self._before_request = tuple(h for h in self._before_request if h != before)
+        self._after_request = tuple(h for h in self._after_request if h != after)
+
+    def _request_done(self, method: str, path: str, start: float, error: Optional[BaseException]):
+        elapsed = time.perf_counter() - start
+        for hook in self._after_request:
+            hook(method, path, elapsed, error)
 
     def _init_session(self) -> requests.Session:
         headers = self._get_headers()
@@ -46,11 +133,14 @@ class Client(BaseClient):
 
         data = kwargs.pop("data", None)
         if method.upper() == "GET":
-            kwargs["params"] = data
+            kwargs["params"] = data if data is not None else kwargs.get("params")
         else:
-            kwargs["json"] = data
+            kwargs["data"] = codec.dumps(data) if data is not None else None
 
+        sent = time.time()
         self.response = getattr(self.session, method)(uri, headers=headers, **kwargs)
+        if self.clock is not None:
+            self.clock.observe_response(sent, time.time(), self.response.headers.get("Date"))
         return self._handle_response(self.response)
 
     @staticmethod
@@ -59,14 +149,15 @@ class Client(BaseClient):
         if not (200 <= response.status_code < 300):
             raise DeepcoinAPIException(response, response.status_code, response.text)
 
-        if response.text == "":
+        content = response.content
+        if not content:
             return {}
 
         try:
-            data = response.json()
+            data = codec.loads(content)
         except ValueError:
             raise DeepcoinRequestException(f"Invalid Response: {response.text}")
-        
+
         raw_code = data.get("code") or data.get("error_code")
         if raw_code is None:
             return data
@@ -74,9 +165,19 @@ class Client(BaseClient):
         if str(raw_code) in ("0", "00000"):
             return data
 
-        raise DeepcoinAPIException(response, response.status_code, response.text)
+        raise DeepcoinAPIException(response, response.status_code, data=data)
+
+    def _map_result(self, result, fn):
+        """Apply ``fn`` to a request result (AsyncClient applies it once the request completes)."""
+        return fn(result)
 
     def _get(self, path, signed=False, version="v1", **kwargs):
+        if self.response_cache is not None and not signed:
+            return self.response_cache.get_or_fetch(
+                path,
+                kwargs.get("data") or kwargs.get("params"),
+                lambda: self._request_api("get", path, signed, version, **kwargs),
+            )
         return self._request_api("get", path, signed, version, **kwargs)
 
     def _post(self, path, signed=False, version="v1", **kwargs):
@@ -88,9 +189,39 @@ class Client(BaseClient):
     def _delete(self, path, signed=False, version="v1", **kwargs):
         return self._request_api("delete", path, signed, version, **kwargs)
 
-    def _request_api(self, method, path: str, signed: bool = False, version="v1", **kwargs):
+    def _request_api(
+        self, method, path: str, signed: bool = False, version="v1", idempotent: Optional[bool] = None, **kwargs
+    ):
+        """
+        idempotent: whether sending the request twice is harmless (defaults to True for GET);
+                    only idempotent requests are retried when their outcome is unknown.
+        """
         uri = self._create_api_uri(path, version)
-        return self._request(method, uri, signed, **kwargs)
+        retry = None
+        if self.retry_policy is not None:
+            retry = self.retry_policy.start(method.lower() == "get" if idempotent is None else idempotent)
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(path)
+            for hook in self._before_request:
+                hook(method, path)
+            start = time.perf_counter()
+            try:
+                # Every attempt is a new request, so it is signed again with a fresh timestamp.
+                response = self._request(method, uri, signed, **kwargs)
+            except Exception as e:
+                if self._after_request:
+                    self._request_done(method, path, start, e)
+                delay = retry.next_delay(e) if retry is not None else None
+                if delay is None:
+                    raise
+                logger.warning(f"{method.upper()} {path} failed ({e}), retry {retry.attempts - 1} in {delay:.2f}s")
+                time.sleep(delay)
+            else:
+                if self._after_request:
+                    self._request_done(method, path, start, None)
+                return response
     
     # === Account APIs ===
 
@@ -159,16 +290,17 @@ class Client(BaseClient):
         }
         if inst_id:
             payload["instId"] = inst_id
-        return self._post("/deepcoin/account/set-leverage", signed=True, data=payload)
+        return self._post("/deepcoin/account/set-leverage", signed=True, data=payload, idempotent=True)
 
     # === Market APIs ===
 
-    def get_order_book(self, inst_id: str, sz: int):
+    def get_order_book(self, inst_id: str, sz: int, as_arrays: bool = False):
         """
         GET /deepcoin/market/books
         Get order book depth.
         - inst_id: e.g. "BTC-USDT-SWAP"
         - sz: number of depth levels (1..400)
+        - as_arrays: return {"bids": ndarray, "asks": ndarray} with (price, size) fields (requires numpy)
         """
         if not inst_id:
             raise ValueError("inst_id is required")
@@ -176,7 +308,11 @@ class Client(BaseClient):
             raise ValueError("sz must be an integer between 1 and 400")
 
         params = {"instId": inst_id, "sz": sz}
-        return self._get("/deepcoin/market/books", signed=False, data=params)
+        resp = self._get("/deepcoin/market/books", signed=False, data=params)
+        if as_arrays:
+            from .arrays import book_to_arrays
+            return self._map_result(resp, book_to_arrays)
+        return resp
 
     def get_candles(
         self,
@@ -184,6 +320,7 @@ class Client(BaseClient):
         bar: str = "1m",
         after: Optional[int] = None,
         limit: Optional[int] = None,
+        as_arrays: bool = False,
     ):
         """
         GET /deepcoin/market/candles
@@ -191,6 +328,8 @@ class Client(BaseClient):
         - bar: one of {"1m","5m","15m","30m","1H","4H","12H","1D","1W","1M","1Y"}
         - after: request content before this timestamp (ms); use previous response's ts for paging
         - limit: max 300 (default 100)
+        - as_arrays: return a structured ndarray (ts, open, high, low, close, volume, volume_ccy),
+          oldest first (requires numpy)
         """
         if not inst_id:
             raise ValueError("inst_id is required")
@@ -205,7 +344,11 @@ class Client(BaseClient):
         if limit is not None:
             params["limit"] = int(limit)
 
-        return self._get("/deepcoin/market/candles", signed=False, data=params)
+        resp = self._get("/deepcoin/market/candles", signed=False, data=params)
+        if as_arrays:
+            from .arrays import candles_to_array
+            return self._map_result(resp, candles_to_array)
+        return resp
 
     def get_instruments(
         self,
@@ -339,7 +482,8 @@ class Client(BaseClient):
         if sl_trigger_px is not None:
             payload["slTriggerPx"] = sl_trigger_px
 
-        return self._post("/deepcoin/trade/order", signed=True, data=payload)
+        # Without a client order ID a retried order could be filled twice.
+        return self._post("/deepcoin/trade/order", signed=True, data=payload, idempotent=cl_ord_id is not None)
 
     def replace_order(
         self,
@@ -386,7 +530,7 @@ class Client(BaseClient):
             raise ValueError("ord_id is required")
 
         payload = {"instId": inst_id, "ordId": ord_id}
-        return self._post("/deepcoin/trade/cancel-order", signed=True, data=payload)
+        return self._post("/deepcoin/trade/cancel-order", signed=True, data=payload, idempotent=True)
 
     def batch_cancel_order(self, order_sys_ids: List[str]):
         """
@@ -402,7 +546,7 @@ class Client(BaseClient):
             raise ValueError("order_sys_ids cannot exceed 50 items")
 
         payload = {"orderSysIDs": order_sys_ids}
-        return self._post("/deepcoin/trade/batch-cancel-order", signed=True, data=payload)
+        return self._post("/deepcoin/trade/batch-cancel-order", signed=True, data=payload, idempotent=True)
 
     def cancel_all_swap_orders(
         self,
@@ -436,7 +580,7 @@ class Client(BaseClient):
             "IsCrossMargin": int(is_cross_margin),
             "IsMergeMode": int(is_merge_mode),
         }
-        return self._post("/deepcoin/trade/swap/cancel-all", signed=True, data=payload)
+        return self._post("/deepcoin/trade/swap/cancel-all", signed=True, data=payload, idempotent=True)
 
     def get_fills(
         self,
@@ -448,6 +592,7 @@ class Client(BaseClient):
         begin: Optional[int] = None,
         end: Optional[int] = None,
         limit: Optional[int] = None,
+        as_arrays: bool = False,
     ):
         """
         GET /deepcoin/trade/fills
@@ -464,6 +609,7 @@ class Client(BaseClient):
         - begin: start timestamp in ms
         - end: end timestamp in ms
         - limit: number of records (1–100, default 100)
+        - as_arrays: return a dict of column name -> ndarray (requires numpy)
         """
         if inst_type not in {"SPOT", "SWAP"}:
             raise ValueError('inst_type must be "SPOT" or "SWAP"')
@@ -486,7 +632,11 @@ class Client(BaseClient):
         if limit is not None:
             params["limit"] = int(limit)
 
-        return self._get("/deepcoin/trade/fills", signed=True, data=params)
+        resp = self._get("/deepcoin/trade/fills", signed=True, data=params)
+        if as_arrays:
+            from .arrays import fills_to_arrays
+            return self._map_result(resp, fills_to_arrays)
+        return resp
 
     def get_order_by_id(
         self,
@@ -744,6 +894,141 @@ class Client(BaseClient):
 
         return self._post("/deepcoin/trade/replace-order-sltp", signed=True, data=payload)
 
+    # === Bulk trade APIs ===
+
+    @staticmethod
+    def _run_item(fn, request: Dict[str, Any]) -> BulkResult:
+        try:
+            return BulkResult(request, response=fn(**request))
+        except Exception as e:
+            return BulkResult(request, error=e)
+
+    def _run_bulk(self, fn, requests_: List[Dict[str, Any]], max_workers: int) -> List[BulkResult]:
+        if not requests_:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests_))) as pool:
+            return list(pool.map(lambda request: self._run_item(fn, request), requests_))
+
+    def place_orders(self, orders: List[Dict[str, Any]], max_workers: int = 10) -> List[BulkResult]:
+        """
+        Place many orders concurrently (each item holds place_order() keyword arguments).
+
+        Requests still pass through the client's rate limiter. Returns one BulkResult per
+        order, in input order; a failing order does not stop the others.
+        """
+        return self._run_bulk(self.place_order, orders, max_workers)
+
+    def replace_orders(self, replacements: List[Dict[str, Any]], max_workers: int = 10) -> List[BulkResult]:
+        """Amend many orders concurrently (each item holds replace_order() keyword arguments)."""
+        return self._run_bulk(self.replace_order, replacements, max_workers)
+
+    def cancel_orders(self, order_sys_ids: List[str], max_workers: int = 10) -> List[BulkResult]:
+        """
+        Cancel any number of orders: IDs are sent in batch-cancel chunks of 50, chunks in parallel.
+        Returns one BulkResult per order ID, including orders rejected inside a successful batch.
+        """
+        chunks = [{"order_sys_ids": list(chunk)} for chunk in chunked(order_sys_ids, 50)]
+        results: List[BulkResult] = []
+        for chunk in self._run_bulk(self.batch_cancel_order, chunks, max_workers):
+            results.extend(cancel_results(chunk.request["order_sys_ids"], chunk.response, chunk.error))
+        return results
+
+    # === Paginated history ===
+
+    def _paginate(self, fetch_page, next_cursor, cursor=None, key=None, stop=None, prefetch=True):
+        # With prefetch, the next page is fetched on a worker thread through this client's session.
+        return paginate(fetch_page, next_cursor, cursor, key=key, stop=stop, prefetch=prefetch)
+
+    def iter_fills(
+        self,
+        inst_type: str,
+        inst_id: Optional[str] = None,
+        ord_id: Optional[str] = None,
+        begin: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: int = 100,
+        prefetch: bool = True,
+    ):
+        """
+        Iterate over all fills (newest first), following the `after` (billId) cursor.
+        With `prefetch` the next page is requested in the background while the current one is consumed.
+        """
+        return self._paginate(
+            lambda after: self.get_fills(
+                inst_type, inst_id=inst_id, ord_id=ord_id, after=after, begin=begin, end=end, limit=limit
+            ),
+            _after_last(limit, lambda fill: fill["billId"]),
+            prefetch=prefetch,
+        )
+
+    def iter_orders_history(
+        self,
+        inst_type: str,
+        inst_id: Optional[str] = None,
+        ord_type: Optional[str] = None,
+        state: Optional[str] = None,
+        limit: int = 100,
+        prefetch: bool = True,
+    ):
+        """Iterate over all historical orders (newest first), following the `after` (ordId) cursor."""
+        return self._paginate(
+            lambda after: self.get_orders_history(
+                inst_type, inst_id=inst_id, ord_type=ord_type, state=state, after=after, limit=limit
+            ),
+            _after_last(limit, lambda order: order["ordId"]),
+            prefetch=prefetch,
+        )
+
+    def iter_bills(
+        self,
+        inst_type: str,
+        ccy: Optional[str] = None,
+        type: Optional[str] = None,
+        limit: int = 100,
+        prefetch: bool = True,
+    ):
+        """
+        Iterate over all bills (newest first), following the `after` timestamp.
+        Pages overlap by one millisecond so bills sharing a timestamp are not lost; duplicates are skipped.
+        Raises DeepcoinRequestException if `limit` or more bills share one millisecond.
+        """
+        return self._paginate(
+            lambda after: self.get_bills(inst_type, ccy=ccy, type=type, after=after, limit=limit),
+            _bills_after(limit),
+            key=lambda bill: bill.get("billId"),
+            prefetch=prefetch,
+        )
+
+    def iter_candles(
+        self,
+        inst_id: str,
+        bar: str = "1m",
+        after: Optional[int] = None,
+        begin: Optional[int] = None,
+        limit: int = 300,
+        prefetch: bool = True,
+    ):
+        """
+        Iterate over candles (newest first) older than `after` (ms, default: now),
+        stopping before the first candle older than `begin` (ms).
+        """
+        return self._paginate(
+            lambda cursor: self.get_candles(inst_id, bar=bar, after=cursor, limit=limit),
+            _after_last(limit, _candle_ts),
+            cursor=after,
+            stop=(lambda candle: _candle_ts(candle) < begin) if begin is not None else None,
+            prefetch=prefetch,
+        )
+
+    def iter_funding_rate_history(self, inst_id: str, size: int = 100, prefetch: bool = True):
+        """Iterate over the full funding rate history of an instrument, page by page."""
+        return self._paginate(
+            lambda page: self.get_funding_rate_history(inst_id, page=page, size=size),
+            lambda page, records: page + 1 if len(records) >= size else None,
+            cursor=1,
+            prefetch=prefetch,
+        )
+
     # === Listen Key APIs (Only for private WS) ===
 
     def get_listenkey(self) -> str:
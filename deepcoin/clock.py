@@ -0,0 +1,204 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from statistics import median
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Push fields that may carry the exchange event time (seconds or milliseconds).
+DEFAULT_TIMESTAMP_FIELDS: Tuple[str, ...] = ("UpdateMilliTime", "TradeTime", "UpdateTime", "InsertTime", "CreateTime")
+
+
+def push_timestamp(message: dict, fields: Iterable[str] = DEFAULT_TIMESTAMP_FIELDS) -> Optional[float]:
+    """Exchange event time of a WS push in epoch seconds, or None if it carries none."""
+    result = message.get("result")
+    data = result[0].get("data") if isinstance(result, list) and result and isinstance(result[0], dict) else None
+    if not isinstance(data, dict):
+        return None
+    for name in fields:
+        value = data.get(name)
+        if value in (None, "", 0, "0"):
+            continue
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        return value / 1000.0 if value > 1e11 else value
+    return None
+
+
+class ClockSync:
+    """
+    Estimates the offset between the local clock and the exchange clock.
+
+    Every observation bounds the offset (server time - local time):
+      - a REST response with a ``Date`` header (1 s resolution) sent at
+        ``sent`` and received at ``received`` gives
+        ``date - received <= offset < date + 1 - sent``;
+      - a server timestamp stamped before ``received`` (REST ``ts`` fields,
+        WS pushes) gives ``timestamp - received <= offset``.
+    The estimate is the middle of the intersection of the most recent bounds,
+    so it gets tighter than the header resolution as samples accumulate and
+    follows drift as old samples leave the window.
+
+    Pass it to ``Client(clock=...)`` to sample every response and sign with
+    the corrected time; attach() it to a WS manager for one-way push latency.
+    """
+
+    def __init__(self, window: int = 32, interval: float = 60.0, latency_window: int = 1000):
+        self.interval = interval
+        self._bounds: Deque[Tuple[float, float]] = deque(maxlen=window)       # REST (lower, upper)
+        self._lower_bounds: Deque[float] = deque(maxlen=window * 8)          # one-sided, from pushes
+        self._rtts: Deque[float] = deque(maxlen=window)
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+
+        self.offset = 0.0
+        self.lower = -math.inf
+        self.upper = math.inf
+        self.samples = 0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------
+    # Corrected time
+    # -------------------------
+
+    def now(self) -> float:
+        """Exchange time estimate in epoch seconds (drop-in for time.time())."""
+        return time.time() + self.offset
+
+    @property
+    def uncertainty(self) -> float:
+        """Half-width of the offset interval in seconds (inf until bounded on both sides)."""
+        return (self.upper - self.lower) / 2
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """Median REST round-trip time in seconds."""
+        with self._lock:
+            return median(self._rtts) if self._rtts else None
+
+    # -------------------------
+    # Observations
+    # -------------------------
+
+    def observe_response(self, sent: float, received: float, date_header: Optional[str]):
+        """Sample a REST exchange: local send/receive times and the response ``Date`` header."""
+        if not date_header:
+            return
+        try:
+            server = parsedate_to_datetime(date_header).timestamp()
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._bounds.append((server - received, server + 1.0 - sent))
+            self._rtts.append(received - sent)
+            self._update()
+
+    def observe_server_time(self, server_time: float, received: float, sent: Optional[float] = None):
+        """Sample a precise server timestamp (epoch seconds) created before ``received`` (and after ``sent``)."""
+        with self._lock:
+            if sent is None:
+                self._lower_bounds.append(server_time - received)
+            else:
+                self._bounds.append((server_time - received, server_time - sent))
+            self._update()
+
+    def observe_push(self, server_time: float, received: Optional[float] = None) -> float:
+        """Record a WS push stamped ``server_time``; returns its one-way latency estimate in seconds."""
+        received = time.time() if received is None else received
+        with self._lock:
+            self._lower_bounds.append(server_time - received)
+            self._update()
+            latency = received + self.offset - server_time
+            self._latencies.append(latency)
+        return latency
+
+    def _update(self):
+        lower, upper = -math.inf, math.inf
+        # Newest first: stop before a sample that contradicts the newer ones (clock stepped or drifted).
+        for lo, hi in reversed(self._bounds):
+            if max(lower, lo) > min(upper, hi):
+                break
+            lower, upper = max(lower, lo), min(upper, hi)
+        if self._lower_bounds:
+            lower = max(lower, min(max(self._lower_bounds), upper))
+
+        self.lower, self.upper = lower, upper
+        self.samples += 1
+        if math.isinf(lower) and math.isinf(upper):
+            return
+        if math.isinf(upper):
+            self.offset = lower
+        elif math.isinf(lower):
+            self.offset = upper
+        else:
+            self.offset = (lower + upper) / 2
+
+    # -------------------------
+    # WS latency
+    # -------------------------
+
+    def attach(self, manager, timestamp_getter: Callable[[dict], Optional[float]] = push_timestamp):
+        """Measure one-way latency of every public push handled by ``manager`` (a WS manager or pool)."""
+        from .ws.enums import WSAction
+
+        def on_push(message: dict):
+            server_time = timestamp_getter(message)
+            if server_time is not None:
+                self.observe_push(server_time)
+
+        for action in (WSAction.PUSH_MARKET_DATA, WSAction.PUSH_LAST_TX, WSAction.PUSH_KLINE, WSAction.PUSH_ORDERBOOK):
+            manager.register_callback(action, on_push)
+        return on_push
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Count, last, min, mean, p50 and p99 of recent push latencies (seconds)."""
+        with self._lock:
+            values = sorted(self._latencies)
+            last = self._latencies[-1] if self._latencies else None
+        if not values:
+            return {"count": 0}
+        return {
+            "count": len(values),
+            "last": last,
+            "min": values[0],
+            "mean": sum(values) / len(values),
+            "p50": values[len(values) // 2],
+            "p99": values[min(len(values) - 1, int(len(values) * 0.99))],
+        }
+
+    # -------------------------
+    # Background refresh
+    # -------------------------
+
+    def start(self, probe: Callable[[], Any]):
+        """
+        Call ``probe`` (any request through a Client created with ``clock=self``,
+        e.g. ``lambda: client.get_order_book("BTC-USDT-SWAP", 1)``) every ``interval``
+        seconds so the estimate stays fresh when the client is otherwise idle.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_forever, args=(probe,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _refresh_forever(self, probe: Callable[[], Any]):
+        while True:
+            try:
+                probe()
+            except Exception as e:
+                logger.warning(f"Clock sync probe failed: {e}")
+            logger.debug(f"Clock offset {self.offset * 1000:.1f} ms (+/- {self.uncertainty * 1000:.1f} ms).")
+            if self._stop_event.wait(self.interval):
+                return
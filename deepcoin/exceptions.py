@@ -1,5 +1,7 @@
 from typing import Dict
 
+from .utils import codec
+
 _DEEPCOIN_ERROR_MAP: Dict[int, str] = {
     50100: "API has been frozen, please contact customer service",
     50101: "APIKey does not match the current environment",
@@ -22,18 +24,19 @@ _DEEPCOIN_ERROR_MAP: Dict[int, str] = {
 class DeepcoinAPIException(Exception):
     """Exception for API response errors (include HTTP non 2xx or JSON code != '0')"""
 
-    def __init__(self, response, status_code=None, text=None):
+    def __init__(self, response, status_code=None, text=None, data=None):
         self.status_code = status_code or response.status_code
         self.response = response
         self.code = None
         self.message = None
 
         try:
-            json_res = response.json()
+            # `data` is the already decoded body, so error paths do not parse it twice.
+            json_res = data if data is not None else codec.loads(text if text is not None else response.content)
             self.code = json_res.get("code") or json_res.get("error_code")
             self.message = json_res.get("msg") or json_res.get("message") or str(json_res)
         except ValueError:
-            self.message = text or response.text
+            self.message = text if text is not None else response.text
 
         super().__init__(self.__str__())
 
@@ -47,6 +50,15 @@ class DeepcoinRequestException(Exception):
         super().__init__(message)
 
 
+class DeepcoinRateLimitException(DeepcoinRequestException):
+    """Raised when the client-side rate limiter refuses a request"""
+
+    def __init__(self, path, retry_after):
+        self.path = path
+        self.retry_after = retry_after
+        super().__init__(f"Rate limit reached for {path}, retry after {retry_after:.3f}s")
+
+
 class NotImplementedException(Exception):
     """Raised when a feature or method is not implemented"""
     pass
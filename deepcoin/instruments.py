@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_EVEN
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Number = Union[Decimal, float, int, str]
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if value in (None, ""):
+        return None
+    return Decimal(str(value))
+
+
+class Quantizer:
+    """Rounds values to a multiple of ``step`` (a tick or lot size); precomputed once per instrument."""
+
+    __slots__ = ("step", "_exponent")
+
+    def __init__(self, step: Decimal):
+        if step <= 0:
+            raise ValueError("step must be > 0")
+        self.step = step
+        # Power-of-ten steps (0.1, 0.01, 1, ...) need a single quantize(); others divide first.
+        digits = step.normalize().as_tuple()
+        self._exponent = Decimal(1).scaleb(digits.exponent) if digits.digits == (1,) else None
+
+    def __call__(self, value: Number, rounding: str = ROUND_HALF_EVEN) -> Decimal:
+        value = value if isinstance(value, Decimal) else Decimal(str(value))
+        if self._exponent is not None:
+            return value.quantize(self._exponent, rounding=rounding)
+        return (value / self.step).to_integral_value(rounding=rounding) * self.step
+
+    def is_valid(self, value: Number) -> bool:
+        value = value if isinstance(value, Decimal) else Decimal(str(value))
+        return value % self.step == 0
+
+    def __repr__(self):
+        return f"Quantizer({self.step})"
+
+
+@dataclass(frozen=True)
+class Instrument:
+    """One tradable product, with every ID form the REST and WS APIs use for it."""
+    inst_id: str                   # REST ID, e.g. "BTC-USDT-SWAP" / "BTC-USDT"
+    inst_type: str                 # "SWAP" | "SPOT"
+    ws_symbol: str                 # WS FilterValue / cancel-all ID, e.g. "BTCUSDT" / "BTC/USDT"
+    product_group: Optional[str]   # "SwapU" (USDT-margined) | "Swap" (coin-margined) | None for spot
+    base_ccy: str
+    quote_ccy: str
+    tick_size: Decimal
+    lot_size: Decimal
+    min_size: Optional[Decimal] = None
+    ct_val: Optional[Decimal] = None
+    raw: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+    price_quantizer: Quantizer = field(init=False, compare=False, repr=False)
+    size_quantizer: Quantizer = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "price_quantizer", Quantizer(self.tick_size))
+        object.__setattr__(self, "size_quantizer", Quantizer(self.lot_size))
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "Instrument":
+        inst_id = data["instId"]
+        inst_type = data.get("instType") or ("SWAP" if inst_id.upper().endswith("-SWAP") else "SPOT")
+        parts = inst_id.split("-")
+        base = data.get("baseCcy") or parts[0]
+        quote = data.get("quoteCcy") or (parts[1] if len(parts) > 1 else "")
+        if inst_type == "SWAP":
+            ws_symbol = f"{base}{quote}"
+            product_group = "SwapU" if quote.upper() == "USDT" else "Swap"
+        else:
+            ws_symbol = f"{base}/{quote}"
+            product_group = None
+        return cls(
+            inst_id=inst_id,
+            inst_type=inst_type,
+            ws_symbol=ws_symbol,
+            product_group=product_group,
+            base_ccy=base,
+            quote_ccy=quote,
+            tick_size=_decimal(data.get("tickSz")) or Decimal(1),
+            lot_size=_decimal(data.get("lotSz")) or Decimal(1),
+            min_size=_decimal(data.get("minSz")),
+            ct_val=_decimal(data.get("ctVal")),
+            raw=data,
+        )
+
+    def round_price(self, px: Number, rounding: str = ROUND_HALF_EVEN) -> Decimal:
+        return self.price_quantizer(px, rounding)
+
+    def round_size(self, sz: Number, rounding: str = ROUND_DOWN) -> Decimal:
+        """Size rounded to the lot size (down by default, so it never exceeds the intended amount)."""
+        return self.size_quantizer(sz, rounding)
+
+    def format_price(self, px: Number, rounding: str = ROUND_HALF_EVEN) -> str:
+        """Price as the string place_order() expects."""
+        return format(self.round_price(px, rounding), "f")
+
+    def format_size(self, sz: Number, rounding: str = ROUND_DOWN) -> str:
+        return format(self.round_size(sz, rounding), "f")
+
+
+class InstrumentRegistry:
+    """
+    In-memory index of ``get_instruments`` for SPOT and SWAP.
+
+    Instruments are looked up in O(1) by REST ID ("BTC-USDT-SWAP") or WS
+    symbol ("BTCUSDT", "BTC/USDT"), case-insensitively. The index is loaded on
+    first use and, once start() is called, reloaded every ``ttl`` seconds on a
+    background thread; a failed reload keeps the previous index.
+
+    Usage:
+        registry = InstrumentRegistry(client)
+        registry.start()
+        inst = registry["BTCUSDT"]
+        client.place_order(inst.inst_id, ..., px=inst.format_price(px), sz=inst.format_size(sz))
+    """
+
+    def __init__(self, client, inst_types: Iterable[str] = ("SPOT", "SWAP"), ttl: float = 3600.0):
+        self.client = client
+        self.inst_types = tuple(inst_types)
+        self.ttl = ttl
+        self._by_key: Dict[str, Instrument] = {}
+        self._instruments: List[Instrument] = []
+        self.loaded_at: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------
+    # Loading
+    # -------------------------
+
+    def refresh(self):
+        """Reload every instrument type and swap in the new index at once."""
+        with self._load_lock:
+            instruments = []
+            for inst_type in self.inst_types:
+                resp = self.client.get_instruments(inst_type)
+                for data in resp.get("data") or []:
+                    try:
+                        instruments.append(Instrument.from_api(data))
+                    except (KeyError, ArithmeticError, ValueError) as e:
+                        logger.debug(f"Skipping instrument {data.get('instId')}: {e!r}")
+
+            by_key: Dict[str, Instrument] = {}
+            for inst in instruments:
+                by_key[inst.ws_symbol.upper()] = inst
+            for inst in instruments:
+                # REST IDs win over WS symbols if the two ever collide.
+                by_key[inst.inst_id.upper()] = inst
+
+            self._by_key = by_key
+            self._instruments = instruments
+            self.loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(instruments)} instruments.")
+
+    def _ensure_loaded(self):
+        if self.loaded_at is None:
+            self.refresh()
+
+    def start(self):
+        """Load now and keep refreshing every ``ttl`` seconds in the background."""
+        self._ensure_loaded()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _refresh_forever(self):
+        while not self._stop_event.wait(self.ttl):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Instrument refresh failed, keeping previous data: {e}")
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+
+    def get(self, key: str) -> Optional[Instrument]:
+        """Instrument by REST ID or WS symbol, or None."""
+        self._ensure_loaded()
+        return self._by_key.get(key.upper())
+
+    def __getitem__(self, key: str) -> Instrument:
+        inst = self.get(key)
+        if inst is None:
+            raise KeyError(key)
+        return inst
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._instruments)
+
+    def instruments(self, inst_type: Optional[str] = None) -> List[Instrument]:
+        self._ensure_loaded()
+        return [i for i in self._instruments if inst_type is None or i.inst_type == inst_type]
+
+    def to_ws_symbol(self, key: str) -> str:
+        """e.g. "BTC-USDT-SWAP" -> "BTCUSDT" (for subscribe_* and build_filter_value)."""
+        return self[key].ws_symbol
+
+    def to_inst_id(self, key: str) -> str:
+        """e.g. "BTCUSDT" -> "BTC-USDT-SWAP"."""
+        return self[key].inst_id
+
+    def product_group(self, key: str) -> Optional[str]:
+        """Product group as cancel_all_swap_orders() expects it ("SwapU" / "Swap"), None for spot."""
+        return self[key].product_group
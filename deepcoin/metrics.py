@@ -0,0 +1,333 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency buckets: 1 us to ~134 s, 8 buckets per doubling (<= 9 % relative error).
+BUCKET_BOUNDS: Tuple[float, ...] = tuple(1e-6 * 2 ** (i / 8) for i in range(217))
+
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """
+    Latencies of the last ``window`` seconds in log-spaced buckets.
+
+    The window is split in ``slots`` sub-histograms that are recycled as
+    time passes, so recording is a bisect and a few increments and old
+    samples age out without being stored. ``count`` and ``sum`` are totals
+    since creation.
+    """
+
+    def __init__(self, window: float = 60.0, slots: int = 6):
+        self.window = window
+        self._slot_seconds = window / slots
+        self._slots = [[0] * (len(BUCKET_BOUNDS) + 1) for _ in range(slots)]
+        self._slot_ids = [-1] * slots
+        self._slot_max = [0.0] * slots
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, seconds: float):
+        slot_id = int(time.monotonic() / self._slot_seconds)
+        i = slot_id % len(self._slots)
+        with self._lock:
+            if self._slot_ids[i] != slot_id:
+                self._slots[i] = [0] * (len(BUCKET_BOUNDS) + 1)
+                self._slot_ids[i] = slot_id
+                self._slot_max[i] = 0.0
+            self._slots[i][bisect_left(BUCKET_BOUNDS, seconds)] += 1
+            if seconds > self._slot_max[i]:
+                self._slot_max[i] = seconds
+            self.count += 1
+            self.sum += seconds
+
+    def _live(self) -> Tuple[List[int], float]:
+        """Merged bucket counts and max of the slots still inside the window."""
+        oldest = int(time.monotonic() / self._slot_seconds) - len(self._slots) + 1
+        merged = [0] * (len(BUCKET_BOUNDS) + 1)
+        peak = 0.0
+        with self._lock:
+            for slot, slot_id, slot_max in zip(self._slots, self._slot_ids, self._slot_max):
+                if slot_id < oldest:
+                    continue
+                merged = [a + b for a, b in zip(merged, slot)]
+                peak = max(peak, slot_max)
+        return merged, peak
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Windowed count, p50/p90/p99 (bucket upper bounds, capped at max) and max, plus lifetime totals."""
+        buckets, peak = self._live()
+        n = sum(buckets)
+        stats: Dict[str, Any] = {"count": n, "total_count": self.count, "total_sum": self.sum}
+        if not n:
+            return stats
+        for q in QUANTILES:
+            rank = q * n
+            seen = 0
+            for index, c in enumerate(buckets):
+                seen += c
+                if seen >= rank:
+                    break
+            bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else peak
+            stats[f"p{round(q * 100)}"] = min(bound, peak)
+        stats["max"] = peak
+        return stats
+
+
+class RateMeter:
+    """Events (or bytes) per second over the last ``window`` whole seconds, from per-second counters."""
+
+    def __init__(self, window: int = 10):
+        self.window = window
+        self._counts = [0] * (window + 1)
+        self._second = int(time.monotonic())
+        self._started = self._second
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def _advance(self, second: int):
+        if second == self._second:
+            return
+        if second - self._second > self.window:
+            self._counts = [0] * (self.window + 1)
+        else:
+            for s in range(self._second + 1, second + 1):
+                self._counts[s % (self.window + 1)] = 0
+        self._second = second
+
+    def add(self, n: int = 1):
+        second = int(time.monotonic())
+        with self._lock:
+            self._advance(second)
+            self._counts[second % (self.window + 1)] += n
+            self.total += n
+
+    def rate(self) -> float:
+        second = int(time.monotonic())
+        with self._lock:
+            self._advance(second)
+            # The current second is still filling up; only count whole ones.
+            complete = sum(self._counts) - self._counts[second % (self.window + 1)]
+        elapsed = min(self.window, second - self._started)
+        return complete / elapsed if elapsed > 0 else 0.0
+
+
+class Metrics:
+    """
+    Latency and throughput instrumentation of REST and WS hot paths.
+
+    Records, per ``(method, path)``, the latency of every REST attempt and
+    its failures; per WS action, the time spent dispatching each message
+    to callbacks; and messages/s, bytes/s (characters for text frames) and
+    reconnects of attached WS managers. Everything is fed by the hooks of
+    Client, WebSocketConnection and MessageDispatcher.
+
+    Usage:
+        metrics = Metrics()
+        client = Client(api_key, api_secret, passphrase, metrics=metrics)
+        ws = DeepcoinWebsocketManager(PUBLIC_FUTURES_WS_ENDPOINT)
+        metrics.attach(ws)
+        metrics.snapshot()["rest"]["GET /deepcoin/market/tickers"]["p99"]
+        metrics.serve(9464)               # Prometheus scrape endpoint
+    """
+
+    def __init__(self, window: float = 60.0, rate_window: int = 10):
+        self.window = window
+        self.rate_window = rate_window
+        self.rest: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.rest_errors: Counter = Counter()
+        self.ws_dispatch: Dict[str, LatencyHistogram] = {}
+        self.ws_messages = RateMeter(rate_window)
+        self.ws_bytes = RateMeter(rate_window)
+        self._managers: List[Any] = []
+        self._health: List[Any] = []
+        self._lock = threading.Lock()
+
+    def _histogram(self, table: Dict[Any, LatencyHistogram], key: Any) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, LatencyHistogram(self.window))
+        return histogram
+
+    # -------------------------
+    # Hooks
+    # -------------------------
+
+    def observe_request(self, method: str, path: str, seconds: float, error: Optional[BaseException] = None):
+        """Client after-request hook: one REST attempt of ``seconds``, failed if ``error``."""
+        key = (method.upper(), path)
+        self._histogram(self.rest, key).record(seconds)
+        if error is not None:
+            self.rest_errors[key] += 1
+
+    def observe_frame(self, raw: Union[str, bytes]):
+        """WebSocketConnection message hook: one received frame."""
+        self.ws_messages.add()
+        self.ws_bytes.add(len(raw))
+
+    def observe_dispatch(self, action: Optional[str], seconds: float):
+        """MessageDispatcher hook: one message of ``action`` handled in ``seconds``."""
+        self._histogram(self.ws_dispatch, action or "").record(seconds)
+
+    # -------------------------
+    # Attaching
+    # -------------------------
+
+    def attach_client(self, client):
+        """Time every request attempt of ``client`` (Client or AsyncClient)."""
+        client.add_request_hook(after=self.observe_request)
+        return client
+
+    def attach(self, manager):
+        """Instrument a WS manager (threaded or asyncio) or a DeepcoinWebsocketPool."""
+        shards = getattr(manager, "shards", None) or [manager]
+        for shard in shards:
+            shard.connection.add_message_hook(self.observe_frame)
+        manager.dispatcher.add_hook(self.observe_dispatch)
+        self._managers.extend(shards)
+        return manager
+
+    def attach_health(self, monitor):
+        """Export ping RTT, topic staleness, forced reconnects and resubscribes of a ws.health.HealthMonitor."""
+        self._health.append(monitor)
+        return monitor
+
+    def _connection_health(self) -> List[Dict[str, Any]]:
+        return [status for monitor in self._health for status in monitor.stats()]
+
+    @property
+    def reconnects(self) -> int:
+        return sum(m.reconnect_count for m in self._managers)
+
+    # -------------------------
+    # Export
+    # -------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain dict of every metric; latencies in seconds."""
+        rest = {}
+        for (method, path), histogram in list(self.rest.items()):
+            stats = histogram.snapshot()
+            stats["errors"] = self.rest_errors[(method, path)]
+            rest[f"{method} {path}"] = stats
+        return {
+            "rest": rest,
+            "ws": {
+                "actions": {action: h.snapshot() for action, h in list(self.ws_dispatch.items())},
+                "messages_per_sec": self.ws_messages.rate(),
+                "bytes_per_sec": self.ws_bytes.rate(),
+                "messages": self.ws_messages.total,
+                "bytes": self.ws_bytes.total,
+                "reconnects": self.reconnects,
+                "forced_reconnects": sum(m.forced_reconnects for m in self._health),
+                "stale_resubscribes": sum(m.resubscribes for m in self._health),
+                "connections": self._connection_health(),
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "deepcoin") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def summary(name: str, help_text: str, series: List[Tuple[str, Dict[str, Any]]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for labels, stats in series:
+                for q in QUANTILES:
+                    value = stats.get(f"p{round(q * 100)}")
+                    if value is not None:
+                        lines.append(f'{name}{{{labels},quantile="{q}"}} {value:.9g}')
+                lines.append(f"{name}_sum{{{labels}}} {stats['total_sum']:.9g}")
+                lines.append(f"{name}_count{{{labels}}} {stats['total_count']}")
+
+        def scalar(name: str, kind: str, help_text: str, value: float):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value:.9g}")
+
+        rest = [
+            (f'method="{_label(method)}",path="{_label(path)}"', h.snapshot())
+            for (method, path), h in list(self.rest.items())
+        ]
+        summary(f"{prefix}_rest_request_seconds", "REST request latency per attempt.", rest)
+        lines.append(f"# HELP {prefix}_rest_errors_total Failed REST request attempts.")
+        lines.append(f"# TYPE {prefix}_rest_errors_total counter")
+        for (method, path), count in list(self.rest_errors.items()):
+            lines.append(f'{prefix}_rest_errors_total{{method="{_label(method)}",path="{_label(path)}"}} {count}')
+
+        actions = [(f'action="{_label(action)}"', h.snapshot()) for action, h in list(self.ws_dispatch.items())]
+        summary(f"{prefix}_ws_dispatch_seconds", "Time spent dispatching a WS message to callbacks.", actions)
+        scalar(f"{prefix}_ws_messages_total", "counter", "WS frames received.", self.ws_messages.total)
+        scalar(f"{prefix}_ws_bytes_total", "counter", "WS payload received.", self.ws_bytes.total)
+        scalar(f"{prefix}_ws_messages_per_second", "gauge", "WS frames per second.", self.ws_messages.rate())
+        scalar(f"{prefix}_ws_bytes_per_second", "gauge", "WS payload per second.", self.ws_bytes.rate())
+        scalar(f"{prefix}_ws_reconnects_total", "counter", "WS reconnects.", self.reconnects)
+        if self._health:
+            self._health_lines(prefix, lines)
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, addr: str = "") -> ThreadingHTTPServer:
+        """Serve to_prometheus() over HTTP on a daemon thread; call shutdown() on the result to stop."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("Metrics scrape: " + format, *args)
+
+        server = ThreadingHTTPServer((addr, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"Serving metrics on port {server.server_address[1]}.")
+        return server
+
+    def _health_lines(self, prefix: str, lines: List[str]):
+        rtt, pong, stale, ages, topic_stale = [], [], [], [], []
+        for index, status in enumerate(self._connection_health()):
+            conn = f'connection="{index}"'
+            if status.get("rtt") is not None:
+                rtt.append(f"{prefix}_ws_ping_rtt_seconds{{{conn}}} {status['rtt']:.9g}")
+            if status.get("pong_age") is not None:
+                pong.append(f"{prefix}_ws_pong_age_seconds{{{conn}}} {status['pong_age']:.9g}")
+            stale.append(f"{prefix}_ws_connection_stale{{{conn}}} {int(status['stale'])}")
+            for topic, info in status.get("topics", {}).items():
+                action, _, key = topic.partition(" ")
+                labels = f'{conn},action="{_label(action)}",key="{_label(key)}"'
+                ages.append(f"{prefix}_ws_topic_age_seconds{{{labels}}} {info['age']:.9g}")
+                topic_stale.append(f"{prefix}_ws_topic_stale{{{labels}}} {int(info['stale'])}")
+        for name, help_text, series in (
+            (f"{prefix}_ws_ping_rtt_seconds", "Last WS ping/pong round trip.", rtt),
+            (f"{prefix}_ws_pong_age_seconds", "Seconds since the last WS pong.", pong),
+            (f"{prefix}_ws_connection_stale", "1 if the connection is considered stale.", stale),
+            (f"{prefix}_ws_topic_age_seconds", "Seconds since the last push of a subscribed topic.", ages),
+            (f"{prefix}_ws_topic_stale", "1 if the topic is silent past its threshold.", topic_stale),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(series)
+        forced = sum(m.forced_reconnects for m in self._health)
+        lines.append(f"# HELP {prefix}_ws_forced_reconnects_total Reconnects forced by health monitors.")
+        lines.append(f"# TYPE {prefix}_ws_forced_reconnects_total counter")
+        lines.append(f"{prefix}_ws_forced_reconnects_total {forced}")
+        resubscribes = sum(m.resubscribes for m in self._health)
+        lines.append(f"# HELP {prefix}_ws_stale_resubscribes_total Silent topics resubscribed by health monitors.")
+        lines.append(f"# TYPE {prefix}_ws_stale_resubscribes_total counter")
+        lines.append(f"{prefix}_ws_stale_resubscribes_total {resubscribes}")
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,295 @@
+"""
+Compact typed views over REST records and WS push data.
+
+Models keep only the raw values of their own fields (no dict) in
+``__slots__`` instances and decode numeric strings on first access, to
+``float`` by default or ``Decimal`` with ``decimal=True``:
+
+    fills = Fill.from_response(client.get_fills("SWAP"))
+    fills[0].fill_px                          # float, decoded once
+    Candle.from_response(client.get_candles("BTC-USDT-SWAP"), decimal=True)
+
+    ws.register_callback(WSAction.PUSH_LAST_TX, typed_callback(WSAction.PUSH_LAST_TX, on_trade))
+
+Fields missing from a record are None. Fields accept the REST key and
+the WS (PascalCase) key where they differ. JSON numbers are coerced like
+numeric strings, so numeric fields are always ``float`` (or ``Decimal``).
+Models compare and hash by type and field values.
+"""
+from decimal import Decimal
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from .utils.pagination import page_records
+
+M = TypeVar("M", bound="Model")
+RawKey = Union[str, int]
+
+_STR, _NUM, _INT = "str", "num", "int"
+# Value classes a field of each kind holds once decoded; anything else is decoded on access.
+_DECODED = {_STR: (str,), _NUM: (float, Decimal), _INT: (int,)}
+
+
+class _Field:
+    """Descriptor decoding one raw value in place on first access."""
+
+    __slots__ = ("keys", "kind", "decoded", "index", "name")
+
+    def __init__(self, *keys: RawKey, kind: str = _STR):
+        self.keys = keys
+        self.kind = kind
+        self.decoded = _DECODED[kind]
+        self.index = -1
+        self.name = ""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj._values[self.index]
+        # Numeric strings and JSON numbers decode alike: a JSON 2 in a _num field is 2.0, not 2.
+        if value is not None and value.__class__ not in self.decoded:
+            value = obj._values[self.index] = self._decode(value, obj._decimal)
+        return value
+
+    def _decode(self, value: Any, decimal: bool):
+        if self.kind == _STR:
+            return str(value)
+        if value == "":
+            return None
+        if self.kind == _INT:
+            return int(value)
+        return Decimal(value) if decimal else float(value)
+
+
+def _str(*keys: RawKey) -> Any:
+    return _Field(*keys, kind=_STR)
+
+
+def _num(*keys: RawKey) -> Any:
+    return _Field(*keys, kind=_NUM)
+
+
+def _int(*keys: RawKey) -> Any:
+    return _Field(*keys, kind=_INT)
+
+
+class Model:
+    __slots__ = ("_values", "_decimal")
+    _fields: ClassVar[Tuple[_Field, ...]] = ()
+    _dict_keys: ClassVar[Tuple[Tuple[str, ...], ...]] = ()   # per field, keys in a dict record
+    _list_index: ClassVar[Tuple[Optional[int], ...]] = ()    # per field, position in a list record
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = [f for f in vars(cls).values() if isinstance(f, _Field)]
+        for index, f in enumerate(fields):
+            f.index = index
+        cls._fields = tuple(fields)
+        cls._dict_keys = tuple(tuple(k for k in f.keys if isinstance(k, str)) for f in fields)
+        cls._list_index = tuple(next((k for k in f.keys if isinstance(k, int)), None) for f in fields)
+
+    def __init__(self, values: List[Any], decimal: bool = False):
+        self._values = values
+        self._decimal = decimal
+
+    @classmethod
+    def from_raw(cls: Type[M], raw: Union[Dict[str, Any], Sequence[Any]], decimal: bool = False) -> M:
+        """Build from one REST record or WS data object (a dict, or a list for candles / book levels)."""
+        if isinstance(raw, dict):
+            values = []
+            for keys in cls._dict_keys:
+                value = None
+                for key in keys:
+                    value = raw.get(key)
+                    if value is not None:
+                        break
+                values.append(value)
+        else:
+            n = len(raw)
+            values = [raw[i] if i is not None and i < n else None for i in cls._list_index]
+        # Non-string numbers (e.g. JSON floats) are normalized once so Decimal mode stays exact.
+        if decimal:
+            values = [
+                Decimal(str(v)) if f.kind == _NUM and isinstance(v, float) else v
+                for f, v in zip(cls._fields, values)
+            ]
+        return cls(values, decimal)
+
+    @classmethod
+    def from_response(cls: Type[M], response: Any, decimal: bool = False) -> List[M]:
+        """All records of a REST response (its ``data`` list)."""
+        return [cls.from_raw(record, decimal) for record in page_records(response)]
+
+    @classmethod
+    def from_push(cls: Type[M], message: dict, decimal: bool = False) -> List[M]:
+        """All data objects of a WS push."""
+        return [cls.from_raw(item["data"], decimal) for item in message.get("result") or [] if "data" in item]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: f.__get__(self) for f in self._fields}
+
+    def __getitem__(self, name: str) -> Any:
+        # dict-style access by field name, for code written against the raw records.
+        return getattr(self, name)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        # Fields have no setters, so a model's decoded values never change.
+        return hash((type(self), tuple(f.__get__(self) for f in self._fields)))
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items() if v is not None)
+        return f"{type(self).__name__}({fields})"
+
+
+class Fill(Model):
+    __slots__ = ()
+    inst_type = _str("instType")
+    inst_id = _str("instId", "InstrumentID")
+    trade_id = _str("tradeId", "TradeID")
+    ord_id = _str("ordId", "OrderSysID")
+    cl_ord_id = _str("clOrdId")
+    bill_id = _str("billId")
+    side = _str("side", "Direction")
+    pos_side = _str("posSide", "PosiDirection")
+    fill_px = _num("fillPx", "Price")
+    fill_sz = _num("fillSz", "Volume")
+    fee = _num("fee", "Fee")
+    fee_ccy = _str("feeCcy", "FeeCurrency")
+    exec_type = _str("execType")
+    ts = _int("ts", "TradeTime")
+
+
+class Order(Model):
+    __slots__ = ()
+    inst_type = _str("instType")
+    inst_id = _str("instId", "InstrumentID")
+    ord_id = _str("ordId", "OrderSysID")
+    cl_ord_id = _str("clOrdId")
+    ord_type = _str("ordType", "OrderPriceType")
+    side = _str("side", "Direction")
+    pos_side = _str("posSide")
+    td_mode = _str("tdMode")
+    px = _num("px", "Price")
+    sz = _num("sz", "Volume")
+    acc_fill_sz = _num("accFillSz", "VolumeTraded")
+    avg_px = _num("avgPx", "TradePrice")
+    state = _str("state", "OrderStatus")
+    lever = _num("lever", "Leverage")
+    fee = _num("fee", "Fee")
+    c_time = _int("cTime", "InsertTime")
+    u_time = _int("uTime", "UpdateTime")
+
+
+class Position(Model):
+    __slots__ = ()
+    inst_type = _str("instType")
+    inst_id = _str("instId", "InstrumentID")
+    pos_id = _str("posId", "PositionID")
+    pos_side = _str("posSide", "PosiDirection")
+    mgn_mode = _str("mgnMode")
+    pos = _num("pos", "Position")
+    avail_pos = _num("availPos")
+    avg_px = _num("avgPx", "OpenPrice")
+    lever = _num("lever", "Leverage")
+    liq_px = _num("liqPx")
+    upl = _num("upl")
+    margin = _num("mgn", "UseMargin")
+    c_time = _int("cTime")
+    u_time = _int("uTime", "UpdateTime")
+
+
+class Balance(Model):
+    __slots__ = ()
+    ccy = _str("ccy", "Currency")
+    bal = _num("bal", "Balance")
+    avail_bal = _num("availBal", "Available")
+    frozen_bal = _num("frozenBal", "FrozenMargin")
+    eq = _num("eq")
+
+
+class Candle(Model):
+    """REST candle row [ts, o, h, l, c, vol, volCcy, ...] or WS PushKLine data."""
+    __slots__ = ()
+    ts = _int(0, "BeginTime")
+    open = _num(1, "OpenPrice")
+    high = _num(2, "HighestPrice")
+    low = _num(3, "LowestPrice")
+    close = _num(4, "ClosePrice")
+    volume = _num(5, "Volume")
+    volume_ccy = _num(6, "Turnover")
+
+
+class Trade(Model):
+    """Public trade (WS PushMarketTrade)."""
+    __slots__ = ()
+    inst_id = _str("InstrumentID", "instId")
+    trade_id = _str("TradeID", "tradeId")
+    side = _str("Direction", "side")
+    price = _num("Price", "px")
+    size = _num("Volume", "sz")
+    ts = _int("TradeTime", "ts")
+
+
+class Ticker(Model):
+    __slots__ = ()
+    inst_id = _str("instId", "InstrumentID")
+    last = _num("last", "LastPrice")
+    last_sz = _num("lastSz")
+    bid_px = _num("bidPx", "BidPrice1")
+    bid_sz = _num("bidSz", "BidVolume1")
+    ask_px = _num("askPx", "AskPrice1")
+    ask_sz = _num("askSz", "AskVolume1")
+    open_24h = _num("open24h", "OpenPrice")
+    high_24h = _num("high24h", "HighestPrice")
+    low_24h = _num("low24h", "LowestPrice")
+    vol_24h = _num("vol24h", "Volume")
+    vol_ccy_24h = _num("volCcy24h", "Turnover")
+    ts = _int("ts", "UpdateTime")
+
+
+class BookLevel(Model):
+    """REST book row [px, sz, ...] or WS PushMarketOrder data (side: Direction "0" bid / "1" ask)."""
+    __slots__ = ()
+    price = _num(0, "Price")
+    size = _num(1, "Volume")
+    side = _str("Direction")
+
+    @classmethod
+    def from_book(cls, response: Any, decimal: bool = False) -> Dict[str, List["BookLevel"]]:
+        """``{"bids": [...], "asks": [...]}`` from a get_order_book() response."""
+        data = response.get("data") if isinstance(response, dict) else response
+        if isinstance(data, list):
+            data = data[0] if data else {}
+        return {side: [cls.from_raw(row, decimal) for row in data.get(side) or []] for side in ("bids", "asks")}
+
+
+# WS push action -> model of its data objects
+WS_MODELS: Dict[str, Type[Model]] = {
+    "PushMarketTrade": Trade,
+    "PushMarketDataOverView": Ticker,
+    "PushKLine": Candle,
+    "PushMarketOrder": BookLevel,
+    "PushOrder": Order,
+    "PushPosition": Position,
+    "PushAccount": Balance,
+    "PushTrade": Fill,
+}
+
+
+def typed_callback(action: str, callback: Callable[[Model], None], decimal: bool = False) -> Callable[[dict], None]:
+    """
+    Wrap ``callback`` so it receives one model per data object of each ``action`` push.
+    Keep the returned function to unregister it later.
+    """
+    model = WS_MODELS[action]
+
+    def on_push(message: dict):
+        for item in model.from_push(message, decimal):
+            callback(item)
+
+    return on_push
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .exceptions import DeepcoinRateLimitException
+
+# path prefix -> (requests per second, burst capacity)
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "/deepcoin/trade/": (10.0, 20),
+    "/deepcoin/market/": (10.0, 20),
+    "/deepcoin/account/": (5.0, 10),
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``rate`` tokens per second.
+    Waiting callers reserve tokens ahead of time (the level may go negative),
+    so concurrent waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take ``tokens``, returning how long the caller must wait before using them.
+        Returns None (and takes nothing) if that wait would exceed ``max_wait``.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    @property
+    def tokens(self) -> float:
+        """Current token level (negative while callers are queued)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class RateLimiter:
+    """
+    Client-side request throttling per endpoint group.
+
+    Limits are keyed by path prefix; the longest matching prefix wins and
+    paths matching no prefix are not throttled. With ``block=True`` callers
+    wait for a token (up to ``timeout`` seconds); otherwise, or when the
+    wait would exceed ``timeout``, DeepcoinRateLimitException is raised.
+
+    One limiter can be shared by several Client / AsyncClient instances
+    that use the same API key.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ):
+        limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self.buckets: Dict[str, TokenBucket] = {
+            prefix: TokenBucket(rate, capacity) for prefix, (rate, capacity) in limits.items()
+        }
+        self._prefixes = sorted(self.buckets, key=len, reverse=True)
+        self._by_path: Dict[str, Optional[TokenBucket]] = {}
+        self.block = block
+        self.timeout = timeout
+
+    def bucket_for(self, path: str) -> Optional[TokenBucket]:
+        try:
+            return self._by_path[path]
+        except KeyError:
+            bucket = next((self.buckets[p] for p in self._prefixes if path.startswith(p)), None)
+            self._by_path[path] = bucket
+            return bucket
+
+    def _reserve(self, path: str) -> float:
+        bucket = self.bucket_for(path)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(1.0, max_wait=self.timeout if self.block else 0.0)
+        if wait is None:
+            retry_after = (1.0 - bucket.tokens) / bucket.rate
+            raise DeepcoinRateLimitException(path, retry_after)
+        return wait
+
+    def acquire(self, path: str):
+        """Block until a request to ``path`` is allowed (or raise, see class docs)."""
+        wait = self._reserve(path)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, path: str):
+        """asyncio variant of acquire(); waits without blocking the event loop."""
+        wait = self._reserve(path)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def levels(self) -> Dict[str, float]:
+        """Current token level per prefix."""
+        return {prefix: bucket.tokens for prefix, bucket in self.buckets.items()}
@@ -0,0 +1,131 @@
+import time
+from typing import FrozenSet, Iterable, Optional
+
+import requests
+
+from .exceptions import DeepcoinAPIException, DeepcoinRateLimitException, DeepcoinRequestException
+from .utils.backoff import ExponentialBackoff
+
+# Rejected before execution: retrying is safe for any request.
+DEFAULT_RESIGN_CODES = frozenset({50102})  # request timestamp has expired
+DEFAULT_REJECTED_CODES = frozenset({50011})  # too many requests
+DEFAULT_REJECTED_STATUSES = frozenset({429})
+
+# Outcome unknown: only idempotent requests are retried.
+DEFAULT_TRANSIENT_CODES = frozenset({
+    50001,  # service temporarily unavailable
+    50004,  # endpoint request timeout
+    50013,  # system busy
+    50026,  # system error
+})
+DEFAULT_TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def _as_int(code) -> Optional[int]:
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed REST request is sent again, and after how long.
+
+    Failures fall into three groups:
+      - re-sign (``resign_codes``, e.g. 50102 timestamp expired): retried at
+        once; every attempt is signed again with a fresh timestamp.
+      - rejected (``rejected_codes`` / ``rejected_statuses``, connect timeouts):
+        the server did not act on the request, retried with backoff.
+      - transient (``transient_codes`` / ``transient_statuses``, network
+        errors): the request may have been executed, so it is only retried
+        when idempotent (GET, cancels, and place_order with a ``cl_ord_id``).
+    Anything else is fatal and raised immediately.
+
+    At most ``max_attempts`` sends are made and no retry is scheduled past
+    ``max_total_time`` seconds after the first one.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        jitter: float = 0.5,
+        max_total_time: float = 10.0,
+        resign_codes: Iterable[int] = DEFAULT_RESIGN_CODES,
+        rejected_codes: Iterable[int] = DEFAULT_REJECTED_CODES,
+        rejected_statuses: Iterable[int] = DEFAULT_REJECTED_STATUSES,
+        transient_codes: Iterable[int] = DEFAULT_TRANSIENT_CODES,
+        transient_statuses: Iterable[int] = DEFAULT_TRANSIENT_STATUSES,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_total_time = max_total_time
+        self.resign_codes: FrozenSet[int] = frozenset(resign_codes)
+        self.rejected_codes: FrozenSet[int] = frozenset(rejected_codes)
+        self.rejected_statuses: FrozenSet[int] = frozenset(rejected_statuses)
+        self.transient_codes: FrozenSet[int] = frozenset(transient_codes)
+        self.transient_statuses: FrozenSet[int] = frozenset(transient_statuses)
+
+    def classify(self, error: Exception) -> Optional[str]:
+        """Return "resign", "rejected", "transient" or None (fatal) for a request error."""
+        if isinstance(error, DeepcoinAPIException):
+            code = _as_int(error.code)
+            if code in self.resign_codes:
+                return "resign"
+            if code in self.rejected_codes or error.status_code in self.rejected_statuses:
+                return "rejected"
+            if code in self.transient_codes or error.status_code in self.transient_statuses:
+                return "transient"
+            return None
+        if isinstance(error, DeepcoinRateLimitException):
+            return None
+        if isinstance(error, requests.ConnectTimeout):
+            return "rejected"
+        if isinstance(error, (requests.RequestException, DeepcoinRequestException)):
+            return "transient"
+        return None
+
+    def start(self, idempotent: bool) -> "RetryState":
+        return RetryState(self, idempotent)
+
+
+class RetryState:
+    """Retry bookkeeping for one logical request (see RetryPolicy.start)."""
+
+    def __init__(self, policy: RetryPolicy, idempotent: bool):
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempts = 1
+        self.deadline = time.monotonic() + policy.max_total_time
+        self._backoff = ExponentialBackoff(policy.base_delay, policy.max_delay, jitter=policy.jitter)
+
+    def next_delay(self, error: Exception) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None if ``error`` should be raised."""
+        kind = self.policy.classify(error)
+        if kind is None or (kind == "transient" and not self.idempotent):
+            return None
+        if self.attempts >= self.policy.max_attempts:
+            return None
+
+        delay = 0.0 if kind == "resign" else self._backoff.next_delay()
+        if kind == "rejected":
+            delay = max(delay, _retry_after(error))
+        if time.monotonic() + delay > self.deadline:
+            return None
+        self.attempts += 1
+        return delay
+
+
+def _retry_after(error: Exception) -> float:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
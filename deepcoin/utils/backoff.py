@@ -0,0 +1,31 @@
+import random
+
+
+class ExponentialBackoff:
+    """
+    Exponential backoff with jitter.
+
+    The n-th delay is ``min(max_delay, base * factor ** n)`` scaled down by a
+    random fraction of up to ``jitter`` (0 disables jitter, 1 is full jitter),
+    so many clients reconnecting at once do not retry in lockstep.
+    """
+
+    def __init__(self, base: float = 1.0, max_delay: float = 60.0, factor: float = 2.0, jitter: float = 0.5):
+        if base < 0 or max_delay < 0:
+            raise ValueError("base and max_delay must be >= 0")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be within 0..1")
+        self.base = base
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        """Return the delay for the next attempt and advance the attempt counter."""
+        delay = min(self.max_delay, self.base * (self.factor ** self.attempts))
+        self.attempts += 1
+        return delay * (1 - self.jitter * random.random())
+
+    def reset(self):
+        self.attempts = 0
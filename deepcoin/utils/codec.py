@@ -0,0 +1,81 @@
+"""
+JSON codec used for REST bodies and WebSocket frames.
+
+The fastest installed backend is picked at import time (orjson, then
+msgspec, then the standard library) and can be swapped with set_codec().
+loads() accepts ``bytes`` or ``str`` and raises ValueError on bad input;
+dumps() always returns UTF-8 ``bytes``. Call them through the module
+(``codec.loads(...)``) so a later set_codec() takes effect everywhere.
+"""
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+Loads = Callable[[Union[bytes, str]], Any]
+Dumps = Callable[[Any], bytes]
+
+
+def _stdlib_codec():
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    return json.loads, dumps
+
+
+def _orjson_codec():
+    import orjson
+
+    return orjson.loads, orjson.dumps  # orjson.JSONDecodeError is a ValueError
+
+
+def _msgspec_codec():
+    import msgspec
+
+    decode = msgspec.json.decode
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return loads, msgspec.json.encode
+
+
+_BACKENDS: Dict[str, Callable[[], tuple]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+name: str = "json"
+loads: Loads
+dumps: Dumps
+
+
+def set_codec(backend: Optional[str] = None, *, custom: Optional[tuple] = None) -> str:
+    """
+    Select the JSON backend: "orjson", "msgspec", "json", or None for the fastest installed one.
+    ``custom=(loads, dumps)`` plugs in any other implementation. Returns the backend name.
+    """
+    global name, loads, dumps
+    if custom is not None:
+        loads, dumps = custom
+        name = backend or "custom"
+        return name
+    if backend is not None and backend not in _BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+
+    candidates = [backend] if backend else list(_BACKENDS)
+    for candidate in candidates:
+        try:
+            loads, dumps = _BACKENDS[candidate]()
+        except ImportError:
+            if backend:
+                raise
+            continue
+        name = candidate
+        return name
+    raise ImportError("No JSON backend available")
+
+
+set_codec()
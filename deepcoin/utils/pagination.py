@@ -0,0 +1,135 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterator, List, Optional
+
+FetchPage = Callable[[Any], Any]
+NextCursor = Callable[[Any, List[Any]], Any]
+
+
+def page_records(response: Any) -> List[Any]:
+    """Records of one page: the response's ``data`` list (or the list inside a ``data`` object)."""
+    data = response.get("data") if isinstance(response, dict) else response
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), [])
+    return data or []
+
+
+class _PageWalker:
+    """Cursor bookkeeping shared by the sync and async paginators."""
+
+    def __init__(
+        self,
+        next_cursor: NextCursor,
+        cursor: Any,
+        key: Optional[Callable[[Any], Hashable]],
+        stop: Optional[Callable[[Any], bool]],
+    ):
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+        self.key = key
+        self.stop = stop
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._previous_keys: set = set()
+
+    def advance(self, records: List[Any]) -> Any:
+        """
+        Cursor for the page after ``records``, or None if this was the last one.
+        If ``next_cursor`` raises, the error is kept in ``error`` and raised once the page is yielded.
+        """
+        if not records:
+            return None
+        try:
+            cursor = self.next_cursor(self.cursor, records)
+        except Exception as e:
+            self.error = e
+            return None
+        if cursor is None or cursor == self.cursor:
+            return None
+        self.cursor = cursor
+        return cursor
+
+    def select(self, records: List[Any]) -> List[Any]:
+        """Drop records already yielded from the previous page (overlapping cursors) and apply ``stop``."""
+        if self.key is not None:
+            keys = [self.key(r) for r in records]
+            records = [r for r, k in zip(records, keys) if k not in self._previous_keys]
+            self._previous_keys = set(keys)
+        if self.stop is not None:
+            for i, record in enumerate(records):
+                if self.stop(record):
+                    self.done = True
+                    return records[:i]
+        return records
+
+
+def paginate(
+    fetch_page: FetchPage,
+    next_cursor: NextCursor,
+    cursor: Any = None,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    stop: Optional[Callable[[Any], bool]] = None,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """
+    Yield records page by page, following cursors lazily.
+
+    ``fetch_page(cursor)`` returns a raw response, ``next_cursor(cursor, records)``
+    the cursor of the following page (None at the end). With ``prefetch`` the
+    next page is requested on a background thread while the current one is
+    consumed, so at most two pages are held in memory. ``fetch_page`` then
+    runs on that thread; for Client methods this shares the client's
+    requests.Session across threads, as ``place_orders`` does.
+    """
+    walker = _PageWalker(next_cursor, cursor, key, stop)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deepcoin-prefetch") if prefetch else None
+    pending = executor.submit(fetch_page, cursor) if executor else None
+    try:
+        while True:
+            response = pending.result() if pending else fetch_page(walker.cursor)
+            pending = None
+            records = page_records(response)
+            following = walker.advance(records)
+            if executor and following is not None:
+                pending = executor.submit(fetch_page, following)
+            yield from walker.select(records)
+            if walker.error is not None:
+                raise walker.error
+            if following is None or walker.done:
+                return
+    finally:
+        if pending:
+            pending.cancel()
+        if executor:
+            executor.shutdown(wait=False)
+
+
+async def paginate_async(
+    fetch_page: Callable[[Any], Awaitable[Any]],
+    next_cursor: NextCursor,
+    cursor: Any = None,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    stop: Optional[Callable[[Any], bool]] = None,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """asyncio variant of paginate(); the next page is prefetched as a task."""
+    walker = _PageWalker(next_cursor, cursor, key, stop)
+    pending: Optional[asyncio.Future] = None
+    try:
+        response = await fetch_page(cursor)
+        while True:
+            records = page_records(response)
+            following = walker.advance(records)
+            if prefetch and following is not None:
+                pending = asyncio.ensure_future(fetch_page(following))
+            for record in walker.select(records):
+                yield record
+            if walker.error is not None:
+                raise walker.error
+            if following is None or walker.done:
+                return
+            response = await pending if pending else await fetch_page(following)
+            pending = None
+    finally:
+        if pending:
+            pending.cancel()
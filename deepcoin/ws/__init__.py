@@ -1,7 +1,12 @@
 from .manager import DeepcoinWebsocketManager
 from .stream import DeepcoinWebSocketStream
+from .orderbook import LocalOrderBook, OrderBookManager
+from .pool import DeepcoinWebsocketPool
 
 __all__ = [
     "DeepcoinWebsocketManager",
     "DeepcoinWebSocketStream",
+    "LocalOrderBook",
+    "OrderBookManager",
+    "DeepcoinWebsocketPool",
 ]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple, Union
+
+import aiohttp
+
+from ..utils import codec
+from ..utils.backoff import ExponentialBackoff
+from .exceptions import (
+    DeepcoinWebSocketConnectionError,
+    DeepcoinWebSocketProtocolError,
+)
+
+logger = logging.getLogger(__name__)
+
+MaybeAwaitable = Union[None, Awaitable[None]]
+
+
+async def _call(callback: Optional[Callable[..., Any]], *args):
+    """Invoke a plain or coroutine callback."""
+    if callback is None:
+        return
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+class AsyncWebSocketConnection:
+    """
+    asyncio counterpart of :class:`WebSocketConnection`.
+    Every connection runs as a task on the current event loop instead of its own thread.
+    Includes:
+        - automatic reconnection (exponential backoff with jitter)
+        - optional heartbeat ping
+        - on_message callback dispatch (plain or coroutine callbacks)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_message: Callable[[dict], MaybeAwaitable],
+        on_open: Optional[Callable[[], MaybeAwaitable]] = None,
+        on_close: Optional[Callable[[], MaybeAwaitable]] = None,
+        on_error: Optional[Callable[[Exception], MaybeAwaitable]] = None,
+        ping_interval: float = 15.0,
+        reconnect: bool = True,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        self.url = url
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+        self.on_message = on_message
+        self.on_open = on_open
+        self.on_close = on_close
+        self.on_error = on_error
+
+        self.ping_interval = ping_interval
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self._backoff = ExponentialBackoff(base=reconnect_delay, max_delay=max_reconnect_delay)
+
+        # A session passed in is shared with other connections and not closed here.
+        self._session = session
+        self._owns_session = session is None
+
+        self._last_pong_time = time.time()
+        self._message_hooks: Tuple[Callable[[Union[str, bytes]], Any], ...] = ()
+
+    def add_message_hook(self, hook: Callable[[Union[str, bytes]], Any]):
+        """Call ``hook(raw_frame)`` for every received frame before it is decoded, e.g. Metrics.observe_frame."""
+        if hook not in self._message_hooks:
+            self._message_hooks = self._message_hooks + (hook,)
+
+    def remove_message_hook(self, hook: Callable[[Union[str, bytes]], Any]):
+        self._message_hooks = tuple(h for h in self._message_hooks if h != hook)
+
+    def _run_message_hooks(self, message: Union[str, bytes]):
+        for hook in self._message_hooks:
+            try:
+                hook(message)
+            except Exception:
+                logger.exception("Error in message hook.")
+
+    async def _on_message(self, message: Union[str, bytes]):
+        if self._message_hooks:
+            self._run_message_hooks(message)
+        try:
+            data = codec.loads(message)
+        except ValueError as e:
+            logger.exception("Error while parsing WebSocket message.")
+            await self._on_error(DeepcoinWebSocketProtocolError(str(e)))
+            return
+
+        try:
+            await _call(self.on_message, data)
+        except Exception as e:
+            await self._on_error(e)
+
+    async def _on_open(self):
+        logger.info("WebSocket opened.")
+        self._last_pong_time = time.time()
+        self._backoff.reset()
+        await _call(self.on_open)
+
+    async def _on_close(self, close_status_code, close_msg):
+        logger.warning(f"WebSocket closed: {close_status_code} - {close_msg}")
+        await _call(self.on_close)
+
+    async def _on_error(self, error: Exception):
+        logger.error(f"WebSocket error: {error}")
+        try:
+            await _call(self.on_error, error)
+        except Exception:
+            logger.exception("Error in on_error callback.")
+
+    def _on_pong(self, message):
+        logger.debug("PONG received.")
+        self._last_pong_time = time.time()
+
+    async def _ping_forever(self, ws: aiohttp.ClientWebSocketResponse):
+        while not ws.closed:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await ws.ping(b"ping")
+            except Exception as e:
+                logger.debug(f"Failed to send ping: {e}")
+                return
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        return self._session
+
+    async def _run_forever(self):
+        while not self._stop_event.is_set():
+            try:
+                session = await self._get_session()
+                async with session.ws_connect(self.url, autoping=False) as ws:
+                    self.ws = ws
+                    await self._on_open()
+                    ping_task = None
+                    if self.ping_interval:
+                        ping_task = asyncio.create_task(self._ping_forever(ws))
+                    try:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                await self._on_message(msg.data)
+                            elif msg.type == aiohttp.WSMsgType.BINARY:
+                                await self._on_message(msg.data)
+                            elif msg.type == aiohttp.WSMsgType.PING:
+                                await ws.pong(msg.data)
+                            elif msg.type == aiohttp.WSMsgType.PONG:
+                                self._on_pong(msg.data)
+                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                                await self._on_error(ws.exception() or DeepcoinWebSocketConnectionError("WS error"))
+                                break
+                    finally:
+                        if ping_task:
+                            ping_task.cancel()
+                    await self._on_close(ws.close_code, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Unexpected WebSocket failure.")
+                await self._on_error(e)
+            finally:
+                self.ws = None
+
+            if not self.reconnect:
+                logger.info("Reconnect disabled. Exiting WS loop.")
+                break
+            if self._stop_event.is_set():
+                break
+
+            delay = self._backoff.next_delay()
+            logger.info(f"Reconnecting in {delay:.2f} seconds...")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the WebSocket connection as a task on the running event loop."""
+        if self._task and not self._task.done():
+            logger.warning("WebSocket task already running.")
+            return
+
+        self._stop_event.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run_forever())
+        logger.info("WebSocket task started.")
+
+    async def stop(self):
+        """Stop the WebSocket connection gracefully."""
+        self._stop_event.set()
+        if self.ws and not self.ws.closed:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            self._task = None
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+        logger.info("WebSocket connection stopped.")
+
+    async def send(self, message: dict):
+        """Send a message (JSON-serializable dict) over the socket."""
+        if self.is_alive():
+            try:
+                payload = codec.dumps(message).decode("utf-8")
+                await self.ws.send_str(payload)
+                logger.debug(f"Sent: {payload}")
+            except Exception as e:
+                logger.exception("Failed to send WS message.")
+                raise DeepcoinWebSocketConnectionError(str(e))
+        else:
+            raise DeepcoinWebSocketConnectionError("WebSocket is not connected.")
+
+    def is_alive(self) -> bool:
+        return self.ws is not None and not self.ws.closed
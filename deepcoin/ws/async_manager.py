@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Union
+
+import aiohttp
+
+from .async_connection import AsyncWebSocketConnection
+from .dispatcher import AsyncMessageDispatcher
+from . import topics
+from .enums import TopicID, WSAction, PUBLIC_FUTURES_WS_ENDPOINT, PRIVATE_WS_ENDPOINT
+from .subscriptions import Subscription, SubscriptionRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDeepcoinWebsocketManager:
+    """
+    asyncio counterpart of :class:`DeepcoinWebsocketManager`.
+    Runs on the caller's event loop, so any number of managers share one thread.
+    Pass a shared ``aiohttp.ClientSession`` to pool all connections on it.
+    ``client`` may be a :class:`Client` or an :class:`AsyncClient`.
+    Subscriptions are replayed after every reconnect, as in the threaded manager.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = PUBLIC_FUTURES_WS_ENDPOINT,
+        client=None,
+        session: Optional[aiohttp.ClientSession] = None,
+        resubscribe_batch_size: int = 20,
+        resubscribe_batch_interval: float = 0.1,
+    ):
+        self._endpoint = endpoint
+        self._dispatcher = AsyncMessageDispatcher()
+        self._connection = AsyncWebSocketConnection(
+            url=self._endpoint,
+            on_message=self._on_message,
+            on_open=self._on_open,
+            on_close=self._on_close,
+            on_error=self._on_error,
+            session=session,
+        )
+        self._local_no_counter = 1000  # for generating unique local_no
+        self._is_private = self._endpoint == PRIVATE_WS_ENDPOINT
+        self._client = client
+        self._listenkey: Optional[str] = None
+        self._extend_task: Optional[asyncio.Task] = None
+
+        self._subscriptions = SubscriptionRegistry()
+        self._resubscribe_batch_size = resubscribe_batch_size
+        self._resubscribe_batch_interval = resubscribe_batch_interval
+        self._resubscribe_task: Optional[asyncio.Task] = None
+
+        # disconnect -> first push after resubscribe
+        self._disconnected_at: Optional[float] = None
+        self._recovering = False
+        self.reconnect_count = 0
+        self.recovery_latencies: Deque[float] = deque(maxlen=100)
+
+    # -------------------------
+    # WebSocket lifecycle
+    # -------------------------
+
+    async def start(self):
+        """Start the WebSocket connection on the running event loop."""
+        logger.info("Starting Deepcoin async WS manager.")
+
+        if self._is_private:
+            if self._client is None:
+                raise RuntimeError("Client instance is required for private WebSocket connection.")
+
+            self._listenkey = await self._call_client(self._client.get_listenkey)
+            self._connection.url = f"{self._endpoint}?listenKey={self._listenkey}"
+            logger.info("Using listenKey: %s", self._listenkey)
+
+            self._extend_task = asyncio.create_task(self._keep_extending_listenkey())
+
+        self._connection.start()
+
+    async def stop(self):
+        """Stop WebSocket connection and the listenKey renewal task."""
+        logger.info("Stopping Deepcoin async WS manager.")
+        if self._extend_task:
+            self._extend_task.cancel()
+            self._extend_task = None
+        if self._resubscribe_task:
+            self._resubscribe_task.cancel()
+            self._resubscribe_task = None
+        await self._connection.stop()
+
+    def is_alive(self) -> bool:
+        return self._connection.is_alive()
+
+    @property
+    def connection(self) -> AsyncWebSocketConnection:
+        return self._connection
+
+    @property
+    def dispatcher(self) -> AsyncMessageDispatcher:
+        return self._dispatcher
+
+    async def wait_until_alive(self, timeout: float = 3.0) -> bool:
+        """Wait until the socket is connected, returning False on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.is_alive():
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    # -------------------------
+    # Callback registration
+    # -------------------------
+
+    def register_callback(
+        self,
+        topic: WSAction | str,
+        callback: Callable[[dict], Union[None, Awaitable[None]]],
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """
+        Register a plain or coroutine callback for a WS action, optionally
+        only for one ``symbol`` (and kline ``period``).
+        """
+        self._dispatcher.register(topic, callback, symbol=symbol, period=period)
+
+    def unregister_callback(
+        self,
+        topic: WSAction | str,
+        callback: Optional[Callable[[dict], Union[None, Awaitable[None]]]] = None,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """Remove one callback, or every callback of the action when ``callback`` is omitted."""
+        self._dispatcher.unregister(topic, callback, symbol=symbol, period=period)
+
+    # -------------------------
+    # Subscription helpers
+    # -------------------------
+
+    async def subscribe_market_data(self, symbol: str):
+        """Subscribe to market ticker/overview (TopicID=7)."""
+        await self._subscribe(Subscription(TopicID.LATEST_MARKET_DATA.value, symbol))
+
+    async def subscribe_trade(self, symbol: str):
+        """Subscribe to last trade updates (TopicID=2)."""
+        await self._subscribe(Subscription(TopicID.LAST_TRANSACTIONS.value, symbol))
+
+    async def subscribe_kline(self, symbol: str, period: str):
+        """Subscribe to Kline updates (TopicID=11)."""
+        topics.build_filter_value(symbol, period=period)  # validate period up front
+        await self._subscribe(Subscription(TopicID.KLINE.value, symbol, period))
+
+    async def subscribe_orderbook(self, symbol: str):
+        """Subscribe to 25-depth incremental orderbook (TopicID=25)."""
+        await self._subscribe(Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, symbol))
+
+    async def unsubscribe(self, topic_id: TopicID | str, symbol: str, period: Optional[str] = None):
+        """Unsubscribe from a topic."""
+        topic_id = topic_id.value if isinstance(topic_id, TopicID) else topic_id
+        self._subscriptions.remove(Subscription(topic_id, symbol, period))
+        payload = topics.unsub(
+            topic_id=topic_id,
+            symbol=symbol,
+            local_no=self._next_local_no(),
+            period=period,
+        )
+        await self._connection.send(payload)
+
+    async def unsubscribe_all(self):
+        """Unsubscribe from all topics."""
+        self._subscriptions.clear()
+        payload = topics.unsub_all(local_no=self._next_local_no())
+        await self._connection.send(payload)
+
+    def subscriptions(self) -> List[Subscription]:
+        """Active subscriptions, replayed after every reconnect."""
+        return self._subscriptions.list()
+
+    @property
+    def last_recovery_latency(self) -> Optional[float]:
+        """Seconds from the last disconnect to the first push after resubscribing."""
+        return self.recovery_latencies[-1] if self.recovery_latencies else None
+
+    async def _subscribe(self, sub: Subscription):
+        self._subscriptions.add(sub)
+        if self._connection.is_alive():
+            await self._connection.send(sub.to_payload(self._next_local_no()))
+        else:
+            logger.info("Not connected yet, %s will be sent on open.", sub.filter_value)
+
+    async def _resubscribe(self):
+        """Replay the registry in batches."""
+        batches = self._subscriptions.batches(self._resubscribe_batch_size)
+        for i, batch in enumerate(batches):
+            if i:
+                await asyncio.sleep(self._resubscribe_batch_interval)
+            for sub in batch:
+                try:
+                    await self._connection.send(sub.to_payload(self._next_local_no()))
+                except Exception as e:
+                    logger.warning("Resubscribe of %s failed: %s", sub.filter_value, e)
+                    return
+        if batches:
+            logger.info("Resubscribed %d topics.", sum(len(b) for b in batches))
+
+    # -------------------------
+    # Internal handlers
+    # -------------------------
+
+    async def _on_message(self, msg: dict):
+        if self._recovering and msg.get("action") != WSAction.RECV_TOPIC_ACTION:
+            self._record_recovery()
+        await self._dispatcher.dispatch(msg)
+
+    def _on_open(self):
+        logger.info("WebSocket connected.")
+        if self._disconnected_at is not None:
+            self.reconnect_count += 1
+            self._recovering = True
+        self._resubscribe_task = asyncio.create_task(self._resubscribe())
+
+    def _on_close(self):
+        logger.info("WebSocket disconnected.")
+        self._recovering = False
+        if self._disconnected_at is None:
+            self._disconnected_at = time.monotonic()
+
+    def _record_recovery(self):
+        latency = time.monotonic() - self._disconnected_at
+        self.recovery_latencies.append(latency)
+        self._disconnected_at = None
+        self._recovering = False
+        logger.info("Feed recovered %.3fs after disconnect.", latency)
+
+    def _on_error(self, error: Exception):
+        logger.error(f"WebSocket error: {error}")
+
+    def _next_local_no(self) -> int:
+        """Generate unique LocalNo for each subscription."""
+        self._local_no_counter += 1
+        return self._local_no_counter
+
+    @staticmethod
+    async def _call_client(method: Callable[..., Any], *args) -> Any:
+        """Call a Client method without blocking the loop, or await an AsyncClient one."""
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def _keep_extending_listenkey(self):
+        """Task that extends listenkey every 30 minutes."""
+        logger.info("Start auto-renew listenKey loop.")
+        while True:
+            await asyncio.sleep(30 * 60)
+            try:
+                if self._listenkey:
+                    await self._call_client(self._client.extend_listenkey, self._listenkey)
+                    logger.info("Extended listenKey: %s", self._listenkey)
+            except Exception as e:
+                logger.warning("Failed to extend listenKey: %s", e)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+from typing import Awaitable, Callable, Optional, Union
+
+import aiohttp
+
+from .async_connection import AsyncWebSocketConnection
+from .dispatcher import AsyncMessageDispatcher
+from .enums import PUBLIC_FUTURES_WS_ENDPOINT
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDeepcoinWebSocketStream:
+    """
+    asyncio counterpart of :class:`DeepcoinWebSocketStream`
+    (connection + dispatcher on the running event loop).
+    """
+
+    def __init__(
+        self,
+        endpoint: str = PUBLIC_FUTURES_WS_ENDPOINT,
+        ping_interval: float = 15.0,
+        reconnect: bool = True,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        self._endpoint = endpoint
+        self._dispatcher = AsyncMessageDispatcher()
+        self._connection = AsyncWebSocketConnection(
+            url=self._endpoint,
+            on_message=self._on_message,
+            on_open=self._on_open,
+            on_close=self._on_close,
+            on_error=self._on_error,
+            ping_interval=ping_interval,
+            reconnect=reconnect,
+            session=session,
+        )
+        self._local_no_counter = 1000
+
+    def start(self):
+        """Starts this stream's connection."""
+        logger.info(f"Starting async WS stream to {self._endpoint}")
+        self._connection.start()
+
+    async def stop(self):
+        """Stops the WebSocket stream."""
+        await self._connection.stop()
+
+    async def send(self, message: dict):
+        """Send raw payload over this WebSocket."""
+        await self._connection.send(message)
+
+    def is_alive(self) -> bool:
+        return self._connection.is_alive()
+
+    def register(
+        self,
+        topic_id: str,
+        callback: Callable[[dict], Union[None, Awaitable[None]]],
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """Register a plain or coroutine callback for a given action (optionally per symbol)."""
+        self._dispatcher.register(topic_id, callback, symbol=symbol, period=period)
+
+    def unregister(
+        self,
+        topic_id: str,
+        callback: Optional[Callable[[dict], Union[None, Awaitable[None]]]] = None,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        self._dispatcher.unregister(topic_id, callback, symbol=symbol, period=period)
+
+    async def _on_message(self, msg: dict):
+        await self._dispatcher.dispatch(msg)
+
+    def _on_open(self):
+        logger.info("Stream connected.")
+
+    def _on_close(self):
+        logger.info("Stream disconnected.")
+
+    def _on_error(self, error: Exception):
+        logger.error(f"Stream error: {error}")
+
+    def next_local_no(self) -> int:
+        self._local_no_counter += 1
+        return self._local_no_counter
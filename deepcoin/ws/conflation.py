@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .dispatcher import message_key
+
+logger = logging.getLogger(__name__)
+
+SlotKey = Tuple[str, Optional[str]]
+
+
+class _Slot:
+    __slots__ = ("interval", "generation", "last_sent", "pending", "scheduled")
+
+    def __init__(self, interval: float, generation: int):
+        self.interval = interval
+        self.generation = generation  # tells heap entries of a replaced slot apart
+        self.last_sent = float("-inf")
+        self.pending: Optional[dict] = None
+        self.scheduled = False
+
+
+class Conflator:
+    """
+    Rate-limited, latest-value-only delivery for selected (action, instrument) keys.
+
+    Every conflated message is delivered from one flusher thread
+    (``deepcoin-conflator``), so a key's updates arrive in order and never
+    concurrently. The first update after a quiet period is handed over at
+    once; updates arriving faster than ``max_rate`` per second overwrite
+    each other and only the newest one is delivered once the interval has
+    elapsed. Slow consumers therefore never see a backlog.
+
+    Messages of keys that are not conflated stay on the caller's (socket)
+    thread, so a callback registered for both conflated and unconflated
+    instruments of an action can run on the two threads at once.
+    """
+
+    def __init__(self, deliver: Callable[[dict], None]):
+        self._deliver = deliver
+        self._slots: Dict[SlotKey, _Slot] = {}
+        self._actions: Set[str] = set()
+        self._heap: List[Tuple[float, int, SlotKey]] = []
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self.delivered = 0
+        self.conflated = 0
+
+    def enable(self, action: str, key: str, max_rate: float):
+        """Conflate ``action`` pushes for ``key`` (see dispatcher.message_key) to ``max_rate``/s."""
+        if max_rate <= 0:
+            raise ValueError("max_rate must be > 0")
+        with self._cond:
+            self._generation += 1
+            self._slots[(action, key)] = _Slot(1.0 / max_rate, self._generation)
+            self._actions.add(action)
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._flush_forever, name="deepcoin-conflator", daemon=True)
+                self._thread.start()
+
+    def disable(self, action: str, key: str):
+        with self._cond:
+            self._slots.pop((action, key), None)
+            self._actions = {a for a, _ in self._slots}
+
+    def offer(self, message: dict) -> bool:
+        """Take ownership of a message if its key is conflated; returns False otherwise."""
+        action = message.get("action")
+        if action not in self._actions:
+            return False
+        key = (action, message_key(message))
+        with self._cond:
+            slot = self._slots.get(key)
+            if slot is None:
+                return False
+            if slot.pending is not None:
+                self.conflated += 1
+            slot.pending = message
+            if not slot.scheduled:
+                slot.scheduled = True
+                due = max(time.monotonic(), slot.last_sent + slot.interval)
+                heapq.heappush(self._heap, (due, slot.generation, key))
+                self._cond.notify()
+        return True
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _flush_forever(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                _, generation, key = heapq.heappop(self._heap)
+                slot = self._slots.get(key)
+                if slot is None or slot.generation != generation or slot.pending is None:
+                    continue
+                message, slot.pending = slot.pending, None
+                slot.scheduled = False
+                slot.last_sent = time.monotonic()
+                self.delivered += 1
+
+            try:
+                self._deliver(message)
+            except Exception as e:
+                logger.error(f"Error delivering conflated message: {e}")
@@ -1,10 +1,11 @@
 import threading
 import time
-import json
 import websocket
 import logging
-from typing import Callable, Optional
+from typing import Any, Callable, Optional, Tuple, Union
 
+from ..utils import codec
+from ..utils.backoff import ExponentialBackoff
 from .exceptions import (
     DeepcoinWebSocketConnectionError,
     DeepcoinWebSocketProtocolError,
@@ -17,7 +18,7 @@ class WebSocketConnection:
     """
     Handles a single WebSocket connection for Deepcoin.
     Includes:
-        - automatic reconnection
+        - automatic reconnection (exponential backoff with jitter)
         - optional heartbeat ping
         - on_message callback dispatch
     """
@@ -32,6 +33,7 @@ class WebSocketConnection:
         ping_interval: float = 15.0,
         reconnect: bool = True,
         reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
     ):
         self.url = url
         self.ws: Optional[websocket.WebSocketApp] = None
@@ -46,12 +48,41 @@ class WebSocketConnection:
         self.ping_interval = ping_interval
         self.reconnect = reconnect
         self.reconnect_delay = reconnect_delay
+        self._backoff = ExponentialBackoff(base=reconnect_delay, max_delay=max_reconnect_delay)
 
         self._last_pong_time = time.time()
+        self.ping_rtt: Optional[float] = None          # seconds, from the last ping/pong exchange
+        self.connected_at: Optional[float] = None      # time.monotonic() of the last open
+        self._reconnect_now = False
+        self._message_hooks: Tuple[Callable[[Union[str, bytes]], Any], ...] = ()
 
-    def _on_message(self, ws, message: str):
+    def add_message_hook(self, hook: Callable[[Union[str, bytes]], Any]):
+        """Call ``hook(raw_frame)`` for every received frame before it is decoded, e.g. Metrics.observe_frame."""
+        if hook not in self._message_hooks:
+            self._message_hooks = self._message_hooks + (hook,)
+
+    def remove_message_hook(self, hook: Callable[[Union[str, bytes]], Any]):
+        self._message_hooks = tuple(h for h in self._message_hooks if h != hook)
+
+    def _run_message_hooks(self, message: Union[str, bytes]):
+        for hook in self._message_hooks:
+            try:
+                hook(message)
+            except Exception:
+                logger.exception("Error in message hook.")
+
+    def _on_message(self, ws, message: Union[str, bytes]):
+        self.feed(message)
+
+    def feed(self, message: Union[str, bytes]):
+        """
+        Handle one raw frame as if it had been received on the socket: message hooks,
+        decoding and ``on_message``, on the calling thread. For replays and load tests.
+        """
+        if self._message_hooks:
+            self._run_message_hooks(message)
         try:
-            data = json.loads(message)
+            data = codec.loads(message)
             self.on_message(data)
         except Exception as e:
             logger.exception("Error while parsing WebSocket message.")
@@ -60,6 +91,8 @@ class WebSocketConnection:
     def _on_open(self, ws):
         logger.info("WebSocket opened.")
         self._last_pong_time = time.time()
+        self.connected_at = time.monotonic()
+        self._backoff.reset()
         if self.on_open:
             self.on_open()
 
@@ -76,6 +109,9 @@ class WebSocketConnection:
     def _on_pong(self, ws, message):
         logger.debug("PONG received.")
         self._last_pong_time = time.time()
+        ping_time = getattr(ws, "last_ping_tm", 0)
+        if ping_time:
+            self.ping_rtt = self._last_pong_time - ping_time
 
     def _run_forever(self):
         while not self._stop_event.is_set():
@@ -103,8 +139,13 @@ class WebSocketConnection:
                 logger.info("Reconnect disabled. Exiting WS loop.")
                 break
 
-            logger.info(f"Reconnecting in {self.reconnect_delay} seconds...")
-            time.sleep(self.reconnect_delay)
+            if self._reconnect_now:
+                self._reconnect_now = False
+                logger.info("Reconnecting now.")
+                continue
+            delay = self._backoff.next_delay()
+            logger.info(f"Reconnecting in {delay:.2f} seconds...")
+            self._stop_event.wait(delay)
 
     def start(self):
         """Start the WebSocket connection in a separate thread."""
@@ -129,11 +170,30 @@ class WebSocketConnection:
             self._thread.join(timeout=5)
         logger.info("WebSocket connection stopped.")
 
+    @property
+    def pong_age(self) -> float:
+        """Seconds since the last pong (or since the connection opened)."""
+        return time.time() - self._last_pong_time
+
+    def force_reconnect(self):
+        """
+        Drop the current socket (e.g. a silent half-open one) and reconnect without backoff delay.
+        The socket is shut down rather than closed with a handshake a dead peer would never answer.
+        """
+        sock = self.ws.sock if self.ws else None
+        if sock is None:
+            return
+        self._reconnect_now = True
+        try:
+            sock.abort()
+        except Exception as e:
+            logger.debug(f"Error while aborting WebSocket for reconnect: {e}")
+
     def send(self, message: dict):
         """Send a message (JSON-serializable dict) over the socket."""
         if self.ws and self.ws.sock and self.ws.sock.connected:
             try:
-                payload = json.dumps(message)
+                payload = codec.dumps(message)
                 self.ws.send(payload)
                 logger.debug(f"Sent: {payload}")
             except Exception as e:
@@ -1,58 +1,242 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Any
+import inspect
 import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from .enums import TopicID
+from .enums import TopicID, WSAction
 from .exceptions import DeepcoinCallbackError
 
 logger = logging.getLogger(__name__)
 
 
+def message_key(message: dict) -> Optional[str]:
+    """
+    Instrument key of a push message: "<InstrumentID>" or "<InstrumentID>_<Period>" for klines.
+    Returns None when the message carries no instrument (e.g. private pushes).
+    """
+    result = message.get("result")
+    if not result:
+        return None
+    data = result[0].get("data") if isinstance(result, list) else None
+    if not isinstance(data, dict):
+        return None
+    instrument = data.get("InstrumentID")
+    if instrument is None:
+        return None
+    period = data.get("PeriodID") or data.get("Period")
+    return f"{instrument}_{period}" if period else instrument
+
+
+Callback = Callable[[dict], Any]
+# (action, seconds spent dispatching) after every message
+DispatchHook = Callable[[Optional[str], float], Any]
+
+
+def route_key(symbol: str, period: Optional[str] = None) -> str:
+    """Routing key matching :func:`message_key` for a symbol (and kline period)."""
+    return f"{symbol}_{period}" if period else symbol
+
+
 class MessageDispatcher:
-    """Dispatches Deepcoin WebSocket messages to the appropriate user callback."""
+    """
+    Dispatches Deepcoin WebSocket messages to the appropriate user callbacks.
+
+    Any number of callbacks can subscribe to an action, either for every
+    message of that action or only for one instrument (and kline period).
+    Lookups are two dict hits per message regardless of how many
+    instruments are routed.
+    """
 
     def __init__(self):
-        # action -> callback
-        self._callbacks: Dict[str, Callable[[dict], None]] = {}
+        # action -> callbacks receiving every message of the action
+        self._callbacks: Dict[str, Tuple[Callback, ...]] = {}
+        # (action, route key) -> callbacks for one instrument
+        self._routes: Dict[Tuple[str, str], Tuple[Callback, ...]] = {}
+        # actions with at least one routed callback, to skip key extraction otherwise
+        self._routed_actions: Dict[str, int] = {}
+        self._hooks: Tuple[DispatchHook, ...] = ()
+        self._lock = threading.Lock()
 
-    def register(self, action: str, callback: Callable[[dict], None]):
-        """Register a callback function for a specific topic_id (str or TopicID enum)."""
+    def start(self):
+        """Hook for dispatchers with background workers; no-op here."""
+
+    def stop(self):
+        """Hook for dispatchers with background workers; no-op here."""
+
+    def register(
+        self,
+        action: str,
+        callback: Callback,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """
+        Register a callback for an action (str or WSAction enum).
+        With ``symbol`` (and ``period``, required for klines) it only receives that instrument's messages.
+        Registering the same callback twice for the same scope is a no-op.
+        """
         if not callable(callback):
             raise DeepcoinCallbackError(f"Callback for action {action} is not callable")
-        self._callbacks[action] = callback
-        logger.debug(f"Registered callback for action: {action}")
+        if symbol is not None and period is None and action == WSAction.PUSH_KLINE:
+            # Kline pushes are keyed "<symbol>_<period>"; a bare symbol route would never match.
+            raise ValueError("period is required to route kline callbacks by symbol")
+        # Tuples are replaced, never mutated, so dispatch can iterate them without locking.
+        with self._lock:
+            if symbol is None:
+                current = self._callbacks.get(action, ())
+                if callback not in current:
+                    self._callbacks[action] = current + (callback,)
+            else:
+                key = (action, route_key(symbol, period))
+                current = self._routes.get(key, ())
+                if callback not in current:
+                    self._routes[key] = current + (callback,)
+                    self._routed_actions[action] = self._routed_actions.get(action, 0) + 1
+        logger.debug(f"Registered callback for action: {action} (symbol={symbol}, period={period})")
+
+    def unregister(
+        self,
+        action: str,
+        callback: Optional[Callback] = None,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """
+        Remove callbacks of an action.
+        Without ``callback`` every callback in scope is removed; without ``symbol``
+        the scope is the whole action, including instrument routes.
+        """
+        with self._lock:
+            if symbol is None:
+                self._callbacks[action] = self._without(self._callbacks.get(action, ()), callback)
+                if not self._callbacks[action]:
+                    del self._callbacks[action]
+                keys = [key for key in self._routes if key[0] == action]
+            else:
+                keys = [(action, route_key(symbol, period))]
 
-    def unregister(self, action: str):
-        """Remove the callback associated with a topic_id."""
-        self._callbacks.pop(action, None)
-        logger.debug(f"Unregistered callback for action: {action}")
+            for key in keys:
+                current = self._routes.get(key)
+                if current is None:
+                    continue
+                remaining = self._without(current, callback)
+                removed = len(current) - len(remaining)
+                if remaining:
+                    self._routes[key] = remaining
+                else:
+                    del self._routes[key]
+                count = self._routed_actions.get(action, 0) - removed
+                if count > 0:
+                    self._routed_actions[action] = count
+                else:
+                    self._routed_actions.pop(action, None)
+        logger.debug(f"Unregistered callback for action: {action} (symbol={symbol}, period={period})")
+
+    def add_hook(self, hook: DispatchHook):
+        """Call ``hook(action, seconds)`` after every dispatched message, e.g. Metrics.observe_dispatch."""
+        with self._lock:
+            if hook not in self._hooks:
+                self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: DispatchHook):
+        with self._lock:
+            self._hooks = tuple(h for h in self._hooks if h != hook)
+
+    def _run_hooks(self, action: Optional[str], elapsed: float):
+        for hook in self._hooks:
+            try:
+                hook(action, elapsed)
+            except Exception:
+                logger.exception("Error in dispatch hook.")
+
+    @staticmethod
+    def _without(callbacks: Tuple[Callback, ...], callback: Optional[Callback]) -> Tuple[Callback, ...]:
+        if callback is None:
+            return ()
+        return tuple(cb for cb in callbacks if cb != callback)
 
     def dispatch(self, message: dict):
         """
-        Dispatch an incoming message to the registered callback.
+        Dispatch an incoming message to every matching callback.
         Expected format:
         {
-            "TopicID": "11",
-            "Data": { ... }
+            "action": "PushMarketTrade",
+            "result": [{"table": "...", "data": {"InstrumentID": "BTCUSDT", ...}}]
         }
+        All callbacks run even if one raises; the first error is re-raised afterwards.
         """
+        if not self._hooks:
+            return self._dispatch(message)
+        start = time.perf_counter()
+        try:
+            self._dispatch(message)
+        finally:
+            self._run_hooks(message.get("action"), time.perf_counter() - start)
+
+    def _dispatch(self, message: dict):
+        action, callbacks = self._resolve(message)
+        error = None
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.exception(f"Error in callback for action {action}: {e}")
+                if error is None:
+                    error = e
+        if error is not None:
+            raise DeepcoinCallbackError(str(error)) from error
+
+    def _resolve(self, message: dict) -> Tuple[Optional[str], Tuple[Callback, ...]]:
+        """Look up the action of a message and the callbacks it should reach."""
         action = message.get("action")
         if not action:
             logger.debug(f"[DISPATCH] Ignored message without 'action': {message}")
-            return
+            return None, ()
 
-        callback = self._callbacks.get(action)
-        if not callback:
+        callbacks = self._callbacks.get(action, ())
+        if action in self._routed_actions:
+            routed = self._routes.get((action, message_key(message)))
+            if routed:
+                callbacks = callbacks + routed if callbacks else routed
+
+        if not callbacks and action not in self._routed_actions:
             logger.warning(f"No callback registered for action: {action}")
-            return
+        return action, callbacks
+
+    def list_registered(self) -> list[str]:
+        """Returns the list of actions with at least one callback."""
+        return list(dict.fromkeys([*self._callbacks, *self._routed_actions]))
 
+
+class AsyncMessageDispatcher(MessageDispatcher):
+    """
+    asyncio variant of :class:`MessageDispatcher`.
+    Callbacks may be plain functions or coroutine functions; coroutines are awaited.
+    """
+
+    async def dispatch(self, message: dict):
+        if not self._hooks:
+            return await self._dispatch(message)
+        start = time.perf_counter()
         try:
-            callback(message)
-        except Exception as e:
-            logger.exception(f"Error in callback for action {action}: {e}")
-            raise DeepcoinCallbackError(str(e)) from e
+            await self._dispatch(message)
+        finally:
+            self._run_hooks(message.get("action"), time.perf_counter() - start)
 
-    def list_registered(self) -> list[str]:
-        """Returns the list of registered topic IDs."""
-        return list(self._callbacks.keys())
+    async def _dispatch(self, message: dict):
+        action, callbacks = self._resolve(message)
+        error = None
+        for callback in callbacks:
+            try:
+                result = callback(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.exception(f"Error in callback for action {action}: {e}")
+                if error is None:
+                    error = e
+        if error is not None:
+            raise DeepcoinCallbackError(str(error)) from error
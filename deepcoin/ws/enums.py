@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Final, Set
+from typing import Dict, Final, Set
 
 
 class Action(str, Enum):
@@ -40,6 +40,28 @@ class TopicID(str, Enum):
     KLINE = "11"
     ORDERBOOK_25_INCREMENTAL = "25"
 
+class OverflowPolicy(str, Enum):
+    """What a bounded dispatch queue does when it is full.
+
+    block: the socket reader waits for room
+    drop_oldest: the oldest queued message is discarded
+    conflate: a queued message with the same key is replaced by the newer one
+    """
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    CONFLATE = "conflate"
+
+class ShardingStrategy(str, Enum):
+    """How a connection pool assigns subscriptions to connections.
+
+    symbol_hash: all topics of a symbol share a connection (stable hash of the symbol)
+    topic: one topic type per connection
+    message_rate: the connection with the lowest measured message rate
+    """
+    SYMBOL_HASH = "symbol_hash"
+    TOPIC = "topic"
+    MESSAGE_RATE = "message_rate"
+
 PUBLIC_FUTURES_WS_ENDPOINT: Final[str] = "wss://stream.deepcoin.com/public/ws"
 PUBLIC_SPOT_WS_ENDPOINT: Final[str] = "wss://stream.deepcoin.com/public/spotws"
 
@@ -50,3 +72,11 @@ ALLOWED_PERIODS: Final[Set[str]] = {
 }
 
 DEFAULT_EXCHANGE_ID: Final[str] = "DeepCoin"
+
+# Push action produced by each public topic.
+TOPIC_ACTIONS: Final[Dict[str, str]] = {
+    TopicID.LAST_TRANSACTIONS.value: WSAction.PUSH_LAST_TX.value,
+    TopicID.LATEST_MARKET_DATA.value: WSAction.PUSH_MARKET_DATA.value,
+    TopicID.KLINE.value: WSAction.PUSH_KLINE.value,
+    TopicID.ORDERBOOK_25_INCREMENTAL.value: WSAction.PUSH_ORDERBOOK.value,
+}
@@ -0,0 +1,250 @@
+"""
+Connection health monitoring with stale-feed failover.
+
+A half-open TCP connection never closes by itself: pings go out, nothing
+comes back and every subscription goes quiet. HealthMonitor watches, per
+connection, the time since the last pong and, per subscribed topic
+(action + instrument), the time since its last push. A connection whose
+pongs or topics have all gone quiet is reconnected (subscriptions are
+replayed on open); a topic that went quiet on its own, e.g. an illiquid
+instrument, is only resubscribed, leaving the rest of the connection alone.
+
+Usage:
+    ws = DeepcoinWebsocketManager(PUBLIC_FUTURES_WS_ENDPOINT)
+    monitor = HealthMonitor(ws, thresholds={WSAction.PUSH_ORDERBOOK: 5.0, (WSAction.PUSH_KLINE, "BTCUSDT_1m"): 30.0})
+    monitor.start()
+    metrics.attach_health(monitor)        # RTT and staleness as metrics
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from .dispatcher import message_key, route_key
+from .enums import TOPIC_ACTIONS, WSAction
+from .subscriptions import Subscription
+
+logger = logging.getLogger(__name__)
+
+TopicKey = Tuple[str, str]   # (action, route key), e.g. ("PushMarketOrder", "BTCUSDT")
+
+# Seconds without a push before a topic counts as stale; None leaves the action unwatched
+# (trades on quiet instruments can legitimately pause for minutes).
+DEFAULT_THRESHOLDS: Dict[str, Optional[float]] = {
+    WSAction.PUSH_MARKET_DATA.value: 15.0,
+    WSAction.PUSH_ORDERBOOK.value: 15.0,
+    WSAction.PUSH_KLINE.value: 120.0,
+    WSAction.PUSH_LAST_TX.value: None,
+}
+
+
+class HealthMonitor:
+    """
+    Declares connections stale and forces a fast reconnect.
+
+    A connection is stale when no pong arrived for ``pong_timeout`` seconds
+    (default 2.5 ping intervals), or when its subscribed topics have been
+    silent longer than their threshold: all watched ones with
+    ``policy="all"`` (the default), any of them with ``policy="any"``.
+    With ``policy="all"`` a silent topic on an otherwise healthy connection
+    is resubscribed instead (unsubscribe + subscribe, gap hooks run), so
+    one quiet instrument does not cost every other feed a reconnect.
+    Thresholds are looked up by ``(action, route key)`` first, then by
+    action, then DEFAULT_THRESHOLDS. Ages count from the (re)connect or
+    resubscribe, so a fresh feed gets a full threshold of grace, and a
+    connection or topic is not forced again within
+    ``min_reconnect_interval`` seconds.
+
+    Works with a DeepcoinWebsocketManager or a DeepcoinWebsocketPool
+    (each shard is judged on its own subscriptions).
+    """
+
+    def __init__(
+        self,
+        manager,
+        thresholds: Optional[Dict[Union[str, TopicKey], Optional[float]]] = None,
+        pong_timeout: Optional[float] = None,
+        policy: str = "all",
+        check_interval: float = 1.0,
+        min_reconnect_interval: float = 10.0,
+        rtt_window: int = 100,
+    ):
+        if policy not in ("any", "all"):
+            raise ValueError("policy must be 'any' or 'all'")
+        self.manager = manager
+        self.thresholds: Dict[Union[str, TopicKey], Optional[float]] = dict(DEFAULT_THRESHOLDS)
+        for key, value in (thresholds or {}).items():
+            if isinstance(key, tuple):
+                key = (getattr(key[0], "value", key[0]), key[1])
+            else:
+                key = getattr(key, "value", key)
+            self.thresholds[key] = value
+        self.pong_timeout = pong_timeout
+        self.policy = policy
+        self.check_interval = check_interval
+        self.min_reconnect_interval = min_reconnect_interval
+
+        self._shards = getattr(manager, "shards", None) or [manager]
+        self._last_seen: Dict[TopicKey, float] = {}
+        self._resubscribed: Dict[Tuple[int, Subscription], float] = {}   # (connection, sub) -> monotonic time
+        self._rtts: List[Deque[float]] = [deque(maxlen=rtt_window) for _ in self._shards]
+        self._last_rtt: List[Optional[float]] = [None] * len(self._shards)
+        self._last_forced: List[float] = [-float("inf")] * len(self._shards)
+        self._status: List[Dict[str, Any]] = [{} for _ in self._shards]
+        self.forced_reconnects = 0
+        self.resubscribes = 0
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    def start(self):
+        """Watch every public push action and start checking in the background."""
+        for action in TOPIC_ACTIONS.values():
+            self.manager.register_callback(action, self._on_push)
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._check_forever, name="deepcoin-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        for action in TOPIC_ACTIONS.values():
+            self.manager.unregister_callback(action, self._on_push)
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _on_push(self, message: dict):
+        key = message_key(message)
+        if key is not None:
+            self._last_seen[(message["action"], key)] = time.monotonic()
+
+    def _check_forever(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Health check failed.")
+
+    # -------------------------
+    # Checks
+    # -------------------------
+
+    def threshold(self, action: str, key: str) -> Optional[float]:
+        """Staleness threshold of a topic in seconds (None: not watched)."""
+        if (action, key) in self.thresholds:
+            return self.thresholds[(action, key)]
+        return self.thresholds.get(action)
+
+    def check(self) -> List[bool]:
+        """
+        Evaluate every connection once, reconnecting stale ones and resubscribing silent topics
+        of healthy ones; returns the stale flag per connection.
+        """
+        flags = []
+        for index, shard in enumerate(self._shards):
+            connection = shard.connection
+            status, silent = self._evaluate(index, shard, connection)
+            with self._lock:
+                self._status[index] = status
+            stale = status["stale"]
+            flags.append(stale)
+            if stale:
+                if time.monotonic() - self._last_forced[index] >= self.min_reconnect_interval:
+                    self._last_forced[index] = time.monotonic()
+                    self.forced_reconnects += 1
+                    logger.warning(f"Connection {index} is stale ({'; '.join(status['reasons'])}), reconnecting.")
+                    connection.force_reconnect()
+            elif self.policy == "all":
+                for sub in silent:
+                    self._resubscribe(index, shard, sub)
+        return flags
+
+    def _resubscribe(self, index: int, shard, sub: Subscription):
+        now = time.monotonic()
+        if now - self._resubscribed.get((index, sub), -float("inf")) < self.min_reconnect_interval:
+            return
+        self._resubscribed[(index, sub)] = now
+        logger.warning(f"Topic {sub.topic_id} {sub.filter_value} on connection {index} is silent, resubscribing.")
+        try:
+            shard.resubscribe(sub)
+            self.resubscribes += 1
+        except Exception as e:
+            logger.warning(f"Resubscribe of {sub.filter_value} on connection {index} failed: {e}")
+
+    def _evaluate(self, index: int, shard, connection) -> Tuple[Dict[str, Any], List[Subscription]]:
+        """Status of one connection and its subscriptions silent past their threshold."""
+        alive = connection.is_alive()
+        rtt = connection.ping_rtt
+        if rtt is not None and rtt != self._last_rtt[index]:
+            self._last_rtt[index] = rtt
+            self._rtts[index].append(rtt)
+        status: Dict[str, Any] = {"alive": alive, "rtt": rtt, "stale": False, "reasons": [], "topics": {}}
+        if not alive or connection.connected_at is None:
+            # Closed sockets are already being reconnected by the connection itself.
+            return status, []
+
+        now = time.monotonic()
+        status["pong_age"] = pong_age = connection.pong_age
+        pong_timeout = self.pong_timeout
+        if pong_timeout is None and connection.ping_interval:
+            pong_timeout = connection.ping_interval * 2.5
+        pong_stale = pong_timeout is not None and pong_age > pong_timeout
+        if pong_stale:
+            status["reasons"].append(f"no pong for {pong_age:.1f}s")
+
+        watched = 0
+        silent: List[Subscription] = []
+        subscriptions = shard.subscriptions()
+        current = set(subscriptions)
+        for gone in [k for k in self._resubscribed if k[0] == index and k[1] not in current]:
+            del self._resubscribed[gone]
+        for sub in subscriptions:
+            action = TOPIC_ACTIONS.get(sub.topic_id)
+            if action is None:
+                continue
+            key = route_key(sub.symbol, sub.period)
+            threshold = self.threshold(action, key)
+            since = max(
+                self._last_seen.get((action, key), 0.0),
+                connection.connected_at,
+                self._resubscribed.get((index, sub), 0.0),
+            )
+            age = now - since
+            topic_stale = threshold is not None and age > threshold
+            status["topics"][f"{action} {key}"] = {"age": age, "threshold": threshold, "stale": topic_stale}
+            if threshold is not None:
+                watched += 1
+                if topic_stale:
+                    silent.append(sub)
+        if silent and (self.policy == "any" or len(silent) == watched):
+            status["reasons"].append(f"{len(silent)}/{watched} topics silent past threshold")
+
+        status["stale"] = bool(status["reasons"])
+        return status, silent
+
+    # -------------------------
+    # Stats
+    # -------------------------
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Per connection: alive, last and median ping RTT (s), pong age (s), stale flag and reasons,
+        and per topic ("<action> <key>") its age, threshold and stale flag.
+        """
+        with self._lock:
+            statuses = [dict(s) for s in self._status]
+        for index, status in enumerate(statuses):
+            rtts = sorted(self._rtts[index])
+            status["rtt_median"] = rtts[len(rtts) // 2] if rtts else None
+            status["rtt_max"] = rtts[-1] if rtts else None
+        return statuses
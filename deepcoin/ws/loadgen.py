@@ -0,0 +1,520 @@
+"""
+Synthetic feed generator for stress-testing the WS message path.
+
+Replays a weighted mix of public pushes (trades, 25-level book updates,
+tickers, klines) at a fixed rate, either straight into a manager's
+connection (``sink="direct"``: ``connection.feed()``, decode + manager +
+dispatcher on the calling thread, like the socket thread) or from a local
+WebSocket endpoint in a child process (``sink="endpoint"``: real sockets,
+needs aiohttp).
+
+Each run reports the achieved rate, frames dropped or conflated by a queued
+dispatcher, frames still in flight when the run stopped waiting, send ->
+callback latency, garbage-collector pauses and RSS growth;
+find_saturation() raises the rate until the feed falls behind.
+
+Usage:
+    gen = LoadGenerator(dispatcher=QueuedMessageDispatcher(workers=2, maxsize=10_000,
+                                                           policy=OverflowPolicy.DROP_OLDEST))
+    gen.dispatcher.register(WSAction.PUSH_LAST_TX, on_trade)     # the callbacks under test
+    report = gen.run(rate=100_000, duration=10)
+    steps = gen.find_saturation(start_rate=10_000, max_rate=500_000)
+
+    python -m deepcoin.ws.loadgen --rate 100000 --duration 10 --sink direct
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import random
+import threading
+import time
+from array import array
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .dispatcher import MessageDispatcher
+from .enums import WSAction
+from .manager import DeepcoinWebsocketManager
+
+logger = logging.getLogger(__name__)
+
+# Placeholder replaced by the send time (ns) of every frame.
+_STAMP = '"SendTimeNs":-1'
+
+# URL of the default manager; the endpoint sink points it at the child process on every run.
+_LOCAL_ENDPOINT = "ws://127.0.0.1:0/feed"
+
+
+@dataclass
+class FeedMix:
+    """Shape of the synthetic feed: action weights, symbol count and frame sizes."""
+    weights: Dict[str, float] = field(default_factory=lambda: {
+        WSAction.PUSH_LAST_TX.value: 0.45,
+        WSAction.PUSH_ORDERBOOK.value: 0.35,
+        WSAction.PUSH_MARKET_DATA.value: 0.15,
+        WSAction.PUSH_KLINE.value: 0.05,
+    })
+    symbols: int = 50
+    book_levels: int = 5       # rows per PushMarketOrder frame
+    padding: int = 0           # extra bytes per frame, to emulate larger messages
+    pool_size: int = 4096      # distinct frames generated up front and cycled
+    seed: int = 7
+
+    def symbol_names(self) -> List[str]:
+        majors = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT"]
+        return (majors + [f"SYM{i}USDT" for i in range(self.symbols)])[: self.symbols]
+
+    def frames(self) -> List[Tuple[str, str, str]]:
+        """(action, head, tail) per pooled frame; a frame is ``head + str(time_ns) + tail``."""
+        rng = random.Random(self.seed)
+        symbols = self.symbol_names()
+        actions = list(self.weights)
+        cumulative = [sum(list(self.weights.values())[: i + 1]) for i in range(len(actions))]
+        pool = []
+        for seq in range(self.pool_size):
+            action = rng.choices(actions, cum_weights=cumulative)[0]
+            symbol = rng.choice(symbols)
+            frame = json.dumps(self._message(action, symbol, seq, rng), separators=(",", ":"))
+            pool.append((action, *_split(frame)))
+        return pool
+
+    def _message(self, action: str, symbol: str, seq: int, rng: random.Random) -> Dict[str, Any]:
+        price = round(65000 * (1 + rng.uniform(-0.01, 0.01)), 1)
+        now = int(time.time())
+        if action == WSAction.PUSH_LAST_TX.value:
+            rows = [("Trade", {
+                "InstrumentID": symbol, "Direction": rng.choice("01"), "Price": price,
+                "Volume": round(rng.uniform(0.001, 5), 3), "TradeID": str(10_000_000 + seq), "TradeTime": now,
+            })]
+        elif action == WSAction.PUSH_ORDERBOOK.value:
+            rows = [("MarketOrder", {
+                "InstrumentID": symbol, "Direction": str(i % 2),
+                "Price": round(price + (i // 2 + 1) * (0.5 if i % 2 else -0.5), 1),
+                "Volume": rng.randint(0, 500),
+            }) for i in range(self.book_levels)]
+        elif action == WSAction.PUSH_KLINE.value:
+            rows = [("KLine", {
+                "InstrumentID": symbol, "PeriodID": "1m", "BeginTime": now - now % 60,
+                "OpenPrice": price, "ClosePrice": price, "HighestPrice": price + 5, "LowestPrice": price - 5,
+                "Volume": rng.randint(1, 10_000), "Turnover": price * 10,
+            })]
+        else:
+            rows = [("MarketOverView", {
+                "InstrumentID": symbol, "LastPrice": price, "BidPrice1": price - 0.5, "AskPrice1": price + 0.5,
+                "BidVolume1": rng.randint(1, 500), "AskVolume1": rng.randint(1, 500), "Volume": 1_900_000,
+                "Turnover": 1.2e11, "OpenInterest": 80_000, "UpdateTime": now, "UpdateMilliTime": now * 1000,
+            })]
+        rows[0][1]["SendTimeNs"] = -1
+        if self.padding:
+            rows[0][1]["Pad"] = "x" * self.padding
+        return {"action": action, "result": [{"table": table, "data": data} for table, data in rows]}
+
+
+def _split(frame: str) -> Tuple[str, str]:
+    head, tail = frame.split(_STAMP, 1)
+    return head + '"SendTimeNs":', tail
+
+
+@dataclass
+class LoadReport:
+    target_rate: float
+    duration: float             # seconds from first to last frame sent
+    sent: int
+    received: int               # frames that reached the measuring callback
+    dropped: int                # frames discarded by a QueuedMessageDispatcher's bounded queues
+    conflated: int              # frames replaced by a newer one in a conflating queue
+    in_flight: int              # frames neither received nor discarded when the drain gave up
+    achieved_rate: float
+    frame_bytes: float          # mean frame size
+    latency_ms: Dict[str, float]
+    gc: Dict[str, Any]
+    memory_mb: Dict[str, float]
+    saturated: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# -------------------------
+# Measurement helpers
+# -------------------------
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current RSS on platforms without /proc (kB on Linux, bytes on macOS).
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class _GCWatch:
+    """
+    Collects garbage-collector pause durations through gc.callbacks.
+    Start and stop are paired per thread, since collections can run on any thread
+    (and concurrently on free-threaded builds).
+    """
+
+    def __init__(self):
+        self.pauses: List[Tuple[int, float]] = []
+        self._starts: Dict[int, float] = {}   # thread ident -> start of its running collection
+
+    def __call__(self, phase: str, info: Dict[str, Any]):
+        now = time.perf_counter()
+        ident = threading.get_ident()
+        if phase == "start":
+            self._starts[ident] = now
+            return
+        start = self._starts.pop(ident, None)
+        if start is not None:    # None: the collection began before the watch was installed
+            self.pauses.append((info.get("generation", -1), now - start))
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+    def summary(self) -> Dict[str, Any]:
+        durations = [d for _, d in self.pauses]
+        by_generation: Dict[str, int] = {}
+        for generation, _ in self.pauses:
+            by_generation[str(generation)] = by_generation.get(str(generation), 0) + 1
+        return {
+            "collections": len(durations),
+            "total_ms": sum(durations) * 1e3,
+            "max_ms": max(durations, default=0.0) * 1e3,
+            "by_generation": by_generation,
+        }
+
+
+class _MemoryWatch:
+    """Samples RSS on a background thread while a run is in progress."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.start = self.peak = self.end = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        self.start = self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.end = _rss_bytes()
+        self.peak = max(self.peak, self.end)
+
+    def summary(self) -> Dict[str, float]:
+        mb = 1024 * 1024
+        return {
+            "rss_start": self.start / mb,
+            "rss_end": self.end / mb,
+            "rss_peak": self.peak / mb,
+            "growth": (self.end - self.start) / mb,
+        }
+
+
+def _paced(rate: float, total: int) -> Iterator[int]:
+    """Yield how many frames are due, sleeping while ahead of schedule; falls behind freely."""
+    start = time.perf_counter()
+    sent = 0
+    while sent < total:
+        elapsed = time.perf_counter() - start
+        due = min(total, int(elapsed * rate) + 1)
+        if due > sent:
+            yield due - sent
+            sent = due
+        else:
+            time.sleep(max(0.0, (sent + 1) / rate - elapsed))
+
+
+# -------------------------
+# Endpoint sink (child process)
+# -------------------------
+
+def _endpoint_main(mix: FeedMix, conn):
+    """Child process: serve the feed on a local WebSocket and push it on command."""
+    from aiohttp import web
+
+    pool = mix.frames()
+    state: Dict[str, Any] = {"ws": None, "connected": None}
+
+    async def handler(request):
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        state["ws"] = ws
+        state["connected"].set()
+        async for _ in ws:
+            pass
+        return ws
+
+    async def feed(rate: float, total: int) -> Tuple[int, float]:
+        await asyncio.wait_for(state["connected"].wait(), 30)
+        ws = state["ws"]
+        start = time.perf_counter()
+        sent = 0
+        while sent < total:
+            due = min(total, int((time.perf_counter() - start) * rate) + 1)
+            if due <= sent:
+                await asyncio.sleep((sent + 1) / rate - (time.perf_counter() - start))
+                continue
+            for i in range(sent, due):
+                _, head, tail = pool[i % len(pool)]
+                await ws.send_str(f"{head}{time.time_ns()}{tail}")
+            sent = due
+        return sent, time.perf_counter() - start
+
+    async def main():
+        state["connected"] = asyncio.Event()
+        app = web.Application()
+        app.router.add_get("/feed", handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        conn.send(runner.addresses[0][1])
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await loop.run_in_executor(None, conn.recv)
+            if command is None:
+                break
+            conn.send(await feed(*command))
+        await runner.cleanup()
+
+    asyncio.run(main())
+
+
+# -------------------------
+# Generator
+# -------------------------
+
+class LoadGenerator:
+    """
+    Drives a DeepcoinWebsocketManager with a synthetic feed and measures how it copes.
+
+    ``manager`` is the manager under test, or one is created once around
+    ``dispatcher`` (a MessageDispatcher by default) and reused by every run;
+    callbacks registered on it run as they would in production. The
+    generator adds one measuring callback per action, registered last, so
+    latency includes the callbacks before it.
+    """
+
+    def __init__(
+        self,
+        mix: Optional[FeedMix] = None,
+        sink: str = "direct",
+        dispatcher: Optional[MessageDispatcher] = None,
+        max_latency: float = 0.1,
+        drain_timeout: float = 2.0,
+        manager: Optional[DeepcoinWebsocketManager] = None,
+    ):
+        if sink not in ("direct", "endpoint"):
+            raise ValueError("sink must be 'direct' or 'endpoint'")
+        if manager is not None and dispatcher is not None:
+            raise ValueError("Pass either a manager or a dispatcher, not both.")
+        self.mix = mix or FeedMix()
+        self.sink = sink
+        self.manager = manager or DeepcoinWebsocketManager(_LOCAL_ENDPOINT, dispatcher=dispatcher)
+        self.dispatcher = self.manager.dispatcher
+        self.max_latency = max_latency
+        self.drain_timeout = drain_timeout
+
+        self._pool = self.mix.frames()
+        self._latencies = array("q")
+        self._received = 0
+        self._lock = threading.Lock()
+
+    def _on_push(self, message: dict):
+        sent = message["result"][0]["data"].get("SendTimeNs")
+        now = time.time_ns()
+        with self._lock:
+            self._received += 1
+            if sent is not None:
+                self._latencies.append(now - sent)
+
+    def _drain(self, sent: int):
+        """Wait until every frame reached the callback, or no progress for drain_timeout."""
+        last, deadline = self._received, time.monotonic() + self.drain_timeout
+        while self._received < sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+            if self._received != last:
+                last, deadline = self._received, time.monotonic() + self.drain_timeout
+
+    # -------------------------
+    # Sinks
+    # -------------------------
+
+    def _run_direct(self, rate: float, total: int) -> Tuple[int, float, int]:
+        feed = self.manager.connection.feed
+        pool, size = self._pool, len(self._pool)
+        sent = nbytes = 0
+        start = time.perf_counter()
+        for batch in _paced(rate, total):
+            for i in range(sent, sent + batch):
+                _, head, tail = pool[i % size]
+                frame = f"{head}{time.time_ns()}{tail}"
+                nbytes += len(frame)
+                try:
+                    feed(frame)
+                except Exception:
+                    logger.debug("Frame raised in the message handler.", exc_info=True)
+            sent += batch
+        return sent, time.perf_counter() - start, nbytes
+
+    def _run_endpoint(self, rate: float, total: int) -> Tuple[int, float, int]:
+        manager = self.manager
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_endpoint_main, args=(self.mix, child), daemon=True)
+        process.start()
+        try:
+            if not parent.poll(30):
+                raise RuntimeError("Load generator endpoint did not start.")
+            manager.connection.url = f"ws://127.0.0.1:{parent.recv()}/feed"
+            manager.start()
+            parent.send((rate, total))
+            sent, elapsed = parent.recv()
+            self._drain(sent)
+        finally:
+            # Close from this side first so the endpoint exiting is not seen as a dropped connection.
+            manager.stop()
+            if process.is_alive():
+                parent.send(None)
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        # 19 digits of time.time_ns() between head and tail.
+        frame_bytes = sum(len(head) + len(tail) + 19 for _, head, tail in self._pool) / len(self._pool)
+        return sent, elapsed, int(frame_bytes * sent)
+
+    # -------------------------
+    # Runs
+    # -------------------------
+
+    def run(self, rate: float, duration: float = 10.0) -> LoadReport:
+        """Push ``rate`` frames/s for ``duration`` seconds and report how the pipeline kept up."""
+        total = max(1, int(rate * duration))
+        for action in self.mix.weights:
+            self.manager.register_callback(action, self._on_push)
+        self._latencies = array("q")
+        self._received = 0
+        dropped_before, conflated_before = self._discarded()
+
+        try:
+            with _GCWatch() as gc_watch, _MemoryWatch() as memory:
+                self.dispatcher.start()
+                runner = self._run_direct if self.sink == "direct" else self._run_endpoint
+                sent, elapsed, nbytes = runner(rate, total)
+                self._drain(sent)
+        finally:
+            for action in self.mix.weights:
+                self.manager.unregister_callback(action, self._on_push)
+
+        with self._lock:
+            received = self._received
+            latencies = sorted(self._latencies)
+        dropped, conflated = self._discarded()
+        dropped -= dropped_before
+        conflated -= conflated_before
+
+        achieved = sent / elapsed if elapsed > 0 else 0.0
+        latency_ms: Dict[str, float] = {}
+        if latencies:
+            pick = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] / 1e6  # noqa: E731
+            latency_ms = {"p50": pick(0.5), "p99": pick(0.99), "max": latencies[-1] / 1e6}
+        report = LoadReport(
+            target_rate=rate,
+            duration=elapsed,
+            sent=sent,
+            received=received,
+            dropped=dropped,
+            conflated=conflated,
+            in_flight=max(0, sent - received - dropped - conflated),
+            achieved_rate=achieved,
+            frame_bytes=nbytes / sent if sent else 0.0,
+            latency_ms=latency_ms,
+            gc=gc_watch.summary(),
+            memory_mb=memory.summary(),
+        )
+        report.saturated = (
+            achieved < rate * 0.95
+            or report.dropped > 0
+            or report.in_flight > 0
+            or latency_ms.get("p99", 0.0) > self.max_latency * 1e3
+        )
+        return report
+
+    def _discarded(self) -> Tuple[int, int]:
+        """(dropped, conflated) totals of a queued dispatcher; (0, 0) for one that never discards."""
+        return getattr(self.dispatcher, "dropped", 0), getattr(self.dispatcher, "conflated", 0)
+
+    def find_saturation(
+        self,
+        start_rate: float = 10_000,
+        max_rate: float = 1_000_000,
+        factor: float = 1.5,
+        duration: float = 5.0,
+    ) -> Tuple[Optional[float], List[LoadReport]]:
+        """
+        Multiply the rate by ``factor`` from ``start_rate`` until a run saturates (falls 5 % behind,
+        drops frames, leaves frames in flight or exceeds max_latency at p99). Returns (highest sustained rate or None, reports).
+        """
+        reports = []
+        sustained = None
+        rate = start_rate
+        while rate <= max_rate:
+            report = self.run(rate, duration)
+            reports.append(report)
+            logger.info(
+                f"{rate:,.0f} msg/s target: {report.achieved_rate:,.0f} achieved, "
+                f"{report.dropped} dropped, {report.in_flight} in flight, p99 {report.latency_ms.get('p99', 0):.2f} ms"
+            )
+            if report.saturated:
+                break
+            sustained = rate
+            rate *= factor
+        return sustained, reports
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Stress-test the WS message path with a synthetic feed.")
+    parser.add_argument("--rate", type=float, default=100_000, help="frames per second")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--sink", choices=["direct", "endpoint"], default="direct")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--book-levels", type=int, default=5)
+    parser.add_argument("--padding", type=int, default=0)
+    parser.add_argument("--saturation", action="store_true", help="ramp up from --rate until saturated")
+    args = parser.parse_args(argv)
+
+    mix = FeedMix(symbols=args.symbols, book_levels=args.book_levels, padding=args.padding)
+    generator = LoadGenerator(mix, sink=args.sink)
+    if args.saturation:
+        sustained, reports = generator.find_saturation(start_rate=args.rate, duration=args.duration)
+        print(json.dumps({"sustained_rate": sustained, "steps": [r.to_dict() for r in reports]}, indent=2))
+    else:
+        print(json.dumps(generator.run(args.rate, args.duration).to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
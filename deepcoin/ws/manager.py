@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import logging
 import threading
-from typing import Callable, Optional
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
 
+from .conflation import Conflator
 from .connection import WebSocketConnection
 from .dispatcher import MessageDispatcher
 from . import topics
-from .enums import TopicID, PUBLIC_FUTURES_WS_ENDPOINT, PRIVATE_WS_ENDPOINT
+from .enums import TopicID, WSAction, PUBLIC_FUTURES_WS_ENDPOINT, PRIVATE_WS_ENDPOINT
+from .subscriptions import Subscription, SubscriptionRegistry
 from ..client import Client
 
 logger = logging.getLogger(__name__)
@@ -18,11 +22,26 @@ class DeepcoinWebsocketManager:
     WebSocket manager for Deepcoin public and private topics.
     Handles connection, subscription, and callback dispatch.
     Automatically handles listenkey for private connection.
+
+    Active subscriptions are kept in a registry and replayed in batches
+    every time the connection (re)opens, so subscribing before start()
+    is allowed and feeds come back by themselves after a reconnect.
+
+    Pass a QueuedMessageDispatcher as ``dispatcher`` to run callbacks on
+    worker threads instead of the socket thread.
     """
 
-    def __init__(self, endpoint: str = PUBLIC_FUTURES_WS_ENDPOINT, client: Optional[Client] = None):
+    def __init__(
+        self,
+        endpoint: str = PUBLIC_FUTURES_WS_ENDPOINT,
+        client: Optional[Client] = None,
+        resubscribe_batch_size: int = 20,
+        resubscribe_batch_interval: float = 0.1,
+        dispatcher: Optional[MessageDispatcher] = None,
+    ):
         self._endpoint = endpoint
-        self._dispatcher = MessageDispatcher()
+        self._dispatcher = dispatcher or MessageDispatcher()
+        self._conflator = Conflator(self._dispatcher.dispatch)
         self._connection = WebSocketConnection(
             url=self._endpoint,
             on_message=self._on_message,
@@ -37,6 +56,18 @@ class DeepcoinWebsocketManager:
         self._extend_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
 
+        self._subscriptions = SubscriptionRegistry()
+        self._resubscribe_batch_size = resubscribe_batch_size
+        self._resubscribe_batch_interval = resubscribe_batch_interval
+        self._resubscribe_thread: Optional[threading.Thread] = None
+
+        # disconnect -> first push after resubscribe
+        self._disconnected_at: Optional[float] = None
+        self._recovering = False
+        self.reconnect_count = 0
+        self.recovery_latencies: Deque[float] = deque(maxlen=100)
+        self._gap_hooks: Tuple[Callable[[List[Subscription]], Any], ...] = ()
+
     # -------------------------
     # WebSocket lifecycle
     # -------------------------
@@ -56,6 +87,7 @@ class DeepcoinWebsocketManager:
             self._extend_thread = threading.Thread(target=self._keep_extending_listenkey, daemon=True)
             self._extend_thread.start()
 
+        self._dispatcher.start()
         self._connection.start()
 
     def stop(self):
@@ -63,47 +95,107 @@ class DeepcoinWebsocketManager:
         logger.info("Stopping Deepcoin WS manager.")
         self._stop_event.set()
         self._connection.stop()
+        self._conflator.stop()
+        self._dispatcher.stop()
 
     def is_alive(self) -> bool:
         return self._connection.is_alive()
 
+    @property
+    def connection(self) -> WebSocketConnection:
+        return self._connection
+
+    @property
+    def dispatcher(self) -> MessageDispatcher:
+        return self._dispatcher
+
     # -------------------------
     # Callback registration
     # -------------------------
 
-    def register_callback(self, topic: TopicID | str, callback: Callable[[dict], None]):
-        """Register a user callback for a specific TopicID."""
-        self._dispatcher.register(topic, callback)
+    def register_callback(
+        self,
+        topic: WSAction | str,
+        callback: Callable[[dict], None],
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """
+        Register a user callback for a WS action.
+        Several callbacks may share an action; pass ``symbol`` (and ``period``
+        for klines) to receive only that instrument's pushes.
+        """
+        self._dispatcher.register(topic, callback, symbol=symbol, period=period)
 
-    def unregister_callback(self, topic: TopicID | str):
-        self._dispatcher.unregister(topic)
+    def unregister_callback(
+        self,
+        topic: WSAction | str,
+        callback: Optional[Callable[[dict], None]] = None,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """Remove one callback, or every callback of the action when ``callback`` is omitted."""
+        self._dispatcher.unregister(topic, callback, symbol=symbol, period=period)
+
+    def add_gap_hook(self, hook: Callable[[List[Subscription]], Any]):
+        """
+        Call ``hook(subscriptions)`` when pushes of those subscriptions may have been missed:
+        on every reconnect, before they are replayed. Used by OrderBookManager to resync books.
+        """
+        if hook not in self._gap_hooks:
+            self._gap_hooks = self._gap_hooks + (hook,)
+
+    def remove_gap_hook(self, hook: Callable[[List[Subscription]], Any]):
+        self._gap_hooks = tuple(h for h in self._gap_hooks if h != hook)
+
+    def _run_gap_hooks(self, subscriptions: List[Subscription]):
+        for hook in self._gap_hooks:
+            try:
+                hook(subscriptions)
+            except Exception:
+                logger.exception("Error in gap hook.")
 
     # -------------------------
     # Subscription helpers
     # -------------------------
 
-    def subscribe_market_data(self, symbol: str):
-        """Subscribe to market ticker/overview (TopicID=7)."""
-        payload = topics.sub_latest_market_data(symbol, local_no=self._next_local_no())
-        self._connection.send(payload)
+    def subscribe_market_data(self, symbol: str, conflate: bool = False, max_rate: float = 10.0):
+        """
+        Subscribe to market ticker/overview (TopicID=7).
+        conflate: deliver only the newest update for this symbol, at most max_rate per second.
+                  Conflated updates are delivered from the conflator thread, not the socket thread.
+        """
+        if conflate:
+            self._conflator.enable(WSAction.PUSH_MARKET_DATA.value, symbol, max_rate)
+        self._subscribe(Subscription(TopicID.LATEST_MARKET_DATA.value, symbol))
 
     def subscribe_trade(self, symbol: str):
         """Subscribe to last trade updates (TopicID=2)."""
-        payload = topics.sub_last_transactions(symbol, local_no=self._next_local_no())
-        self._connection.send(payload)
+        self._subscribe(Subscription(TopicID.LAST_TRANSACTIONS.value, symbol))
 
-    def subscribe_kline(self, symbol: str, period: str):
-        """Subscribe to Kline updates (TopicID=11)."""
-        payload = topics.sub_kline(symbol, period, local_no=self._next_local_no())
-        self._connection.send(payload)
+    def subscribe_kline(self, symbol: str, period: str, conflate: bool = False, max_rate: float = 10.0):
+        """
+        Subscribe to Kline updates (TopicID=11).
+        conflate: deliver only the newest bar update for this symbol/period, at most max_rate per second.
+                  Conflated updates are delivered from the conflator thread, not the socket thread.
+        """
+        topics.build_filter_value(symbol, period=period)  # validate period up front
+        if conflate:
+            self._conflator.enable(WSAction.PUSH_KLINE.value, f"{symbol}_{period}", max_rate)
+        self._subscribe(Subscription(TopicID.KLINE.value, symbol, period))
 
     def subscribe_orderbook(self, symbol: str):
         """Subscribe to 25-depth incremental orderbook (TopicID=25)."""
-        payload = topics.sub_orderbook_25_incremental(symbol, local_no=self._next_local_no())
-        self._connection.send(payload)
+        self._subscribe(Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, symbol))
 
     def unsubscribe(self, topic_id: TopicID | str, symbol: str, period: Optional[str] = None):
         """Unsubscribe from a topic."""
+        topic_id = topic_id.value if isinstance(topic_id, TopicID) else topic_id
+        self._subscriptions.remove(Subscription(topic_id, symbol, period))
+        if topic_id == TopicID.LATEST_MARKET_DATA.value:
+            self._conflator.disable(WSAction.PUSH_MARKET_DATA.value, symbol)
+        elif topic_id == TopicID.KLINE.value:
+            self._conflator.disable(WSAction.PUSH_KLINE.value, f"{symbol}_{period}")
         payload = topics.unsub(
             topic_id=topic_id,
             symbol=symbol,
@@ -114,21 +206,92 @@ class DeepcoinWebsocketManager:
 
     def unsubscribe_all(self):
         """Unsubscribe from all topics."""
+        self._subscriptions.clear()
         payload = topics.unsub_all(local_no=self._next_local_no())
         self._connection.send(payload)
 
+    def resubscribe(self, sub: Subscription):
+        """
+        Unsubscribe and subscribe one registered topic again on the live connection,
+        e.g. when only its feed went silent. Gap hooks run for it first.
+        """
+        if sub not in self._subscriptions:
+            raise ValueError(f"Not subscribed to {sub.topic_id} {sub.filter_value}")
+        if self._gap_hooks:
+            self._run_gap_hooks([sub])
+        payload = topics.unsub(
+            topic_id=sub.topic_id,
+            symbol=sub.symbol,
+            local_no=self._next_local_no(),
+            period=sub.period,
+        )
+        self._connection.send(payload)
+        self._connection.send(sub.to_payload(self._next_local_no()))
+
+    def subscriptions(self) -> List[Subscription]:
+        """Active subscriptions, replayed after every reconnect."""
+        return self._subscriptions.list()
+
+    @property
+    def last_recovery_latency(self) -> Optional[float]:
+        """Seconds from the last disconnect to the first push after resubscribing."""
+        return self.recovery_latencies[-1] if self.recovery_latencies else None
+
+    def _subscribe(self, sub: Subscription):
+        self._subscriptions.add(sub)
+        if self._connection.is_alive():
+            self._connection.send(sub.to_payload(self._next_local_no()))
+        else:
+            logger.info("Not connected yet, %s will be sent on open.", sub.filter_value)
+
+    def _resubscribe(self):
+        """Replay the registry in batches (runs off the socket thread)."""
+        batches = self._subscriptions.batches(self._resubscribe_batch_size)
+        for i, batch in enumerate(batches):
+            if i and self._stop_event.wait(self._resubscribe_batch_interval):
+                return
+            for sub in batch:
+                try:
+                    self._connection.send(sub.to_payload(self._next_local_no()))
+                except Exception as e:
+                    logger.warning("Resubscribe of %s failed: %s", sub.filter_value, e)
+                    return
+        if batches:
+            logger.info("Resubscribed %d topics.", sum(len(b) for b in batches))
+
     # -------------------------
     # Internal handlers
     # -------------------------
 
     def _on_message(self, msg: dict):
+        if self._recovering and msg.get("action") != WSAction.RECV_TOPIC_ACTION:
+            self._record_recovery()
+        if self._conflator.offer(msg):
+            return
         self._dispatcher.dispatch(msg)
 
     def _on_open(self):
         logger.info("WebSocket connected.")
+        if self._disconnected_at is not None:
+            self.reconnect_count += 1
+            self._recovering = True
+            if self._gap_hooks:
+                self._run_gap_hooks(self._subscriptions.list())
+        self._resubscribe_thread = threading.Thread(target=self._resubscribe, daemon=True)
+        self._resubscribe_thread.start()
 
     def _on_close(self):
         logger.info("WebSocket disconnected.")
+        self._recovering = False
+        if self._disconnected_at is None:
+            self._disconnected_at = time.monotonic()
+
+    def _record_recovery(self):
+        latency = time.monotonic() - self._disconnected_at
+        self.recovery_latencies.append(latency)
+        self._disconnected_at = None
+        self._recovering = False
+        logger.info("Feed recovered %.3fs after disconnect.", latency)
 
     def _on_error(self, error: Exception):
         logger.error(f"WebSocket error: {error}")
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.backoff import ExponentialBackoff
+from .enums import TopicID, WSAction
+from .subscriptions import Subscription
+
+logger = logging.getLogger(__name__)
+
+Level = Tuple[float, float]
+
+# Direction values used by PushMarketOrder rows.
+BID_DIRECTION = "0"
+ASK_DIRECTION = "1"
+
+
+class _BookSide:
+    """
+    One side of a book: a price -> size dict plus a sorted key list.
+
+    Keys are stored so that index 0 is always the best level (bids use
+    negated prices), which makes best-level reads O(1). Changing the size
+    of an existing level is a dict write; adding or removing a level is a
+    bisect plus an O(n) list insert/delete, a short memmove at the 25-400
+    levels a book carries.
+    """
+
+    __slots__ = ("_sign", "_keys", "_sizes")
+
+    def __init__(self, descending: bool):
+        self._sign = -1.0 if descending else 1.0
+        self._keys: List[float] = []
+        self._sizes: Dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys.clear()
+        self._sizes.clear()
+
+    def update(self, price: float, size: float):
+        """Set the absolute size of a price level; size <= 0 removes it."""
+        key = price * self._sign
+        sizes = self._sizes
+        if size > 0:
+            if key not in sizes:
+                keys = self._keys
+                keys.insert(bisect_left(keys, key), key)
+            sizes[key] = size
+        elif key in sizes:
+            del sizes[key]
+            keys = self._keys
+            del keys[bisect_left(keys, key)]
+
+    def best(self) -> Optional[Level]:
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return key * self._sign, self._sizes[key]
+
+    def top(self, n: int) -> List[Level]:
+        sign, sizes = self._sign, self._sizes
+        return [(key * sign, sizes[key]) for key in self._keys[:n]]
+
+
+class LocalOrderBook:
+    """
+    Locally maintained order book for one instrument.
+
+    Bids and asks are kept sorted and price-indexed; reads of the best
+    level and mid price are O(1), size changes of existing levels O(1)
+    and level inserts/deletes O(n) (see _BookSide).
+    """
+
+    def __init__(self, symbol: str, inst_id: Optional[str] = None):
+        self.symbol = symbol
+        self.inst_id = inst_id
+        self._bids = _BookSide(descending=True)
+        self._asks = _BookSide(descending=False)
+        self._lock = threading.Lock()
+
+        self.is_synced = False
+        self.last_update_time: Optional[float] = None
+        self.last_sequence: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"LocalOrderBook({self.symbol!r}, bid={self.best_bid()}, ask={self.best_ask()})"
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def apply_snapshot(self, bids: Iterable, asks: Iterable):
+        """Replace the book with a full snapshot of ``[price, size, ...]`` rows."""
+        with self._lock:
+            self._bids.clear()
+            self._asks.clear()
+            for row in bids:
+                self._bids.update(float(row[0]), float(row[1]))
+            for row in asks:
+                self._asks.update(float(row[0]), float(row[1]))
+            self.last_update_time = time.time()
+
+    def update(self, direction: str, price: float, size: float):
+        """Apply one incremental level update (absolute size, 0 deletes the level)."""
+        side = self._bids if direction == BID_DIRECTION else self._asks
+        with self._lock:
+            side.update(price, size)
+            self.last_update_time = time.time()
+
+    def apply_rows(self, rows: Iterable[dict]):
+        """Apply the ``data`` dicts of a PushMarketOrder message in one locked batch."""
+        bids, asks = self._bids, self._asks
+        with self._lock:
+            for row in rows:
+                side = bids if str(row["Direction"]) == BID_DIRECTION else asks
+                side.update(float(row["Price"]), float(row["Volume"]))
+            self.last_update_time = time.time()
+
+    def clear(self):
+        with self._lock:
+            self._bids.clear()
+            self._asks.clear()
+            self.is_synced = False
+            self.last_sequence = None
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def best_bid(self) -> Optional[Level]:
+        with self._lock:
+            return self._bids.best()
+
+    def best_ask(self) -> Optional[Level]:
+        with self._lock:
+            return self._asks.best()
+
+    def mid_price(self) -> Optional[float]:
+        with self._lock:
+            bid, ask = self._bids.best(), self._asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self) -> Optional[float]:
+        with self._lock:
+            bid, ask = self._bids.best(), self._asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def depth(self, n: int = 25) -> Tuple[List[Level], List[Level]]:
+        """Top ``n`` levels as ``(bids, asks)``, best first."""
+        with self._lock:
+            return self._bids.top(n), self._asks.top(n)
+
+    def is_crossed(self) -> bool:
+        with self._lock:
+            bid, ask = self._bids.best(), self._asks.best()
+        return bid is not None and ask is not None and bid[0] >= ask[0]
+
+    def __len__(self) -> int:
+        return len(self._bids) + len(self._asks)
+
+
+class OrderBookManager:
+    """
+    Maintains :class:`LocalOrderBook` instances from TopicID 25 incremental pushes.
+
+    Books are seeded from ``Client.get_order_book`` and resynced in a
+    background thread when a crossed book or a sequence gap is seen, and
+    after every reconnect of an attached manager (pushes sent while it was
+    down are lost). Failed snapshots are retried with exponential backoff
+    until one succeeds or the symbol is untracked.
+
+    Updates received while resyncing are buffered. Those received before
+    the snapshot request was sent are already reflected in the snapshot
+    and dropped; the rest are replayed on top of it. Pushes carry no
+    sequence or timestamp to order them against the snapshot exactly, so
+    a row received during the snapshot round trip may still be older than
+    it; the next update of that level corrects it.
+
+    Expected push format:
+    {
+        "action": "PushMarketOrder",
+        "result": [
+            {"table": "MarketOrder",
+             "data": {"InstrumentID": "BTCUSDT", "Direction": "0", "Price": 65000.5, "Volume": 1.2}},
+            ...
+        ]
+    }
+
+    Usage:
+        books = OrderBookManager(client)
+        books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+        books.attach(ws_manager)
+        books.get_book("BTCUSDT").best_bid()
+    """
+
+    def __init__(
+        self,
+        client,
+        snapshot_depth: int = 25,
+        sequence_getter: Optional[Callable[[dict], Optional[int]]] = None,
+        on_update: Optional[Callable[[LocalOrderBook], None]] = None,
+        max_buffer: int = 10_000,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ):
+        self._client = client
+        self._snapshot_depth = snapshot_depth
+        self._sequence_getter = sequence_getter
+        self._on_update = on_update
+        self._max_buffer = max_buffer
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+
+        self._books: Dict[str, LocalOrderBook] = {}
+        # symbol -> (time.monotonic() received, rows) while a resync is pending
+        self._buffers: Dict[str, Deque[Tuple[float, List[dict]]]] = {}
+        # symbols with a running _resync loop, and those asked to resync again while it runs
+        self._resyncing: Set[str] = set()
+        self._resync_requested: Set[str] = set()
+        self._lock = threading.Lock()
+
+        self.resync_count = 0
+
+    # -------------------------
+    # Book registry
+    # -------------------------
+
+    def track(self, symbol: str, inst_id: str, sync: bool = True) -> LocalOrderBook:
+        """
+        Start maintaining a book for a WS symbol (e.g. "BTCUSDT").
+        inst_id: REST instrument id used for snapshots (e.g. "BTC-USDT-SWAP").
+        """
+        if not inst_id:
+            raise ValueError("inst_id is required")
+        book = LocalOrderBook(symbol, inst_id)
+        with self._lock:
+            self._books[symbol] = book
+        if sync:
+            self.resync(symbol)
+        return book
+
+    def untrack(self, symbol: str):
+        with self._lock:
+            self._books.pop(symbol, None)
+            self._buffers.pop(symbol, None)
+
+    def get_book(self, symbol: str) -> Optional[LocalOrderBook]:
+        return self._books.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self._books.keys())
+
+    def attach(self, manager, subscribe: bool = True):
+        """
+        Register on a DeepcoinWebsocketManager (or pool) and subscribe the tracked symbols.
+        Books fed by a connection are resynced whenever it reconnects.
+        """
+        manager.register_callback(WSAction.PUSH_ORDERBOOK, self.on_message)
+        manager.add_gap_hook(self.on_gap)
+        if subscribe:
+            for symbol in self.symbols():
+                manager.subscribe_orderbook(symbol)
+
+    # -------------------------
+    # Message handling
+    # -------------------------
+
+    def on_message(self, message: dict):
+        """Dispatcher callback for PushMarketOrder messages."""
+        rows_by_symbol: Dict[str, List[dict]] = {}
+        for item in message.get("result") or ():
+            row = item.get("data")
+            if row:
+                rows_by_symbol.setdefault(row.get("InstrumentID"), []).append(row)
+
+        seq = self._sequence_getter(message) if self._sequence_getter else None
+
+        for symbol, rows in rows_by_symbol.items():
+            book = self._books.get(symbol)
+            if book is None:
+                continue
+
+            if not book.is_synced and self._buffer(book, rows):
+                continue
+
+            if seq is not None:
+                if book.last_sequence is not None and seq != book.last_sequence + 1:
+                    logger.warning(f"[ORDERBOOK] Sequence gap on {symbol}: {book.last_sequence} -> {seq}")
+                    self.resync(symbol)
+                    if self._buffer(book, rows):
+                        continue
+                book.last_sequence = seq
+
+            book.apply_rows(rows)
+
+            if book.is_crossed():
+                logger.warning(f"[ORDERBOOK] Crossed book on {symbol}, resyncing.")
+                self.resync(symbol)
+                continue
+
+            if self._on_update:
+                self._on_update(book)
+
+    def on_gap(self, subscriptions: List[Subscription]):
+        """Gap hook: resync the tracked books whose pushes may have been missed."""
+        for sub in subscriptions:
+            if sub.topic_id == TopicID.ORDERBOOK_25_INCREMENTAL.value and sub.symbol in self._books:
+                self.resync(sub.symbol)
+
+    def invalidate_all(self):
+        """Mark every book stale and resync it."""
+        for symbol in self.symbols():
+            self.resync(symbol)
+
+    # -------------------------
+    # Resync
+    # -------------------------
+
+    def resync(self, symbol: str):
+        """
+        Resync a book from a REST snapshot in a background thread.
+        A request made while a snapshot is already being fetched makes that thread take another one.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return
+        with self._lock:
+            book.is_synced = False
+            self._buffers.setdefault(symbol, deque(maxlen=self._max_buffer))
+            if symbol in self._resyncing:
+                self._resync_requested.add(symbol)
+                return
+            self._resyncing.add(symbol)
+        threading.Thread(target=self._resync, args=(book,), daemon=True).start()
+
+    def _buffer(self, book: LocalOrderBook, rows: List[dict]) -> bool:
+        """Buffer rows while a resync is pending; False if the book became synced meanwhile."""
+        with self._lock:
+            if book.is_synced:
+                return False
+            buf = self._buffers.get(book.symbol)
+            if buf is None:
+                buf = self._buffers[book.symbol] = deque(maxlen=self._max_buffer)
+            buf.append((time.monotonic(), rows))
+            return True
+
+    def _resync(self, book: LocalOrderBook):
+        symbol = book.symbol
+        while True:
+            resp, requested_at = self._fetch_snapshot(book)
+            with self._lock:
+                if resp is None or self._books.get(symbol) is not book:
+                    # untracked meanwhile
+                    self._resyncing.discard(symbol)
+                    self._resync_requested.discard(symbol)
+                    return
+                if symbol in self._resync_requested:
+                    # Asked again while fetching: the book may have moved past this snapshot.
+                    self._resync_requested.discard(symbol)
+                    continue
+
+                data = resp.get("data") or {}
+                if isinstance(data, list):
+                    data = data[0] if data else {}
+                book.apply_snapshot(data.get("bids") or (), data.get("asks") or ())
+                buffered = self._buffers.pop(symbol, ())
+                replayed = 0
+                for received_at, rows in buffered:
+                    if received_at >= requested_at:
+                        book.apply_rows(rows)
+                        replayed += 1
+                book.last_sequence = None
+                book.is_synced = True
+                self.resync_count += 1
+                # Done under the lock, so a resync() after this point starts a new thread.
+                self._resyncing.discard(symbol)
+                break
+
+        logger.info(
+            f"[ORDERBOOK] Synced {symbol} ({len(book)} levels, {replayed} of {len(buffered)} buffered updates replayed)."
+        )
+        if self._on_update:
+            self._on_update(book)
+
+    def _fetch_snapshot(self, book: LocalOrderBook) -> Tuple[Optional[dict], float]:
+        """(snapshot response, monotonic time it was requested), retrying with backoff; None if untracked."""
+        backoff = ExponentialBackoff(self._retry_delay, self._max_retry_delay)
+        while self._books.get(book.symbol) is book:
+            requested_at = time.monotonic()
+            try:
+                return self._client.get_order_book(book.inst_id, self._snapshot_depth), requested_at
+            except Exception as e:
+                delay = backoff.next_delay()
+                logger.error(f"[ORDERBOOK] Snapshot for {book.symbol} failed: {e}; retrying in {delay:.1f}s.")
+                time.sleep(delay)
+        return None, 0.0
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dispatcher import MessageDispatcher, message_key, route_key
+from .enums import (
+    Action,
+    TopicID,
+    WSAction,
+    ShardingStrategy,
+    TOPIC_ACTIONS,
+    PUBLIC_FUTURES_WS_ENDPOINT,
+    PRIVATE_WS_ENDPOINT,
+)
+from .exceptions import DeepcoinWebSocketError
+from .manager import DeepcoinWebsocketManager
+from .subscriptions import Subscription
+
+logger = logging.getLogger(__name__)
+
+_TOPIC_ORDER: List[str] = list(TOPIC_ACTIONS)
+
+
+class _Ack:
+    __slots__ = ("event", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error: Optional[str] = None
+
+
+class _ShardDispatcher(MessageDispatcher):
+    """
+    Per-connection front of the pool's shared dispatcher; measures load on the way through
+    and picks up the RecvTopicAction acks the pool waits for while moving a subscription.
+
+    It is called from its shard's socket thread and conflator thread while the monitor
+    thread takes the counters, so counter updates are locked.
+    """
+
+    def __init__(self, target: MessageDispatcher):
+        super().__init__()
+        self._target = target
+        self._counter_lock = threading.Lock()
+        self._acks: Dict[Tuple[str, str, str], _Ack] = {}
+        self.messages = 0
+        self.busy_time = 0.0
+        self.key_counts: Counter = Counter()
+
+    def dispatch(self, message: dict):
+        if self._acks and message.get("action") == WSAction.RECV_TOPIC_ACTION:
+            self._on_ack(message)
+        key = (message.get("action"), message_key(message))
+        start = time.perf_counter()
+        try:
+            self._target.dispatch(message)
+        finally:
+            busy = time.perf_counter() - start
+            with self._counter_lock:
+                self.messages += 1
+                self.key_counts[key] += 1
+                self.busy_time += busy
+
+    def take_counters(self) -> Tuple[int, float, Counter]:
+        """Return and reset (messages, busy seconds, per-key counts)."""
+        with self._counter_lock:
+            counts, self.key_counts = self.key_counts, Counter()
+            messages, self.messages = self.messages, 0
+            busy, self.busy_time = self.busy_time, 0.0
+        return messages, busy, counts
+
+    def expect_ack(self, action: Action, sub: Subscription) -> _Ack:
+        """Register interest in the server's ack of a (un)subscribe of ``sub``; call before sending."""
+        ack = _Ack()
+        with self._counter_lock:
+            self._acks[(action.value, sub.topic_id, sub.filter_value)] = ack
+        return ack
+
+    def cancel_ack(self, action: Action, sub: Subscription):
+        with self._counter_lock:
+            self._acks.pop((action.value, sub.topic_id, sub.filter_value), None)
+
+    def _on_ack(self, message: dict):
+        for item in message.get("result") or ():
+            data = item.get("data") or {}
+            key = (str(data.get("Action")), str(data.get("TopicID")), data.get("FilterValue"))
+            with self._counter_lock:
+                ack = self._acks.pop(key, None)
+            if ack is None:
+                continue
+            if str(data.get("ErrorID", 0)) != "0":
+                ack.error = data.get("ErrorMsg") or f"ErrorID {data.get('ErrorID')}"
+            ack.event.set()
+
+
+class DeepcoinWebsocketPool:
+    """
+    Spreads public subscriptions over several WebSocket connections.
+
+    All connections feed one shared dispatcher, so callbacks are registered
+    once for the whole pool. Each shard dispatches on its own socket thread
+    (and conflator thread), so pool callbacks run concurrently from several
+    threads and must be thread-safe; pass a QueuedMessageDispatcher to move
+    them onto its workers instead.
+
+    Subscriptions are placed by ``strategy`` and, every
+    ``rebalance_interval`` seconds, the hottest subscription of a shard that
+    spends more than ``max_utilization`` of its time in callbacks (or
+    carries more than ``max_rate_skew`` times the average message rate) is
+    moved to the least loaded shard. Moves are make-before-break: the new
+    shard's subscription is acked before the old one is dropped, so callbacks
+    may see a few duplicate pushes but none are lost; gap hooks (see
+    ``add_gap_hook``) are then called for the moved subscription, which
+    makes an attached OrderBookManager resync that book.
+
+    Usage:
+        pool = DeepcoinWebsocketPool(PUBLIC_FUTURES_WS_ENDPOINT, shards=4)
+        pool.register_callback(WSAction.PUSH_LAST_TX, on_trade)
+        for symbol in symbols:
+            pool.subscribe_trade(symbol)
+        pool.start()
+    """
+
+    def __init__(
+        self,
+        endpoint: str = PUBLIC_FUTURES_WS_ENDPOINT,
+        shards: int = 4,
+        strategy: ShardingStrategy | str = ShardingStrategy.SYMBOL_HASH,
+        dispatcher: Optional[MessageDispatcher] = None,
+        rebalance_interval: Optional[float] = 30.0,
+        max_utilization: float = 0.7,
+        max_rate_skew: float = 2.0,
+        ack_timeout: float = 5.0,
+    ):
+        if endpoint == PRIVATE_WS_ENDPOINT:
+            raise DeepcoinWebSocketError("Connection pools are for public endpoints only.")
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+
+        self._strategy = ShardingStrategy(strategy)
+        self._dispatcher = dispatcher or MessageDispatcher()
+        self._fronts = [_ShardDispatcher(self._dispatcher) for _ in range(shards)]
+        self._shards = [DeepcoinWebsocketManager(endpoint, dispatcher=front) for front in self._fronts]
+
+        self._assignments: Dict[Subscription, int] = {}
+        self._conflation: Dict[Subscription, float] = {}
+        self._rates: List[float] = [0.0] * shards
+        self._utilization: List[float] = [0.0] * shards
+        self._key_rates: Dict[Tuple[Any, Any], float] = {}
+        self._lock = threading.RLock()
+
+        self._rebalance_interval = rebalance_interval
+        self._max_utilization = max_utilization
+        self._max_rate_skew = max_rate_skew
+        self._ack_timeout = ack_timeout
+        self._gap_hooks: Tuple[Callable[[List[Subscription]], Any], ...] = ()
+        self._stop_event = threading.Event()
+        self._monitor_thread: Optional[threading.Thread] = None
+        self.moves = 0
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    def start(self):
+        """Connect every shard and start the load monitor."""
+        logger.info(f"Starting WS pool with {len(self._shards)} shards ({self._strategy.value}).")
+        self._dispatcher.start()
+        for shard in self._shards:
+            shard.start()
+        if self._rebalance_interval:
+            self._stop_event.clear()
+            self._monitor_thread = threading.Thread(target=self._monitor_forever, daemon=True)
+            self._monitor_thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        for shard in self._shards:
+            shard.stop()
+        self._dispatcher.stop()
+
+    def is_alive(self) -> bool:
+        """True when every shard is connected."""
+        return all(shard.is_alive() for shard in self._shards)
+
+    @property
+    def shards(self) -> List[DeepcoinWebsocketManager]:
+        return list(self._shards)
+
+    @property
+    def dispatcher(self) -> MessageDispatcher:
+        """The dispatcher shared by every shard."""
+        return self._dispatcher
+
+    # -------------------------
+    # Callback registration
+    # -------------------------
+
+    def register_callback(
+        self,
+        topic: WSAction | str,
+        callback: Callable[[dict], None],
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """Register a callback once for the whole pool."""
+        self._dispatcher.register(topic, callback, symbol=symbol, period=period)
+
+    def unregister_callback(
+        self,
+        topic: WSAction | str,
+        callback: Optional[Callable[[dict], None]] = None,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        self._dispatcher.unregister(topic, callback, symbol=symbol, period=period)
+
+    def add_gap_hook(self, hook: Callable[[List[Subscription]], Any]):
+        """
+        Call ``hook(subscriptions)`` whenever a shard reconnects (see DeepcoinWebsocketManager.add_gap_hook)
+        and after a subscription is moved between shards.
+        """
+        if hook not in self._gap_hooks:
+            self._gap_hooks = self._gap_hooks + (hook,)
+        for shard in self._shards:
+            shard.add_gap_hook(hook)
+
+    def remove_gap_hook(self, hook: Callable[[List[Subscription]], Any]):
+        self._gap_hooks = tuple(h for h in self._gap_hooks if h != hook)
+        for shard in self._shards:
+            shard.remove_gap_hook(hook)
+
+    # -------------------------
+    # Subscriptions
+    # -------------------------
+
+    def subscribe_market_data(self, symbol: str, conflate: bool = False, max_rate: float = 10.0):
+        """Subscribe to market ticker/overview (TopicID=7)."""
+        self._subscribe(Subscription(TopicID.LATEST_MARKET_DATA.value, symbol), max_rate if conflate else None)
+
+    def subscribe_trade(self, symbol: str):
+        """Subscribe to last trade updates (TopicID=2)."""
+        self._subscribe(Subscription(TopicID.LAST_TRANSACTIONS.value, symbol))
+
+    def subscribe_kline(self, symbol: str, period: str, conflate: bool = False, max_rate: float = 10.0):
+        """Subscribe to Kline updates (TopicID=11)."""
+        self._subscribe(Subscription(TopicID.KLINE.value, symbol, period), max_rate if conflate else None)
+
+    def subscribe_orderbook(self, symbol: str):
+        """Subscribe to 25-depth incremental orderbook (TopicID=25)."""
+        self._subscribe(Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, symbol))
+
+    def unsubscribe(self, topic_id: TopicID | str, symbol: str, period: Optional[str] = None):
+        topic_id = topic_id.value if isinstance(topic_id, TopicID) else topic_id
+        sub = Subscription(topic_id, symbol, period)
+        with self._lock:
+            index = self._assignments.pop(sub, None)
+            self._conflation.pop(sub, None)
+        if index is not None:
+            self._shards[index].unsubscribe(topic_id, symbol, period)
+
+    def unsubscribe_all(self):
+        with self._lock:
+            self._assignments.clear()
+            self._conflation.clear()
+        for shard in self._shards:
+            if shard.is_alive():
+                shard.unsubscribe_all()
+
+    def shard_of(self, topic_id: TopicID | str, symbol: str, period: Optional[str] = None) -> Optional[int]:
+        topic_id = topic_id.value if isinstance(topic_id, TopicID) else topic_id
+        return self._assignments.get(Subscription(topic_id, symbol, period))
+
+    def _subscribe(self, sub: Subscription, conflate_rate: Optional[float] = None):
+        with self._lock:
+            if sub in self._assignments:
+                return
+            index = self._place(sub)
+            self._assignments[sub] = index
+            if conflate_rate is not None:
+                self._conflation[sub] = conflate_rate
+        self._subscribe_on(self._shards[index], sub, conflate_rate)
+
+    @staticmethod
+    def _subscribe_on(shard: DeepcoinWebsocketManager, sub: Subscription, conflate_rate: Optional[float]):
+        conflate = conflate_rate is not None
+        rate = conflate_rate or 10.0
+        if sub.topic_id == TopicID.LATEST_MARKET_DATA.value:
+            shard.subscribe_market_data(sub.symbol, conflate=conflate, max_rate=rate)
+        elif sub.topic_id == TopicID.LAST_TRANSACTIONS.value:
+            shard.subscribe_trade(sub.symbol)
+        elif sub.topic_id == TopicID.KLINE.value:
+            shard.subscribe_kline(sub.symbol, sub.period, conflate=conflate, max_rate=rate)
+        elif sub.topic_id == TopicID.ORDERBOOK_25_INCREMENTAL.value:
+            shard.subscribe_orderbook(sub.symbol)
+
+    def _place(self, sub: Subscription) -> int:
+        n = len(self._shards)
+        if self._strategy is ShardingStrategy.SYMBOL_HASH:
+            return zlib.crc32(sub.symbol.encode()) % n
+        if self._strategy is ShardingStrategy.TOPIC:
+            return _TOPIC_ORDER.index(sub.topic_id) % n
+        counts = Counter(self._assignments.values())
+        return min(range(n), key=lambda i: (self._rates[i], counts[i]))
+
+    # -------------------------
+    # Load monitoring / rebalancing
+    # -------------------------
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-shard connection state, subscription count, message rate and utilization."""
+        counts = Counter(self._assignments.values())
+        return [
+            {
+                "shard": i,
+                "alive": shard.is_alive(),
+                "subscriptions": counts[i],
+                "msg_per_sec": self._rates[i],
+                "utilization": self._utilization[i],
+                "reconnects": shard.reconnect_count,
+            }
+            for i, shard in enumerate(self._shards)
+        ]
+
+    def _monitor_forever(self):
+        last = time.monotonic()
+        while not self._stop_event.wait(self._rebalance_interval):
+            now = time.monotonic()
+            self._sample(now - last)
+            last = now
+            try:
+                self.rebalance()
+            except Exception as e:
+                logger.warning(f"WS pool rebalance failed: {e}")
+
+    def _sample(self, elapsed: float):
+        key_rates: Dict[Tuple[Any, Any], float] = {}
+        for i, front in enumerate(self._fronts):
+            messages, busy, counts = front.take_counters()
+            self._rates[i] = messages / elapsed
+            self._utilization[i] = busy / elapsed
+            for key, count in counts.items():
+                key_rates[key] = count / elapsed
+        self._key_rates = key_rates
+
+    def rebalance(self) -> bool:
+        """Move the hottest movable subscription off an overloaded shard; True if one moved."""
+        n = len(self._shards)
+        if n < 2:
+            return False
+
+        hot = max(range(n), key=lambda i: (self._utilization[i], self._rates[i]))
+        cold = min(range(n), key=lambda i: (self._utilization[i], self._rates[i]))
+        mean_rate = sum(self._rates) / n
+        overloaded = self._utilization[hot] > self._max_utilization or (
+            mean_rate > 0 and self._rates[hot] > self._max_rate_skew * mean_rate
+        )
+        if hot == cold or not overloaded or not self._shards[cold].is_alive():
+            return False
+
+        # Largest subscription that still narrows the gap between the two shards.
+        gap = self._rates[hot] - self._rates[cold]
+        with self._lock:
+            candidates = [
+                (self._key_rates.get((TOPIC_ACTIONS[sub.topic_id], route_key(sub.symbol, sub.period)), 0.0), sub)
+                for sub, index in self._assignments.items()
+                if index == hot
+            ]
+            candidates = [c for c in candidates if 0 < c[0] < gap]
+            if not candidates:
+                return False
+            rate, sub = max(candidates, key=lambda c: c[0])
+            conflate_rate = self._conflation.get(sub)
+
+        logger.info(f"WS pool: moving {sub.filter_value} ({rate:.1f} msg/s) from shard {hot} to {cold}.")
+        if not self._move(sub, hot, cold, conflate_rate):
+            return False
+        self._rates[hot] -= rate
+        self._rates[cold] += rate
+        self.moves += 1
+        return True
+
+    def _move(self, sub: Subscription, hot: int, cold: int, conflate_rate: Optional[float]) -> bool:
+        """Subscribe on ``cold``, wait for the ack, then drop ``hot``; rolls back if the ack does not come."""
+        ack = self._fronts[cold].expect_ack(Action.SUBSCRIBE, sub)
+        try:
+            self._subscribe_on(self._shards[cold], sub, conflate_rate)
+        except DeepcoinWebSocketError as e:
+            logger.warning(f"WS pool: subscribe on shard {cold} failed, keeping {sub.filter_value} on {hot}: {e}")
+            self._fronts[cold].cancel_ack(Action.SUBSCRIBE, sub)
+            self._drop(cold, sub)
+            return False
+        if not ack.event.wait(self._ack_timeout) or ack.error:
+            reason = ack.error or "no ack"
+            logger.warning(f"WS pool: shard {cold} did not take {sub.filter_value} ({reason}), keeping it on {hot}.")
+            self._fronts[cold].cancel_ack(Action.SUBSCRIBE, sub)
+            self._drop(cold, sub)
+            return False
+
+        with self._lock:
+            still_wanted = self._assignments.get(sub) == hot
+            if still_wanted:
+                self._assignments[sub] = cold
+        if not still_wanted:  # unsubscribed (or moved) meanwhile
+            self._drop(cold, sub)
+            return False
+
+        released = self._fronts[hot].expect_ack(Action.UNSUBSCRIBE, sub)
+        if self._drop(hot, sub) and not released.event.wait(self._ack_timeout):
+            logger.debug(f"WS pool: no unsubscribe ack for {sub.filter_value} on shard {hot}.")
+        self._fronts[hot].cancel_ack(Action.UNSUBSCRIBE, sub)
+
+        for hook in self._gap_hooks:
+            try:
+                hook([sub])
+            except Exception:
+                logger.exception("Error in gap hook.")
+        return True
+
+    def _drop(self, index: int, sub: Subscription) -> bool:
+        try:
+            self._shards[index].unsubscribe(sub.topic_id, sub.symbol, sub.period)
+            return True
+        except DeepcoinWebSocketError as e:
+            logger.debug(f"Unsubscribe on shard {index} failed: {e}")
+            return False
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from .dispatcher import MessageDispatcher, message_key
+from .enums import OverflowPolicy
+from .exceptions import DeepcoinCallbackError
+
+logger = logging.getLogger(__name__)
+
+
+class _ActionQueue:
+    """Bounded queue for one action, applying its overflow policy on put()."""
+
+    def __init__(
+        self,
+        action: str,
+        maxsize: int,
+        policy: OverflowPolicy,
+        key_func: Callable[[dict], Optional[str]],
+        worker: int,
+    ):
+        self.action = action
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.key_func = key_func
+        self.worker = worker
+
+        self._items: deque = deque()
+        self._pending: OrderedDict = OrderedDict()  # conflation: key -> latest message
+        self._unkeyed = itertools.count()
+        self._cond = threading.Condition()
+        self.closed = False
+
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.errors = 0
+        self.high_watermark = 0
+
+    def __len__(self) -> int:
+        return len(self._pending) if self.policy is OverflowPolicy.CONFLATE else len(self._items)
+
+    def put(self, message: dict) -> bool:
+        """Queue a message; returns True if it added an item (False if it replaced or was dropped)."""
+        with self._cond:
+            self.enqueued += 1
+            if self.policy is OverflowPolicy.CONFLATE:
+                return self._put_conflated(message)
+
+            items = self._items
+            if len(items) >= self.maxsize:
+                if self.policy is OverflowPolicy.DROP_OLDEST:
+                    items.popleft()
+                    items.append(message)
+                    self.dropped += 1
+                    return False
+                while len(items) >= self.maxsize and not self.closed:
+                    self._cond.wait()
+                if self.closed:
+                    self.dropped += 1
+                    return False
+
+            items.append(message)
+            self.high_watermark = max(self.high_watermark, len(items))
+            return True
+
+    def _put_conflated(self, message: dict) -> bool:
+        pending = self._pending
+        key = self.key_func(message)
+        if key is None:
+            key = next(self._unkeyed)
+        if key in pending:
+            pending[key] = message  # keeps its place in line, only the payload is replaced
+            self.conflated += 1
+            return False
+        if len(pending) >= self.maxsize:
+            pending.popitem(last=False)
+            pending[key] = message
+            self.dropped += 1
+            return False
+        pending[key] = message
+        self.high_watermark = max(self.high_watermark, len(pending))
+        return True
+
+    def get(self) -> dict:
+        with self._cond:
+            if self.policy is OverflowPolicy.CONFLATE:
+                _, message = self._pending.popitem(last=False)
+            else:
+                message = self._items.popleft()
+            self._cond.notify()
+            return message
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self),
+            "maxsize": self.maxsize,
+            "policy": self.policy.value,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "errors": self.errors,
+            "high_watermark": self.high_watermark,
+        }
+
+
+class QueuedMessageDispatcher(MessageDispatcher):
+    """
+    Dispatcher that decouples the socket reader from user callbacks.
+
+    dispatch() only enqueues the message into a bounded per-action queue;
+    a pool of worker threads runs the callbacks. Each action is pinned to
+    one worker, so messages of the same action are delivered in order.
+    Callback exceptions are logged and counted instead of being raised
+    into the socket thread.
+
+    Usage:
+        dispatcher = QueuedMessageDispatcher(workers=2, maxsize=1000)
+        dispatcher.configure_queue(WSAction.PUSH_MARKET_DATA, policy=OverflowPolicy.CONFLATE)
+        ws = DeepcoinWebsocketManager(PUBLIC_FUTURES_WS_ENDPOINT, dispatcher=dispatcher)
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        maxsize: int = 10_000,
+        policy: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        key_func: Callable[[dict], Optional[str]] = message_key,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        super().__init__()
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+
+        self._workers = workers
+        self._default_maxsize = maxsize
+        self._default_policy = OverflowPolicy(policy)
+        self._default_key_func = key_func
+        self._on_error = on_error
+
+        self._queue_config: Dict[str, Dict[str, Any]] = {}
+        self._queues: Dict[str, _ActionQueue] = {}
+        self._queues_lock = threading.Lock()
+        # One token per queued item, per worker: tells the worker which action queue to pop.
+        self._ready: List[queue.SimpleQueue] = []
+        self._threads: List[threading.Thread] = []
+
+    # -------------------------
+    # Configuration / lifecycle
+    # -------------------------
+
+    def configure_queue(
+        self,
+        action: str,
+        maxsize: Optional[int] = None,
+        policy: Optional[OverflowPolicy | str] = None,
+        key_func: Optional[Callable[[dict], Optional[str]]] = None,
+    ):
+        """Override queue size, overflow policy or conflation key for one action."""
+        if action in self._queues:
+            raise DeepcoinCallbackError(f"Queue for action {action} is already in use")
+        config = self._queue_config.setdefault(action, {})
+        if maxsize is not None:
+            config["maxsize"] = maxsize
+        if policy is not None:
+            config["policy"] = OverflowPolicy(policy)
+        if key_func is not None:
+            config["key_func"] = key_func
+
+    def start(self):
+        """Start the worker threads (also done lazily on first dispatch)."""
+        with self._queues_lock:
+            if self._threads:
+                return
+            self._ready = [queue.SimpleQueue() for _ in range(self._workers)]
+            for i, ready in enumerate(self._ready):
+                thread = threading.Thread(
+                    target=self._worker, args=(ready,), name=f"deepcoin-dispatch-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"Started {self._workers} dispatch worker(s).")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers after they drain what is already queued."""
+        with self._queues_lock:
+            threads, self._threads = self._threads, []
+            for q in self._queues.values():
+                q.close()
+            for ready in self._ready:
+                ready.put(None)
+        for thread in threads:
+            thread.join(timeout=timeout)
+        with self._queues_lock:
+            self._queues.clear()
+
+    # -------------------------
+    # Dispatch
+    # -------------------------
+
+    def dispatch(self, message: dict):
+        """Enqueue a message for its action; returns immediately unless the queue policy is block."""
+        action, callbacks = self._resolve(message)
+        if not callbacks:
+            return
+        if not self._threads:
+            self.start()
+
+        q = self._queues.get(action) or self._create_queue(action)
+        if q.put(message):
+            self._ready[q.worker].put(q)
+
+    def _create_queue(self, action: str) -> _ActionQueue:
+        with self._queues_lock:
+            q = self._queues.get(action)
+            if q is None:
+                config = self._queue_config.get(action, {})
+                q = _ActionQueue(
+                    action,
+                    maxsize=config.get("maxsize", self._default_maxsize),
+                    policy=config.get("policy", self._default_policy),
+                    key_func=config.get("key_func", self._default_key_func),
+                    worker=len(self._queues) % self._workers,
+                )
+                self._queues[action] = q
+            return q
+
+    def _worker(self, ready: queue.SimpleQueue):
+        while True:
+            q = ready.get()
+            if q is None:
+                return
+            message = q.get()
+            try:
+                MessageDispatcher.dispatch(self, message)
+            except DeepcoinCallbackError as e:
+                q.errors += 1
+                if self._on_error:
+                    try:
+                        self._on_error(q.action, e)
+                    except Exception:
+                        logger.exception("Error in dispatcher on_error callback.")
+            finally:
+                q.processed += 1
+
+    # -------------------------
+    # Stats
+    # -------------------------
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-action queue depth, drop/conflation counts and throughput counters."""
+        return {action: q.stats() for action, q in list(self._queues.items())}
+
+    def queue_depth(self, action: Optional[str] = None) -> int:
+        if action is not None:
+            q = self._queues.get(action)
+            return len(q) if q else 0
+        return sum(len(q) for q in list(self._queues.values()))
+
+    @property
+    def dropped(self) -> int:
+        return sum(q.dropped for q in list(self._queues.values()))
+
+    @property
+    def conflated(self) -> int:
+        return sum(q.conflated for q in list(self._queues.values()))
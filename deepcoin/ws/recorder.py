@@ -0,0 +1,334 @@
+"""
+Raw WebSocket frame capture and replay.
+
+FrameRecorder hooks a connection's raw-frame hook and appends every frame,
+with its local receive time and connection index, to rotating segment files
+written by a background thread. FrameReplayer memory-maps the segments and
+feeds the frames back through a dispatcher.
+
+Segment layout (``<prefix>-<UTC start>-<seq>.dcws``):
+    header    b"DCWSREC2"
+    blocks    <compressed length u32><raw length u32><zlib data>
+A raw block is a run of records:
+    <receive time ns i64><kind u8: 0 text, 1 binary><connection u16><length u32><frame bytes>
+
+Blocks are compressed independently and only ever appended, so a segment
+cut short by a crash is readable up to its last complete block.
+
+Usage:
+    recorder = FrameRecorder("captures/")
+    recorder.attach(pool)                 # DeepcoinWebsocketManager or pool; shard i is connection i
+    ...
+    recorder.stop()
+
+    replayer = FrameReplayer("captures/")
+    replayer.replay(dispatcher, speed=10)     # 10x; speed=None for as fast as possible
+    replayer.replay(dispatcher, connection=1) # frames of one shard only
+"""
+from __future__ import annotations
+
+import glob
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+from ..utils import codec
+from .dispatcher import MessageDispatcher
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DCWSREC2"
+SUFFIX = ".dcws"
+_BLOCK = struct.Struct("<II")
+_RECORD = struct.Struct("<qBHI")
+_TEXT, _BINARY = 0, 1
+
+Frame = Tuple[int, int, Union[str, bytes]]   # (receive time ns, connection index, raw frame)
+
+
+class FrameRecorder:
+    """
+    Appends raw frames to compressed, rotating segment files off the socket thread.
+
+    The hook only timestamps the frame and puts it on a queue; a writer
+    thread batches frames into blocks of ``block_bytes`` (or whatever
+    arrived within ``flush_interval`` seconds), compresses them and starts
+    a new segment after ``segment_bytes`` or ``segment_seconds``.
+
+    The queue holds at most ``max_queued`` frames: when the writer falls
+    behind, new frames are discarded and counted in ``dropped`` rather than
+    growing memory or blocking the socket thread. Each attached connection
+    gets an index (in attach order, a pool's shards in shard order) that is
+    stored with its frames.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "frames",
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_seconds: Optional[float] = 3600.0,
+        block_bytes: int = 256 * 1024,
+        flush_interval: float = 1.0,
+        level: int = 1,
+        max_queued: int = 100_000,
+    ):
+        if max_queued < 1:
+            raise ValueError("max_queued must be >= 1")
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.block_bytes = block_bytes
+        self.flush_interval = flush_interval
+        self.level = level
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._hooks: List[Tuple[Any, Callable[[Union[str, bytes]], None]]] = []   # (connection, hook)
+        self._drop_lock = threading.Lock()
+        self._segment = None
+        self._segment_started = 0.0
+        self._segment_seq = 0
+
+        self.frames = 0
+        self.dropped = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+        self.segments: List[str] = []
+
+    # -------------------------
+    # Hot path
+    # -------------------------
+
+    def record(self, raw: Union[str, bytes], connection: int = 0):
+        """Message hook: queue one raw frame with its receive time, or count it as dropped."""
+        try:
+            self._queue.put_nowait((time.time_ns(), connection, raw))
+        except queue.Full:
+            # Several socket threads may drop at once; only this rare path takes the lock.
+            with self._drop_lock:
+                self.dropped += 1
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    def attach(self, manager):
+        """
+        Record every frame received by a WS manager (threaded or asyncio) or a DeepcoinWebsocketPool.
+        Connections are numbered in attach order, continuing across calls.
+        """
+        for shard in getattr(manager, "shards", None) or [manager]:
+            hook = self._hook(len(self._hooks))
+            shard.connection.add_message_hook(hook)
+            self._hooks.append((shard.connection, hook))
+        self.start()
+        return manager
+
+    def _hook(self, connection: int) -> Callable[[Union[str, bytes]], None]:
+        record = self.record
+
+        def hook(raw: Union[str, bytes]):
+            record(raw, connection)
+
+        return hook
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._write_forever, name="deepcoin-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Detach from the connections, write what is queued and close the segment."""
+        for connection, hook in self._hooks:
+            connection.remove_message_hook(hook)
+        self._hooks.clear()
+        if self._thread:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                logger.error("Frame recorder writer is stuck; queued frames are lost.")
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self.dropped:
+            logger.warning(f"Frame recorder dropped {self.dropped} frame(s) on a full queue.")
+
+    # -------------------------
+    # Writer thread
+    # -------------------------
+
+    def _write_forever(self):
+        buffer = bytearray()
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = False
+            if item:
+                ts, connection, raw = item
+                kind = _TEXT if isinstance(raw, str) else _BINARY
+                data = raw.encode() if kind == _TEXT else bytes(raw)
+                buffer += _RECORD.pack(ts, kind, connection, len(data))
+                buffer += data
+                self.frames += 1
+                if len(buffer) < self.block_bytes:
+                    continue
+            if buffer:
+                try:
+                    self._write_block(buffer)
+                except OSError:
+                    logger.exception("Failed to write frame block; %d bytes lost.", len(buffer))
+                buffer = bytearray()
+            deadline = time.monotonic() + self.flush_interval
+            if item is None:
+                self._close_segment()
+                return
+
+    def _write_block(self, raw: bytearray):
+        if self._segment is None or self._segment_full():
+            self._open_segment()
+        compressed = zlib.compress(raw, self.level)
+        self._segment.write(_BLOCK.pack(len(compressed), len(raw)))
+        self._segment.write(compressed)
+        self._segment.flush()
+        self.raw_bytes += len(raw)
+        self.written_bytes += _BLOCK.size + len(compressed)
+
+    def _segment_full(self) -> bool:
+        if self._segment.tell() >= self.segment_bytes:
+            return True
+        return self.segment_seconds is not None and time.monotonic() - self._segment_started >= self.segment_seconds
+
+    def _open_segment(self):
+        self._close_segment()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        while True:
+            self._segment_seq += 1
+            path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{self._segment_seq:04d}{SUFFIX}")
+            try:
+                self._segment = open(path, "xb")  # never append to an existing capture
+                break
+            except FileExistsError:
+                continue
+        self._segment.write(MAGIC)
+        self._segment_started = time.monotonic()
+        self.segments.append(path)
+        logger.info(f"Recording frames to {path}")
+
+    def _close_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+
+class FrameReplayer:
+    """
+    Reads recorded segments through mmap and replays their frames.
+
+    ``source`` is a segment file or a directory of them (replayed in name,
+    i.e. time, order).
+    """
+
+    def __init__(self, source: str, prefix: str = "frames"):
+        if os.path.isdir(source):
+            self.paths = sorted(glob.glob(os.path.join(source, f"{prefix}-*{SUFFIX}")))
+        else:
+            self.paths = [source]
+
+    @staticmethod
+    def read_segment(path: str) -> Iterator[Frame]:
+        """Frames of one segment; stops at a truncated or corrupt trailing block."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= len(MAGIC):
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if view[: len(MAGIC)] != MAGIC:
+                    raise ValueError(f"{path} is not a frame recording")
+                pos, end = len(MAGIC), len(view)
+                while pos + _BLOCK.size <= end:
+                    compressed_len, raw_len = _BLOCK.unpack_from(view, pos)
+                    start = pos + _BLOCK.size
+                    if start + compressed_len > end:
+                        logger.warning(f"{path}: truncated block at offset {pos}, ignoring the rest.")
+                        return
+                    try:
+                        raw = zlib.decompress(view[start:start + compressed_len], bufsize=raw_len)
+                    except zlib.error:
+                        logger.warning(f"{path}: corrupt block at offset {pos}, ignoring the rest.")
+                        return
+                    offset = 0
+                    while offset < len(raw):
+                        ts, kind, connection, length = _RECORD.unpack_from(raw, offset)
+                        offset += _RECORD.size
+                        data = raw[offset:offset + length]
+                        offset += length
+                        yield ts, connection, data.decode() if kind == _TEXT else data
+                    pos = start + compressed_len
+
+    def frames(
+        self,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        connection: Optional[int] = None,
+    ) -> Iterator[Frame]:
+        """
+        Every recorded (receive time ns, connection index, raw frame), optionally limited
+        to [start_ns, end_ns) and to one connection.
+        """
+        for path in self.paths:
+            for frame in self.read_segment(path):
+                ts = frame[0]
+                if start_ns is not None and ts < start_ns:
+                    continue
+                if end_ns is not None and ts >= end_ns:
+                    return
+                if connection is not None and frame[1] != connection:
+                    continue
+                yield frame
+
+    def replay(
+        self,
+        target,
+        speed: Optional[float] = 1.0,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        connection: Optional[int] = None,
+    ) -> int:
+        """
+        Decode each frame and dispatch it on the calling thread; returns the number of frames.
+        ``target`` is a MessageDispatcher or a WS manager (its dispatcher is used).
+        speed: 1.0 keeps the recorded spacing, 10 plays ten times faster, None or 0 as fast as possible.
+        connection: replay only the frames of that connection index (e.g. one pool shard).
+        """
+        dispatcher: MessageDispatcher = getattr(target, "dispatcher", target)
+        count = 0
+        first_ts = None
+        clock_start = time.perf_counter()
+        for ts, _, raw in self.frames(start_ns, end_ns, connection):
+            if speed:
+                if first_ts is None:
+                    first_ts = ts
+                delay = (ts - first_ts) / 1e9 / speed - (time.perf_counter() - clock_start)
+                if delay > 0:
+                    time.sleep(delay)
+            try:
+                message = codec.loads(raw)
+            except ValueError:
+                logger.warning("Skipping frame that is not JSON: %r", raw[:80])
+                continue
+            try:
+                dispatcher.dispatch(message)
+            except Exception as e:
+                logger.warning(f"Error while replaying frame: {e}")
+            count += 1
+        return count
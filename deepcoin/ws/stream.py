@@ -21,9 +21,10 @@ class DeepcoinWebSocketStream:
         endpoint: str = PUBLIC_FUTURES_WS_ENDPOINT,
         ping_interval: float = 15.0,
         reconnect: bool = True,
+        dispatcher: Optional[MessageDispatcher] = None,
     ):
         self._endpoint = endpoint
-        self._dispatcher = MessageDispatcher()
+        self._dispatcher = dispatcher or MessageDispatcher()
         self._connection = WebSocketConnection(
             url=self._endpoint,
             on_message=self._on_message,
@@ -38,11 +39,13 @@ class DeepcoinWebSocketStream:
     def start(self):
         """Starts this stream's connection."""
         logger.info(f"Starting WS stream to {self._endpoint}")
+        self._dispatcher.start()
         self._connection.start()
 
     def stop(self):
         """Stops the WebSocket stream."""
         self._connection.stop()
+        self._dispatcher.stop()
 
     def send(self, message: dict):
         """Send raw payload over this WebSocket."""
@@ -51,12 +54,24 @@ class DeepcoinWebSocketStream:
     def is_alive(self) -> bool:
         return self._connection.is_alive()
 
-    def register(self, topic_id: str, callback: Callable[[dict], None]):
-        """Register a callback for a given TopicID."""
-        self._dispatcher.register(topic_id, callback)
+    def register(
+        self,
+        topic_id: str,
+        callback: Callable[[dict], None],
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        """Register a callback for a given action, optionally only for one symbol (and kline period)."""
+        self._dispatcher.register(topic_id, callback, symbol=symbol, period=period)
 
-    def unregister(self, topic_id: str):
-        self._dispatcher.unregister(topic_id)
+    def unregister(
+        self,
+        topic_id: str,
+        callback: Optional[Callable[[dict], None]] = None,
+        symbol: Optional[str] = None,
+        period: Optional[str] = None,
+    ):
+        self._dispatcher.unregister(topic_id, callback, symbol=symbol, period=period)
 
     def _on_message(self, msg: dict):
         self._dispatcher.dispatch(msg)
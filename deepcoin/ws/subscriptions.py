@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from . import topics
+from .enums import TopicID, DEFAULT_EXCHANGE_ID
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """An active topic subscription (TopicID + FilterValue parts)."""
+    topic_id: str
+    symbol: str
+    period: Optional[str] = None
+    exchange_id: str = DEFAULT_EXCHANGE_ID
+
+    @property
+    def filter_value(self) -> str:
+        return topics.build_filter_value(self.symbol, exchange_id=self.exchange_id, period=self.period)
+
+    def to_payload(self, local_no: int) -> Dict[str, Any]:
+        """Build the SendTopicAction subscribe payload for this subscription."""
+        if self.topic_id == TopicID.LAST_TRANSACTIONS.value:
+            return topics.sub_last_transactions(self.symbol, local_no=local_no, exchange_id=self.exchange_id)
+        if self.topic_id == TopicID.LATEST_MARKET_DATA.value:
+            return topics.sub_latest_market_data(self.symbol, local_no=local_no, exchange_id=self.exchange_id)
+        if self.topic_id == TopicID.KLINE.value:
+            return topics.sub_kline(self.symbol, self.period, local_no=local_no, exchange_id=self.exchange_id)
+        if self.topic_id == TopicID.ORDERBOOK_25_INCREMENTAL.value:
+            return topics.sub_orderbook_25_incremental(self.symbol, local_no=local_no, exchange_id=self.exchange_id)
+        raise ValueError(f"Unsupported topic_id '{self.topic_id}'")
+
+
+class SubscriptionRegistry:
+    """Thread-safe, insertion-ordered set of active subscriptions."""
+
+    def __init__(self):
+        self._subs: Dict[Subscription, None] = {}
+        self._lock = threading.Lock()
+
+    def add(self, sub: Subscription) -> bool:
+        """Add a subscription; returns False if it was already registered."""
+        with self._lock:
+            if sub in self._subs:
+                return False
+            self._subs[sub] = None
+            return True
+
+    def remove(self, sub: Subscription) -> bool:
+        with self._lock:
+            return self._subs.pop(sub, False) is None
+
+    def clear(self):
+        with self._lock:
+            self._subs.clear()
+
+    def list(self) -> List[Subscription]:
+        with self._lock:
+            return list(self._subs)
+
+    def batches(self, size: int) -> List[List[Subscription]]:
+        """Snapshot of the registry split into batches of ``size``."""
+        subs = self.list()
+        return [subs[i:i + size] for i in range(0, len(subs), size)]
+
+    def __contains__(self, sub: Subscription) -> bool:
+        return sub in self._subs
+
+    def __len__(self) -> int:
+        return len(self._subs)
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+
+from deepcoin.ws.async_manager import AsyncDeepcoinWebsocketManager
+from deepcoin.ws.enums import WSAction, PUBLIC_FUTURES_WS_ENDPOINT, PUBLIC_SPOT_WS_ENDPOINT
+from deepcoin.utils.logger import init_logger
+
+init_logger(level=logging.DEBUG)
+
+async def on_market_data(msg: dict):
+    logging.info("[Futures Market Data] %s", msg)
+
+def on_spot_last_tx(msg: dict):
+    logging.info("[Spot Last Transactions] %s", msg)
+
+async def main():
+    # Both connections run on this single event loop.
+    futures = AsyncDeepcoinWebsocketManager(PUBLIC_FUTURES_WS_ENDPOINT)
+    spot = AsyncDeepcoinWebsocketManager(PUBLIC_SPOT_WS_ENDPOINT)
+
+    # Coroutine and plain callbacks are both supported.
+    futures.register_callback(WSAction.PUSH_MARKET_DATA, on_market_data)
+    spot.register_callback(WSAction.PUSH_LAST_TX, on_spot_last_tx)
+
+    await futures.start()
+    await spot.start()
+
+    if not (await futures.wait_until_alive() and await spot.wait_until_alive()):
+        raise RuntimeError("WebSocket connection failed.")
+
+    await futures.subscribe_market_data("BTCUSDT")
+    await spot.subscribe_trade("BTC/USDT")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await futures.stop()
+        await spot.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logging.info("Stopped.")
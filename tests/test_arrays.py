@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from deepcoin.arrays import book_to_arrays, candles_to_array, fills_to_arrays
+
+
+def test_candles_oldest_first():
+    out = candles_to_array({"data": [
+        ["2000", "2", "3", "1", "2.5", "10", "25"],
+        ["1000", "1", "2", "0.5", "1.5", "5", "7.5"],
+    ]})
+    assert list(out["ts"]) == [1000, 2000]
+    assert list(out["close"]) == [1.5, 2.5]
+    assert list(out["volume_ccy"]) == [7.5, 25.0]
+
+
+def test_ragged_candle_rows_are_padded():
+    out = candles_to_array([
+        ["2000", "2", "3", "1", "2.5", "10", "25", "1"],
+        ["1000", "1", "2", "0.5", "1.5"],
+    ])
+    assert list(out["ts"]) == [1000, 2000]
+    assert np.isnan(out["volume"][0]) and out["volume"][1] == 10.0
+
+
+def test_candle_rows_without_ohlc_are_rejected():
+    with pytest.raises(ValueError):
+        candles_to_array([["1000", "1", "2", "0.5", "1.5"], ["2000", "2"]])
+
+
+def test_book_sides():
+    out = book_to_arrays({"data": {"bids": [["100", "1"], ["99", "2", "x"]], "asks": []}})
+    assert list(out["bids"]["price"]) == [100.0, 99.0]
+    assert len(out["asks"]) == 0
+
+
+def test_fills_keep_numeric_zero_and_null_as_nan():
+    out = fills_to_arrays([
+        {"ts": "1000", "fillPx": "100", "fillSz": 2, "fee": 0, "instId": "BTC-USDT-SWAP", "side": "buy"},
+        {"ts": 2000, "fillPx": "101", "fillSz": "1", "fee": None, "instId": "ETH-USDT-SWAP"},
+    ])
+    assert list(out["ts"]) == [1000, 2000]
+    assert out["fee"][0] == 0.0
+    assert np.isnan(out["fee"][1])
+    assert list(out["fill_sz"]) == [2.0, 1.0]
+    assert list(out["side"]) == ["buy", ""]
+    assert list(out["inst_id"]) == ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
+
+
+def test_empty_fills():
+    out = fills_to_arrays({"data": []})
+    assert len(out["fill_px"]) == 0 and out["fill_px"].dtype == np.float64
+    assert len(out["inst_id"]) == 0
@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from deepcoin import async_client as async_client_module
+from deepcoin.async_client import AsyncClient
+from deepcoin.exceptions import DeepcoinAPIException, DeepcoinRequestException
+from deepcoin.retry import RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        if body is None:
+            body = {"code": "0", "data": []}
+        self._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+
+    async def read(self):
+        return self._content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """aiohttp.ClientSession stand-in: returns (or raises) the queued outcomes in order and records every call."""
+
+    closed = False
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, headers=None, data=None, **kwargs):
+        self.calls.append({"method": method, "url": str(url), "path": url.raw_path_qs, "headers": headers, "data": data})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(async_client_module.asyncio, "sleep", sleep)
+    return slept
+
+
+def _client(session, **kwargs):
+    client = AsyncClient("key", "secret", "passphrase", **kwargs)
+    client.session = session
+    client.auth.time_source = lambda: 1_700_000_000.0
+    return client
+
+
+def test_get_sends_a_signed_query_and_returns_the_decoded_body():
+    session = FakeSession(FakeResponse(body={"code": "0", "data": [{"ccy": "USDT"}]}))
+    client = _client(session)
+
+    result = asyncio.run(client.get_balances("SWAP", ccy="USDT"))
+
+    assert result == {"code": "0", "data": [{"ccy": "USDT"}]}
+    call = session.calls[0]
+    assert call["method"] == "GET" and call["data"] is None
+    assert call["path"] == "/deepcoin/account/balances?instType=SWAP&ccy=USDT"
+    assert call["url"].startswith(client.BASE_ENDPOINT)
+    assert call["headers"]["DC-ACCESS-SIGN"] == client.auth.sign("GET", call["path"])["DC-ACCESS-SIGN"]
+
+
+def test_post_body_is_the_signed_json_payload():
+    session = FakeSession(FakeResponse(body={"code": "0", "data": {"ordId": "1"}}))
+    client = _client(session)
+
+    asyncio.run(client.place_order(
+        "BTC-USDT-SWAP", "cross", "buy", "limit", "1", px="1", pos_side="long", mrg_position="merge"
+    ))
+
+    call = session.calls[0]
+    assert call["method"] == "POST"
+    assert call["headers"]["Content-Type"] == "application/json"
+    assert json.loads(call["data"])["instId"] == "BTC-USDT-SWAP"
+    expected = client.auth.sign("POST", "/deepcoin/trade/order", call["data"])
+    assert call["headers"]["DC-ACCESS-SIGN"] == expected["DC-ACCESS-SIGN"]
+
+
+def test_validation_errors_are_raised_before_any_request():
+    session = FakeSession()
+    with pytest.raises(ValueError):
+        asyncio.run(_client(session).batch_cancel_order([]))
+    assert session.calls == []
+
+
+@pytest.mark.parametrize("response, error, code", [
+    (FakeResponse(500, b"Internal Server Error"), DeepcoinAPIException, None),
+    (FakeResponse(429, {"code": "50011", "msg": "slow down"}), DeepcoinAPIException, "50011"),
+    (FakeResponse(200, {"code": "51000", "msg": "bad param"}), DeepcoinAPIException, "51000"),
+    (FakeResponse(200, b"<html>busy</html>"), DeepcoinRequestException, None),
+    (aiohttp.ClientConnectionError("reset"), DeepcoinRequestException, None),
+    (asyncio.TimeoutError(), DeepcoinRequestException, None),
+])
+def test_error_responses_raise_the_sync_client_exceptions(response, error, code):
+    with pytest.raises(error) as excinfo:
+        asyncio.run(_client(FakeSession(response)).get_tickers("SWAP"))
+    if error is DeepcoinAPIException:
+        assert excinfo.value.status_code == response.status
+        assert excinfo.value.code == code
+
+
+def test_transient_errors_are_retried_and_hooks_see_every_attempt(sleeps):
+    session = FakeSession(aiohttp.ClientConnectionError(), FakeResponse(503, {"msg": "busy"}), FakeResponse())
+    client = _client(session, retry_policy=RetryPolicy(max_attempts=3))
+    attempts = []
+    client.add_request_hook(after=lambda method, path, elapsed, error: attempts.append(type(error).__name__))
+
+    assert asyncio.run(client.get_tickers("SWAP")) == {"code": "0", "data": []}
+    assert len(session.calls) == 3
+    assert len(sleeps) == 2
+    assert attempts == ["DeepcoinRequestException", "DeepcoinAPIException", "NoneType"]
+
+
+def test_unknown_outcome_of_a_non_idempotent_post_is_not_retried(sleeps):
+    session = FakeSession(asyncio.TimeoutError(), FakeResponse())
+    client = _client(session, retry_policy=RetryPolicy())
+    with pytest.raises(DeepcoinRequestException):
+        asyncio.run(client.place_order(
+            "BTC-USDT-SWAP", "cross", "buy", "limit", "1", px="1", pos_side="long", mrg_position="merge"
+        ))
+    assert len(session.calls) == 1 and sleeps == []
+
+
+def test_mapped_results_and_bulk_helpers_are_awaitable():
+    ids = [str(i) for i in range(60)]
+    # Both chunks get the same reply, so it does not matter which one is sent first.
+    rejected = {"code": "0", "data": {"errorList": [{"orderSysId": "7", "errorCode": "1", "errorMsg": "x"}]}}
+    session = FakeSession(
+        FakeResponse(body={"code": "0", "data": {"listenkey": "abc"}}), FakeResponse(body=rejected), FakeResponse(body=rejected)
+    )
+    client = _client(session)
+
+    async def run():
+        listenkey = await client.get_listenkey()
+        results = await client.cancel_orders(ids)
+        await client.close()
+        return listenkey, results
+
+    listenkey, results = asyncio.run(run())
+    assert listenkey == "abc"
+    assert [r.request for r in results] == ids
+    assert [r.request for r in results if not r.ok] == ["7"]
+    assert sorted(len(json.loads(call["data"])["orderSysIDs"]) for call in session.calls[1:]) == [10, 50]
+    assert session.closed and client.session is None
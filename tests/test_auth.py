@@ -0,0 +1,81 @@
+import base64
+import hmac
+from hashlib import sha256
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from deepcoin import auth as auth_module
+from deepcoin.auth import DeepcoinAuth, _iso_timestamp, _request_path
+
+
+def _reference_signature(secret, ts, method, url, body):
+    """The original urlparse() + hmac.new() + base64 implementation."""
+    parsed = urlparse(url)
+    request_path = parsed.path
+    if parsed.query:
+        request_path += "?" + parsed.query
+    body = body or ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    prehash = f"{ts}{method.upper()}{request_path}{body}"
+    return base64.b64encode(hmac.new(secret.encode(), prehash.encode(), sha256).digest()).decode()
+
+
+def _auth(now=1_700_000_000.123):
+    auth = DeepcoinAuth("key", "s3cr3t", "pass")
+    auth.time_source = lambda: now
+    return auth
+
+
+@pytest.mark.parametrize("method, url, body", [
+    ("GET", "https://api.deepcoin.com/deepcoin/account/balances?instType=SPOT&ccy=USDT", None),
+    ("GET", "https://api.deepcoin.com/deepcoin/market/tickers", None),
+    ("post", "https://api.deepcoin.com/deepcoin/trade/order", '{"instId":"BTC-USDT-SWAP","px":"65000.1"}'),
+    ("POST", "https://api.deepcoin.com:443/deepcoin/trade/order", b'{"note":"\xc3\xa9t\xc3\xa9"}'),
+    ("POST", "https://api.deepcoin.com/deepcoin/trade/batch-cancel-order", b""),
+])
+def test_signature_matches_the_reference_implementation(method, url, body):
+    headers = _auth().sign(method, _request_path(url), body)
+    ts = headers["DC-ACCESS-TIMESTAMP"]
+    assert ts == "2023-11-14T22:13:20.123Z"
+    assert headers["DC-ACCESS-SIGN"] == _reference_signature("s3cr3t", ts, method, url, body)
+    assert (headers["DC-ACCESS-KEY"], headers["DC-ACCESS-PASSPHRASE"]) == ("key", "pass")
+
+
+def test_known_signature():
+    headers = DeepcoinAuth("key", "secret", "pass").sign("GET", "/deepcoin/market/tickers?instType=SWAP")
+    ts = headers["DC-ACCESS-TIMESTAMP"]
+    expected = _reference_signature("secret", ts, "GET", "https://x/deepcoin/market/tickers?instType=SWAP", None)
+    assert headers["DC-ACCESS-SIGN"] == expected
+
+    # printf '1970-01-01T00:00:00.000ZGET/' | openssl dgst -sha256 -hmac s3cr3t -binary | base64
+    assert _auth(0).sign("GET", "/")["DC-ACCESS-SIGN"] == "zCPjtz6f/Prj5M7xtmwv/tF2T9U64rr1EwP09kGaa78="
+
+
+def test_prepared_requests_are_signed_like_the_reference():
+    auth = _auth()
+    request = requests.Request(
+        "POST", "https://api.deepcoin.com/deepcoin/trade/order", params={"a": "1 2"}, data=b'{"sz":"1"}'
+    ).prepare()
+    auth(request)
+    assert request.headers["Content-Type"] == "application/json"
+    ts = request.headers["DC-ACCESS-TIMESTAMP"]
+    assert request.headers["DC-ACCESS-SIGN"] == _reference_signature("s3cr3t", ts, "POST", request.url, request.body)
+
+
+def test_request_path():
+    assert _request_path("https://h/p/q?x=1") == "/p/q?x=1"
+    assert _request_path("https://h:8443/p") == "/p"
+    assert _request_path("https://h") == "/"
+
+
+def test_timestamp_cache_tracks_milliseconds_and_seconds(monkeypatch):
+    monkeypatch.setattr(auth_module, "_ts_cache", (-1, ""))
+    monkeypatch.setattr(auth_module, "_prefix_cache", (-1, ""))
+    assert _iso_timestamp(1_700_000_000.0011) == "2023-11-14T22:13:20.001Z"
+    assert _iso_timestamp(1_700_000_000.0019) == "2023-11-14T22:13:20.001Z"
+    assert _iso_timestamp(1_700_000_000.999) == "2023-11-14T22:13:20.999Z"
+    assert _iso_timestamp(1_700_000_001.0) == "2023-11-14T22:13:21.000Z"
+    assert _iso_timestamp(1_699_999_999.5) == "2023-11-14T22:13:19.500Z"
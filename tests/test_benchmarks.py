@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from benchmarks.run import bench_dispatch, bench_signing, compare
+
+
+def test_dispatch_benchmark_delivers_every_frame():
+    result = bench_dispatch(2000)
+    assert result["frames"] == 2000
+    assert result["frames_per_sec"] > 0
+
+
+def test_signing_benchmark():
+    assert bench_signing(100)["signs"] == 100
+
+
+def test_compare_flags_regressions_in_the_right_direction(capsys):
+    baseline = {"results": {"dispatch": {"frames_per_sec": 1000.0, "frame_us": 10.0}, "ws": {"p99_ms": 2.0}}}
+    current = {"results": {"dispatch": {"frames_per_sec": 850.0, "frame_us": 9.0}, "ws": {"p99_ms": 2.5}}}
+
+    assert compare(current, baseline, threshold=0.10) == ["dispatch.frames_per_sec", "ws.p99_ms"]
+    assert compare(current, baseline, threshold=0.30) == []
@@ -0,0 +1,131 @@
+import json
+import threading
+
+import pytest
+import requests
+
+from deepcoin.bulk import BulkResult, cancel_results, chunked
+from deepcoin.client import Client
+from deepcoin.exceptions import DeepcoinAPIException
+
+
+def _response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class FakeSession:
+    """Answers each POST with reply(path, payload); bulk calls arrive concurrently, so nothing is queued."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def post(self, uri, data=None, **kwargs):
+        payload = json.loads(data)
+        with self._lock:
+            self.calls.append((uri.rsplit("/deepcoin/", 1)[-1], payload))
+        outcome = self.reply(uri, payload)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _response(outcome)
+
+
+def _client(reply):
+    client = Client("key", "secret", "passphrase")
+    client.session = FakeSession(reply)
+    return client
+
+
+def test_chunked_and_bulk_result():
+    assert [list(c) for c in chunked(list(range(5)), 2)] == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 50)) == []
+    assert BulkResult("x", response={}).ok
+    assert not BulkResult("x", error=ValueError()).ok
+
+
+def test_cancel_results_maps_error_list_to_order_ids():
+    response = {"code": "0", "data": {"errorList": [{"orderSysId": "2", "errorCode": "51400", "errorMsg": "gone"}]}}
+    results = cancel_results(["1", "2", "3"], response, None)
+    assert [r.request for r in results] == ["1", "2", "3"]
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, DeepcoinAPIException)
+
+    error = RuntimeError("down")
+    assert all(r.error is error for r in cancel_results(["1", "2"], None, error))
+
+
+def test_cancel_orders_splits_into_chunks_of_50_and_keeps_input_order():
+    ids = [str(i) for i in range(120)]
+
+    def reply(uri, payload):
+        rejected = [{"orderSysId": i, "errorCode": "51400", "errorMsg": "gone"} for i in payload["orderSysIDs"] if i == "60"]
+        return {"code": "0", "data": {"errorList": rejected}}
+
+    client = _client(reply)
+    results = client.cancel_orders(ids, max_workers=3)
+
+    sizes = sorted(len(payload["orderSysIDs"]) for _, payload in client.session.calls)
+    assert sizes == [20, 50, 50]
+    assert all(path == "trade/batch-cancel-order" for path, _ in client.session.calls)
+    assert [r.request for r in results] == ids
+    assert [r.request for r in results if not r.ok] == ["60"]
+
+
+def test_failed_cancel_chunk_only_fails_its_own_ids():
+    ids = [str(i) for i in range(75)]
+
+    def reply(uri, payload):
+        if "0" in payload["orderSysIDs"]:
+            return requests.ConnectionError("reset")
+        return {"code": "0", "data": {"errorList": []}}
+
+    results = _client(reply).cancel_orders(ids)
+    assert [r.request for r in results] == ids
+    assert all(isinstance(r.error, requests.ConnectionError) for r in results[:50])
+    assert all(r.ok for r in results[50:])
+
+
+def test_place_orders_keeps_input_order_and_one_failure_does_not_stop_the_batch():
+    orders = [
+        dict(inst_id="BTC-USDT-SWAP", td_mode="cross", side="buy", ord_type="limit", sz="1",
+             px=str(px), pos_side="long", mrg_position="merge")
+        for px in range(1, 21)
+    ]
+    orders[3]["pos_side"] = None            # rejected locally before any request is sent
+
+    def reply(uri, payload):
+        if payload["px"] == "7":
+            return {"code": "51000", "msg": "bad price"}
+        return {"code": "0", "data": {"px": payload["px"]}}
+
+    client = _client(reply)
+    results = client.place_orders(orders, max_workers=5)
+
+    assert [r.request for r in results] == orders
+    assert [i for i, r in enumerate(results) if not r.ok] == [3, 6]
+    assert isinstance(results[3].error, ValueError)
+    assert isinstance(results[6].error, DeepcoinAPIException)
+    assert [r.response["data"]["px"] for r in results if r.ok] == [o["px"] for o in orders if o["px"] not in ("4", "7")]
+    assert len(client.session.calls) == 19
+
+
+def test_replace_orders_returns_a_result_per_item():
+    def reply(uri, payload):
+        return {"code": "0", "data": {"ordId": payload["OrderSysID"]}}
+
+    replacements = [{"order_sys_id": "a", "price": 1.5}, {"order_sys_id": "b"}, {"order_sys_id": "c", "volume": 2}]
+    results = _client(reply).replace_orders(replacements)
+
+    assert [r.request for r in results] == replacements
+    assert [r.ok for r in results] == [True, False, True]
+    assert [r.response["data"]["ordId"] for r in results if r.ok] == ["a", "c"]
+
+
+def test_bulk_helpers_accept_empty_input():
+    client = _client(lambda uri, payload: pytest.fail("no request expected"))
+    assert client.place_orders([]) == []
+    assert client.cancel_orders([]) == []
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from deepcoin import cache
+from deepcoin.cache import ResponseCache
+
+TICKERS = "/deepcoin/market/tickers"
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class FakeTime:
+        now = 1000.0
+
+        def monotonic(self):
+            return self.now
+
+    fake = FakeTime()
+    monkeypatch.setattr(cache, "time", fake)
+    return fake
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    responses = ResponseCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"data": [1]}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(responses.get_or_fetch(TICKERS, {"instType": "SWAP"}, fetch)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    _wait_for(lambda: sum(responses.coalesced.values()) == 4)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"data": [1]}] * 5
+    assert responses.stats()[TICKERS]["coalesced"] == 4
+
+
+def test_error_is_shared_and_not_cached():
+    responses = ResponseCache()
+    release = threading.Event()
+    errors = []
+
+    def fetch():
+        release.wait(5)
+        raise ConnectionError("down")
+
+    def call():
+        try:
+            responses.get_or_fetch(TICKERS, {}, fetch)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for t in threads:
+        t.start()
+    _wait_for(lambda: sum(responses.coalesced.values()) == 2)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 3
+    assert len(responses) == 0
+    assert responses.get_or_fetch(TICKERS, {}, lambda: "ok") == "ok"
+
+
+def test_ttl_expiry_and_uncached_paths(clock):
+    responses = ResponseCache()
+    assert responses.get_or_fetch(TICKERS, {"a": 1}, lambda: "first") == "first"
+    assert responses.get_or_fetch(TICKERS, {"a": 1}, lambda: "second") == "first"
+    clock.now += 0.5
+    assert responses.get_or_fetch(TICKERS, {"a": 1}, lambda: "third") == "third"
+
+    # No TTL: coalesced but never stored.
+    assert responses.get_or_fetch("/deepcoin/market/trades", {}, lambda: 1) == 1
+    assert responses.get_or_fetch("/deepcoin/market/trades", {}, lambda: 2) == 2
+
+
+def test_lru_eviction():
+    responses = ResponseCache(default_ttl=60, maxsize=2)
+    responses.get_or_fetch("/a", {}, lambda: "a")
+    responses.get_or_fetch("/b", {}, lambda: "b")
+    responses.get_or_fetch("/a", {}, lambda: "stale")     # refresh /a
+    responses.get_or_fetch("/c", {}, lambda: "c")         # evicts /b
+
+    assert responses.evictions == 1
+    assert responses.get_or_fetch("/a", {}, lambda: "new") == "a"
+    assert responses.get_or_fetch("/b", {}, lambda: "new") == "new"
+
+
+def test_async_waiter_cancellation_does_not_cancel_shared_fetch():
+    async def main():
+        responses = ResponseCache()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "ok"
+
+        leader = asyncio.ensure_future(responses.get_or_fetch_async(TICKERS, {}, fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(responses.get_or_fetch_async(TICKERS, {}, fetch))
+        other = asyncio.ensure_future(responses.get_or_fetch_async(TICKERS, {}, fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+
+        assert await leader == "ok"
+        assert await other == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert len(calls) == 1
+
+    asyncio.run(main())
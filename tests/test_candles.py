@@ -0,0 +1,105 @@
+import calendar
+
+import pytest
+
+from deepcoin import candles
+from deepcoin.candles import BAR_MS, CandleStore
+
+HOUR = 3_600_000
+DAY = 86_400_000
+
+
+def _utc(*args):
+    return calendar.timegm(args + (0,) * (6 - len(args))) * 1000
+
+
+class FakeClient:
+    """get_candles over a fixed series of candle open times, newest first like the API."""
+
+    def __init__(self, opens):
+        self.opens = sorted(opens)
+        self.calls = 0
+
+    def get_candles(self, inst_id, bar, after, limit):
+        self.calls += 1
+        rows = [[str(ts), "1", "2", "0.5", str(ts % 97), "10", "20"] for ts in self.opens if ts < after]
+        return {"code": "0", "data": rows[::-1][:limit]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class FakeTime:
+        now = 0.0
+
+        def time(self):
+            return self.now
+
+    fake = FakeTime()
+    monkeypatch.setattr(candles, "time", fake)
+    return fake
+
+
+def test_weekly_bars_open_on_monday(tmp_path):
+    store = CandleStore(FakeClient([]), str(tmp_path))
+    # 2024-01-04 is a Thursday, the weekly bar opened on Monday 2024-01-01.
+    assert store.bar_open("1W", _utc(2024, 1, 4, 13)) == _utc(2024, 1, 1)
+    assert store.bar_open("1W", _utc(2024, 1, 1)) == _utc(2024, 1, 1)
+    assert store.bar_open("1D", _utc(2024, 1, 4, 13)) == _utc(2024, 1, 4)
+
+
+def test_utc_offset_moves_daily_and_weekly_boundaries(tmp_path):
+    store = CandleStore(FakeClient([]), str(tmp_path), utc_offset_hours=8)
+    # Midnight UTC+8 is 16:00 UTC the day before.
+    assert store.bar_open("1D", _utc(2024, 1, 4, 13)) == _utc(2024, 1, 3, 16)
+    assert store.bar_open("1D", _utc(2024, 1, 4, 17)) == _utc(2024, 1, 4, 16)
+    assert store.bar_open("1W", _utc(2024, 1, 4, 13)) == _utc(2023, 12, 31, 16)
+    assert store.bar_open("12H", _utc(2024, 1, 4, 13)) == _utc(2024, 1, 4, 4)
+    assert store.bar_open("1H", _utc(2024, 1, 4, 13, 30)) == _utc(2024, 1, 4, 13)
+
+
+def test_open_weekly_bar_is_not_cached(tmp_path, clock):
+    mondays = [_utc(2024, 1, 1) + i * BAR_MS["1W"] for i in range(4)]
+    client = FakeClient(mondays)
+    store = CandleStore(client, str(tmp_path))
+    # Wednesday of the fourth week: that bar is still open.
+    clock.now = (mondays[3] + 2 * DAY) / 1000
+
+    got = store.get("BTC-USDT-SWAP", "1W", mondays[0])
+    assert list(got["ts"]) == mondays[:3]
+    assert store.cached_range("BTC-USDT-SWAP", "1W") == (mondays[0], mondays[3])
+
+    clock.now = (mondays[3] + 8 * DAY) / 1000
+    got = store.get("BTC-USDT-SWAP", "1W", mondays[0])
+    assert list(got["ts"]) == mondays
+
+
+def test_bar_open_on_another_boundary_is_not_cached(tmp_path, clock, caplog):
+    # The exchange opens daily bars at midnight UTC+8, the store expects UTC.
+    opens = [_utc(2024, 1, 1, 16) + i * DAY for i in range(4)]
+    client = FakeClient(opens)
+    store = CandleStore(client, str(tmp_path))
+    clock.now = (opens[3] + 12 * HOUR) / 1000     # 04:00 UTC, the last bar closes at 16:00
+
+    got = store.get("BTC-USDT-SWAP", "1D", opens[0])
+    assert list(got["ts"]) == opens[:3]
+    assert store.cached_range("BTC-USDT-SWAP", "1D")[1] == opens[3]
+    assert "check utc_offset_hours" in caplog.text
+
+    clock.now = (opens[3] + DAY) / 1000
+    got = store.get("BTC-USDT-SWAP", "1D", opens[0])
+    assert list(got["ts"]) == opens
+
+
+def test_cached_range_is_not_fetched_again(tmp_path, clock):
+    opens = [i * 60_000 for i in range(1000)]
+    client = FakeClient(opens)
+    store = CandleStore(client, str(tmp_path), window=100)
+    clock.now = 1000 * 60_000 / 1000
+
+    got = store.get("BTC-USDT-SWAP", "1m", 0, 500 * 60_000)
+    assert list(got["ts"]) == opens[:500]
+    calls = client.calls
+    got = store.get("BTC-USDT-SWAP", "1m", 100 * 60_000, 400 * 60_000)
+    assert client.calls == calls
+    assert list(got["ts"]) == opens[100:400]
+    assert list(got["close"]) == [float(ts % 97) for ts in opens[100:400]]
@@ -0,0 +1,128 @@
+import math
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from deepcoin import clock as clock_module
+from deepcoin.auth import DeepcoinAuth
+from deepcoin.client import Client
+from deepcoin.clock import ClockSync, push_timestamp
+
+OFFSET = 2.3          # exchange clock runs 2.3 s ahead of the local one
+RTT = 0.04
+
+
+def _date(server_time):
+    return formatdate(server_time, usegmt=True)
+
+
+def _exchange(sync, sent, offset=OFFSET, rtt=RTT):
+    """One synthetic REST round trip: the server stamps its Date header halfway through."""
+    received = sent + rtt
+    sync.observe_response(sent, received, _date(sent + rtt / 2 + offset))
+    return received
+
+
+def test_a_date_header_bounds_the_offset_to_its_one_second_resolution():
+    sync = ClockSync()
+    assert (sync.offset, sync.uncertainty) == (0.0, math.inf)
+
+    _exchange(sync, sent=1_700_000_000.0)
+    # Date says ...02 (floored), so 2.0 - 0.04 <= offset < 3.0
+    assert (sync.lower, sync.upper) == (pytest.approx(1.96), pytest.approx(3.0))
+    assert sync.lower <= OFFSET < sync.upper
+    assert sync.offset == pytest.approx(2.48)
+    assert sync.rtt == pytest.approx(RTT)
+
+
+def test_date_headers_sent_at_different_sub_second_phases_narrow_the_bounds():
+    sync = ClockSync()
+    for i in range(20):
+        _exchange(sync, sent=1_700_000_000.0 + i * 7.13)
+
+    assert sync.lower <= OFFSET < sync.upper
+    assert sync.uncertainty < 0.05                  # far below the header's 1 s resolution
+    assert sync.offset == pytest.approx(OFFSET, abs=0.05)
+    assert sync.samples == 20
+
+
+def test_missing_or_garbled_date_headers_are_ignored():
+    sync = ClockSync()
+    sync.observe_response(0.0, 0.1, None)
+    sync.observe_response(0.0, 0.1, "not a date")
+    assert sync.samples == 0 and sync.rtt is None
+
+
+def test_server_timestamps_narrow_the_bounds():
+    sync = ClockSync()
+    _exchange(sync, sent=1_700_000_000.0)
+    assert sync.lower == pytest.approx(1.96)
+
+    # A push stamped 10 ms before it arrived only raises the lower bound.
+    received = 1_700_000_010.0
+    sync.observe_server_time(received + OFFSET - 0.01, received)
+    assert sync.lower == pytest.approx(OFFSET - 0.01)
+    assert sync.upper == pytest.approx(3.0)
+
+    # A REST `ts` taken between send and receive bounds both sides.
+    sent = 1_700_000_020.0
+    sync.observe_server_time(sent + 0.015 + OFFSET, sent + 0.02, sent=sent)
+    assert (sync.lower, sync.upper) == (pytest.approx(OFFSET - 0.005), pytest.approx(OFFSET + 0.015))
+    assert sync.offset == pytest.approx(OFFSET + 0.005)
+
+
+def test_lower_bounds_alone_give_an_estimate():
+    sync = ClockSync()
+    sync.observe_server_time(100.5, received=100.0)
+    assert (sync.offset, sync.upper) == (0.5, math.inf)
+
+
+def test_a_clock_step_drops_the_older_contradicting_samples():
+    sync = ClockSync()
+    for i in range(5):
+        _exchange(sync, sent=1_700_000_000.0 + i * 7.13)
+    for i in range(5):
+        _exchange(sync, sent=1_700_001_000.0 + i * 7.13, offset=-0.7)
+
+    assert sync.lower <= -0.7 < sync.upper
+    assert sync.offset == pytest.approx(-0.7, abs=0.25)
+
+
+def test_push_latency_uses_the_corrected_clock():
+    sync = ClockSync()
+    sync.observe_server_time(1_000.0 + OFFSET, received=1_000.0, sent=999.98)   # offset in [2.3, 2.32]
+    assert sync.observe_push(2_000.0 + OFFSET, received=2_000.005) == pytest.approx(0.015)
+    sync.observe_push(2_000.0 + OFFSET, received=2_000.02)
+
+    stats = sync.latency_stats()
+    assert stats["count"] == 2 and stats["min"] == pytest.approx(0.015)
+    assert stats["last"] == pytest.approx(0.03)
+    assert ClockSync().latency_stats() == {"count": 0}
+
+
+def test_push_timestamp_reads_seconds_and_milliseconds():
+    def push(**data):
+        return {"action": "PushMarketTrade", "result": [{"data": data}]}
+
+    assert push_timestamp(push(TradeTime=1_700_000_000)) == 1_700_000_000
+    assert push_timestamp(push(UpdateMilliTime=1_700_000_000_250, TradeTime=1)) == 1_700_000_000.25
+    assert push_timestamp(push(UpdateTime="0", InsertTime="x", CreateTime="1700000001")) == 1_700_000_001
+    assert push_timestamp(push(Price=1)) is None
+    assert push_timestamp({"action": "PushMarketTrade"}) is None
+
+
+def test_requests_are_signed_with_the_corrected_time(monkeypatch):
+    monkeypatch.setattr(clock_module, "time", SimpleNamespace(time=lambda: 1_700_000_000.0))
+    sync = ClockSync()
+    sync.observe_server_time(1_699_999_990.0, received=1_699_999_987.5, sent=1_699_999_987.5)
+    assert (sync.offset, sync.now()) == (2.5, 1_700_000_002.5)
+
+    client = Client("key", "secret", "passphrase", clock=sync)
+    assert client.auth.time_source == sync.now
+    headers = client.auth.sign("GET", "/deepcoin/account/balances?instType=SPOT")
+    assert headers["DC-ACCESS-TIMESTAMP"] == "2023-11-14T22:13:22.500Z"
+
+    fixed = DeepcoinAuth("key", "secret", "passphrase")
+    fixed.time_source = lambda: 1_700_000_000.0
+    assert fixed.sign("GET", "/")["DC-ACCESS-TIMESTAMP"] == "2023-11-14T22:13:20.000Z"
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+import requests
+
+from deepcoin.client import Client
+from deepcoin.exceptions import DeepcoinRequestException
+from deepcoin.utils import codec
+
+PAYLOAD = {
+    "action": "PushMarketTrade",
+    "result": [{"table": "Trade", "data": {"InstrumentID": "BTCUSDT", "Price": 65000.1, "Volume": 3, "Side": None}}],
+    "flags": [True, False],
+    "note": "été – 比特币",
+    "big": 1_700_000_000_250,
+    "nested": {"empty": {}, "list": []},
+}
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def backend(request):
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    previous = codec.name, codec.loads, codec.dumps
+    yield codec.set_codec(request.param)
+    codec.set_codec(previous[0], custom=previous[1:])
+
+
+def test_round_trip(backend):
+    assert backend == codec.name
+    encoded = codec.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded.decode("utf-8")) == PAYLOAD
+    assert json.loads(encoded) == PAYLOAD                          # readable by any other backend
+    assert codec.dumps({"a": [1, 2.5], "b": {"c": None}}) == b'{"a":[1,2.5],"b":{"c":null}}'
+
+
+def test_bad_input_raises_value_error(backend):
+    for bad in (b"{", "not json", b"\xff"):
+        with pytest.raises(ValueError):
+            codec.loads(bad)
+    with pytest.raises((ValueError, TypeError)):
+        codec.dumps({"x": float("nan")} if backend == "json" else {"x": object()})
+
+
+def test_rest_responses_go_through_the_selected_codec(backend):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = codec.dumps({"code": "0", "data": PAYLOAD})
+    assert Client._handle_response(response)["data"] == PAYLOAD
+
+    response._content = b"<html>busy</html>"
+    with pytest.raises(DeepcoinRequestException):
+        Client._handle_response(response)
+
+
+def test_set_codec_custom_and_unknown():
+    previous = codec.name, codec.loads, codec.dumps
+    calls = []
+    try:
+        assert codec.set_codec(custom=(lambda data: calls.append(data) or {"code": "0"}, previous[2])) == "custom"
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        assert Client._handle_response(response) == {"code": "0"}
+        assert calls == [b"{}"]
+        with pytest.raises(ValueError):
+            codec.set_codec("yaml")
+    finally:
+        codec.set_codec(previous[0], custom=previous[1:])
+    assert codec.name == previous[0]
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from deepcoin.ws.conflation import Conflator
+
+
+def _ticker(symbol, price):
+    return {"action": "PushMarketDataOverView", "result": [{"data": {"InstrumentID": symbol, "LastPrice": price}}]}
+
+
+def _price(message):
+    return message["result"][0]["data"]["LastPrice"]
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, message):
+        self.calls.append((threading.current_thread().name, _price(message), time.monotonic()))
+
+    def prices(self):
+        return [price for _, price, _ in self.calls]
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.002)
+    raise AssertionError("condition not met in time")
+
+
+def test_unconflated_messages_are_not_taken():
+    conflator = Conflator(Recorder())
+    try:
+        conflator.enable("PushMarketDataOverView", "BTCUSDT", max_rate=10)
+        assert not conflator.offer(_ticker("ETHUSDT", 1))
+        assert not conflator.offer({"action": "PushMarketTrade", "result": []})
+    finally:
+        conflator.stop()
+
+
+def test_first_update_is_prompt_and_on_the_conflator_thread():
+    deliver = Recorder()
+    conflator = Conflator(deliver)
+    try:
+        conflator.enable("PushMarketDataOverView", "BTCUSDT", max_rate=1)
+        start = time.monotonic()
+        assert conflator.offer(_ticker("BTCUSDT", 1))
+        _wait_for(lambda: deliver.calls)
+        thread, price, at = deliver.calls[0]
+        assert (thread, price) == ("deepcoin-conflator", 1)
+        assert at - start < 0.1
+    finally:
+        conflator.stop()
+
+
+def test_burst_keeps_only_the_newest_update():
+    deliver = Recorder()
+    conflator = Conflator(deliver)
+    try:
+        conflator.enable("PushMarketDataOverView", "BTCUSDT", max_rate=20)
+        conflator.offer(_ticker("BTCUSDT", 0))
+        _wait_for(lambda: deliver.calls)
+        for price in range(1, 11):
+            conflator.offer(_ticker("BTCUSDT", price))
+        _wait_for(lambda: len(deliver.calls) == 2)
+        time.sleep(0.1)
+
+        assert deliver.prices() == [0, 10]
+        assert deliver.calls[1][2] - deliver.calls[0][2] >= 0.05 - 0.005
+        assert conflator.conflated == 9
+        assert conflator.delivered == 2
+    finally:
+        conflator.stop()
+
+
+def test_reenabled_slot_ignores_the_old_slots_schedule():
+    deliver = Recorder()
+    conflator = Conflator(deliver)
+    try:
+        conflator.enable("PushMarketDataOverView", "BTCUSDT", max_rate=20)
+        conflator.offer(_ticker("BTCUSDT", 1))
+        _wait_for(lambda: deliver.calls)
+        conflator.offer(_ticker("BTCUSDT", 2))      # scheduled 50 ms out on the old slot
+        conflator.disable("PushMarketDataOverView", "BTCUSDT")
+        conflator.enable("PushMarketDataOverView", "BTCUSDT", max_rate=1)
+        conflator.offer(_ticker("BTCUSDT", 3))
+        _wait_for(lambda: len(deliver.calls) == 2)
+        conflator.offer(_ticker("BTCUSDT", 4))      # due one second after 3
+
+        time.sleep(0.3)
+        assert deliver.prices() == [1, 3]
+    finally:
+        conflator.stop()
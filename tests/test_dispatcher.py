@@ -0,0 +1,270 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from deepcoin.ws.dispatcher import AsyncMessageDispatcher, MessageDispatcher, message_key, route_key
+from deepcoin.ws.enums import OverflowPolicy, WSAction
+from deepcoin.ws.exceptions import DeepcoinCallbackError
+from deepcoin.ws.queued_dispatcher import QueuedMessageDispatcher
+
+
+def _push(action, symbol, period=None):
+    data = {"InstrumentID": symbol}
+    if period:
+        data["PeriodID"] = period
+    return {"action": action, "result": [{"table": "x", "data": data}]}
+
+
+class Collect:
+    def __init__(self):
+        self.messages = []
+
+    def __call__(self, message):
+        self.messages.append(message)
+
+
+def test_message_key_and_route_key_agree():
+    assert message_key(_push("PushMarketTrade", "BTCUSDT")) == route_key("BTCUSDT") == "BTCUSDT"
+    assert message_key(_push("PushKLine", "BTCUSDT", "1m")) == route_key("BTCUSDT", "1m") == "BTCUSDT_1m"
+    assert message_key({"action": "PushOrder", "result": [{"data": {"OrderSysID": "1"}}]}) is None
+    assert message_key({"action": "PushOrder"}) is None
+
+
+def test_action_wide_and_routed_callbacks():
+    dispatcher = MessageDispatcher()
+    every, btc, eth = Collect(), Collect(), Collect()
+    dispatcher.register(WSAction.PUSH_LAST_TX, every)
+    dispatcher.register(WSAction.PUSH_LAST_TX, btc, symbol="BTCUSDT")
+    dispatcher.register(WSAction.PUSH_LAST_TX, eth, symbol="ETHUSDT")
+    dispatcher.register(WSAction.PUSH_LAST_TX, btc, symbol="BTCUSDT")  # duplicate: no-op
+
+    dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT"))
+    dispatcher.dispatch(_push("PushMarketTrade", "SOLUSDT"))
+
+    assert len(every.messages) == 2
+    assert len(btc.messages) == 1
+    assert eth.messages == []
+
+
+def test_kline_routes_need_a_period():
+    dispatcher = MessageDispatcher()
+    callback = Collect()
+    with pytest.raises(ValueError):
+        dispatcher.register(WSAction.PUSH_KLINE, callback, symbol="BTCUSDT")
+
+    dispatcher.register(WSAction.PUSH_KLINE, callback, symbol="BTCUSDT", period="1m")
+    dispatcher.dispatch(_push("PushKLine", "BTCUSDT", "1m"))
+    dispatcher.dispatch(_push("PushKLine", "BTCUSDT", "5m"))
+    assert len(callback.messages) == 1
+
+
+def test_unregister_callback_without_symbol_covers_every_route():
+    dispatcher = MessageDispatcher()
+    target, other = Collect(), Collect()
+    dispatcher.register("PushMarketTrade", target)
+    dispatcher.register("PushMarketTrade", target, symbol="BTCUSDT")
+    dispatcher.register("PushMarketTrade", target, symbol="ETHUSDT")
+    dispatcher.register("PushMarketTrade", other, symbol="BTCUSDT")
+
+    dispatcher.unregister("PushMarketTrade", target)
+    dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT"))
+    dispatcher.dispatch(_push("PushMarketTrade", "ETHUSDT"))
+
+    assert target.messages == []
+    assert len(other.messages) == 1
+    assert dispatcher.list_registered() == ["PushMarketTrade"]
+
+
+def test_unregister_scoped_and_everything():
+    dispatcher = MessageDispatcher()
+    a, b = Collect(), Collect()
+    dispatcher.register("PushMarketTrade", a, symbol="BTCUSDT")
+    dispatcher.register("PushMarketTrade", b, symbol="BTCUSDT")
+    dispatcher.register("PushMarketTrade", b)
+
+    dispatcher.unregister("PushMarketTrade", b, symbol="BTCUSDT")
+    dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT"))
+    assert (len(a.messages), len(b.messages)) == (1, 1)
+
+    dispatcher.unregister("PushMarketTrade")
+    assert dispatcher.list_registered() == []
+    dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT"))
+    assert (len(a.messages), len(b.messages)) == (1, 1)
+
+
+def test_failing_callback_does_not_stop_the_others():
+    dispatcher = MessageDispatcher()
+    after = Collect()
+
+    def failing(message):
+        raise RuntimeError("boom")
+
+    dispatcher.register("PushMarketTrade", failing)
+    dispatcher.register("PushMarketTrade", after)
+    with pytest.raises(DeepcoinCallbackError):
+        dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT"))
+    assert len(after.messages) == 1
+
+
+def test_dispatch_hook_sees_action_and_duration():
+    dispatcher = MessageDispatcher()
+    seen = []
+    dispatcher.register("PushMarketTrade", Collect())
+    dispatcher.add_hook(lambda action, seconds: seen.append((action, seconds)))
+    dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT"))
+    assert seen[0][0] == "PushMarketTrade" and seen[0][1] >= 0
+
+
+def test_async_dispatcher_awaits_coroutines():
+    dispatcher = AsyncMessageDispatcher()
+    seen = []
+
+    async def on_trade(message):
+        await asyncio.sleep(0)
+        seen.append(message_key(message))
+
+    dispatcher.register("PushMarketTrade", on_trade, symbol="BTCUSDT")
+    asyncio.run(dispatcher.dispatch(_push("PushMarketTrade", "BTCUSDT")))
+    assert seen == ["BTCUSDT"]
+
+
+# -------------------------
+# QueuedMessageDispatcher
+# -------------------------
+
+def _numbered(action, symbol, n):
+    message = _push(action, symbol)
+    message["result"][0]["data"]["n"] = n
+    return message
+
+
+def _numbers(messages):
+    return [(m["result"][0]["data"]["InstrumentID"], m["result"][0]["data"]["n"]) for m in messages]
+
+
+class Gate(Collect):
+    """Callback that holds the worker on its first message until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, message):
+        self.entered.set()
+        self.release.wait(5)
+        super().__call__(message)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not met in time")
+
+
+def _held(policy, maxsize):
+    """Dispatcher whose single worker is stuck on message 0 of PushMarketTrade."""
+    dispatcher = QueuedMessageDispatcher(maxsize=maxsize, policy=policy)
+    gate = Gate()
+    dispatcher.register(WSAction.PUSH_LAST_TX, gate)
+    dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", 0))
+    assert gate.entered.wait(5)
+    return dispatcher, gate
+
+
+def test_drop_oldest_discards_the_oldest_queued_messages():
+    dispatcher, gate = _held(OverflowPolicy.DROP_OLDEST, maxsize=3)
+    for n in range(1, 6):
+        dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", n))
+    gate.release.set()
+    _wait_for(lambda: dispatcher.stats()[WSAction.PUSH_LAST_TX.value]["processed"] == 4)
+
+    assert [n for _, n in _numbers(gate.messages)] == [0, 3, 4, 5]
+    stats = dispatcher.stats()[WSAction.PUSH_LAST_TX.value]
+    assert (stats["enqueued"], stats["processed"], stats["dropped"]) == (6, 4, 2)
+    assert stats["high_watermark"] == 3
+    assert dispatcher.dropped == 2
+    dispatcher.stop()
+
+
+def test_conflate_replaces_queued_message_of_the_same_key_in_place():
+    dispatcher, gate = _held(OverflowPolicy.CONFLATE, maxsize=10)
+    dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", 1))
+    dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "ETHUSDT", 1))
+    dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", 2))
+    gate.release.set()
+    _wait_for(lambda: len(gate.messages) == 3)
+
+    assert _numbers(gate.messages) == [("BTCUSDT", 0), ("BTCUSDT", 2), ("ETHUSDT", 1)]
+    assert dispatcher.conflated == 1
+    assert dispatcher.dropped == 0
+    dispatcher.stop()
+
+
+def test_conflate_drops_the_oldest_key_when_full():
+    dispatcher, gate = _held(OverflowPolicy.CONFLATE, maxsize=2)
+    for symbol in ("AUSDT", "BUSDT", "CUSDT"):
+        dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, symbol, 1))
+    gate.release.set()
+    _wait_for(lambda: len(gate.messages) == 3)
+
+    assert [symbol for symbol, _ in _numbers(gate.messages)] == ["BTCUSDT", "BUSDT", "CUSDT"]
+    assert dispatcher.dropped == 1
+    dispatcher.stop()
+
+
+def test_block_waits_for_room_and_loses_nothing():
+    dispatcher, gate = _held(OverflowPolicy.BLOCK, maxsize=1)
+    dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", 1))
+    producer = threading.Thread(
+        target=dispatcher.dispatch, args=(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", 2),)
+    )
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()          # the socket reader waits while the queue is full
+
+    gate.release.set()
+    producer.join(5)
+    _wait_for(lambda: len(gate.messages) == 3)
+    dispatcher.stop()
+
+    assert [n for _, n in _numbers(gate.messages)] == [0, 1, 2]
+    assert dispatcher.dropped == 0
+
+
+def test_each_action_is_delivered_in_order_across_workers():
+    dispatcher = QueuedMessageDispatcher(workers=2)
+    trades, books = Collect(), Collect()
+    dispatcher.register(WSAction.PUSH_LAST_TX, trades)
+    dispatcher.register(WSAction.PUSH_ORDERBOOK, books)
+    for n in range(500):
+        dispatcher.dispatch(_numbered(WSAction.PUSH_LAST_TX, "BTCUSDT", n))
+        dispatcher.dispatch(_numbered(WSAction.PUSH_ORDERBOOK, "BTCUSDT", n))
+    _wait_for(lambda: len(trades.messages) == len(books.messages) == 500)
+    dispatcher.stop()
+
+    assert [n for _, n in _numbers(trades.messages)] == list(range(500))
+    assert [n for _, n in _numbers(books.messages)] == list(range(500))
+
+
+def test_callback_errors_are_counted_and_reported():
+    errors = []
+    dispatcher = QueuedMessageDispatcher(on_error=lambda action, e: errors.append(action))
+
+    def failing(message):
+        raise RuntimeError("boom")
+
+    dispatcher.register(WSAction.PUSH_LAST_TX, failing)
+    dispatcher.dispatch(_push(WSAction.PUSH_LAST_TX, "BTCUSDT"))
+    dispatcher.dispatch(_push(WSAction.PUSH_KLINE, "BTCUSDT"))     # no callback: not queued
+    _wait_for(lambda: dispatcher.stats()[WSAction.PUSH_LAST_TX.value]["processed"] == 1)
+
+    assert errors == [WSAction.PUSH_LAST_TX]
+    assert dispatcher.stats()[WSAction.PUSH_LAST_TX.value]["errors"] == 1
+    assert list(dispatcher.stats()) == [WSAction.PUSH_LAST_TX.value]
+    dispatcher.stop()
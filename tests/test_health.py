@@ -0,0 +1,119 @@
+import time
+
+from deepcoin.ws.enums import TopicID, WSAction
+from deepcoin.ws.health import HealthMonitor
+from deepcoin.ws.subscriptions import Subscription
+
+BTC_BOOK = Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, "BTCUSDT")
+ILLIQUID_BOOK = Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, "SYM9USDT")
+
+
+class FakeConnection:
+    ping_interval = 15.0
+    ping_rtt = 0.01
+
+    def __init__(self):
+        self.connected_at = time.monotonic() - 60
+        self.pong_age = 1.0
+        self.reconnects = 0
+
+    def is_alive(self):
+        return True
+
+    def force_reconnect(self):
+        self.reconnects += 1
+
+
+class FakeManager:
+    def __init__(self, subs):
+        self.connection = FakeConnection()
+        self.subs = list(subs)
+        self.resubscribed = []
+
+    def subscriptions(self):
+        return list(self.subs)
+
+    def resubscribe(self, sub):
+        self.resubscribed.append(sub)
+
+    def register_callback(self, action, callback):
+        pass
+
+
+def _book_push(symbol):
+    return {"action": WSAction.PUSH_ORDERBOOK.value, "result": [{"data": {"InstrumentID": symbol}}]}
+
+
+def test_one_silent_topic_is_resubscribed_not_reconnected():
+    manager = FakeManager([BTC_BOOK, ILLIQUID_BOOK])
+    monitor = HealthMonitor(manager)
+    monitor._on_push(_book_push("BTCUSDT"))
+
+    assert monitor.check() == [False]
+    assert manager.connection.reconnects == 0
+    assert manager.resubscribed == [ILLIQUID_BOOK]
+    assert monitor.resubscribes == 1
+
+    # The resubscribed topic gets a fresh threshold of grace.
+    monitor._on_push(_book_push("BTCUSDT"))
+    monitor.check()
+    assert manager.resubscribed == [ILLIQUID_BOOK]
+    assert not monitor.stats()[0]["topics"][f"{WSAction.PUSH_ORDERBOOK.value} SYM9USDT"]["stale"]
+
+
+def test_all_topics_silent_forces_reconnect():
+    manager = FakeManager([BTC_BOOK, ILLIQUID_BOOK])
+    monitor = HealthMonitor(manager)
+
+    assert monitor.check() == [True]
+    assert manager.connection.reconnects == 1
+    assert manager.resubscribed == []
+    assert monitor.check() == [True]
+    assert manager.connection.reconnects == 1       # within min_reconnect_interval
+
+
+def test_missing_pong_forces_reconnect():
+    manager = FakeManager([BTC_BOOK])
+    manager.connection.pong_age = 60.0
+    monitor = HealthMonitor(manager)
+    monitor._on_push(_book_push("BTCUSDT"))
+
+    assert monitor.check() == [True]
+    assert "no pong" in monitor.stats()[0]["reasons"][0]
+    assert manager.connection.reconnects == 1
+
+
+def test_any_policy_reconnects_on_one_silent_topic():
+    manager = FakeManager([BTC_BOOK, ILLIQUID_BOOK])
+    monitor = HealthMonitor(manager, policy="any")
+    monitor._on_push(_book_push("BTCUSDT"))
+
+    assert monitor.check() == [True]
+    assert manager.connection.reconnects == 1
+    assert manager.resubscribed == []
+
+
+def test_fresh_connection_gets_grace_and_unwatched_actions_are_ignored():
+    trades = Subscription(TopicID.LAST_TRANSACTIONS.value, "BTCUSDT")
+    manager = FakeManager([BTC_BOOK, trades])
+    manager.connection.connected_at = time.monotonic()
+    monitor = HealthMonitor(manager, thresholds={(WSAction.PUSH_ORDERBOOK, "BTCUSDT"): 1.0})
+
+    assert monitor.check() == [False]
+    manager.connection.connected_at -= 2
+    assert monitor.check() == [True]
+    assert monitor.threshold(WSAction.PUSH_LAST_TX.value, "BTCUSDT") is None
+
+
+def test_manager_resubscribe_sends_unsubscribe_then_subscribe():
+    from deepcoin.ws.manager import DeepcoinWebsocketManager
+
+    ws = DeepcoinWebsocketManager("ws://127.0.0.1:1/unused")
+    ws.subscribe_orderbook("SYM9USDT")
+    sent, gaps = [], []
+    ws.connection.send = sent.append
+    ws.add_gap_hook(gaps.append)
+
+    ws.resubscribe(ILLIQUID_BOOK)
+    assert [payload["SendTopicAction"]["Action"] for payload in sent] == ["2", "1"]
+    assert gaps == [[ILLIQUID_BOOK]]
@@ -0,0 +1,142 @@
+import threading
+import time
+from decimal import ROUND_UP, Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from deepcoin import instruments
+from deepcoin.instruments import Instrument, InstrumentRegistry, Quantizer
+
+BTC_SWAP = {"instId": "BTC-USDT-SWAP", "instType": "SWAP", "tickSz": "0.1", "lotSz": "1", "minSz": "1", "ctVal": "0.001"}
+ETH_SWAP_COIN = {"instId": "ETH-USD-SWAP", "instType": "SWAP", "tickSz": "0.05", "lotSz": "1"}
+BTC_SPOT = {"instId": "BTC-USDT", "instType": "SPOT", "tickSz": "0.01", "lotSz": "0.0001", "minSz": "0.0001"}
+
+
+class FakeClient:
+    """get_instruments() served from a dict of inst_type -> list; an Exception value is raised instead."""
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_instruments(self, inst_type):
+        with self._lock:
+            self.calls.append(inst_type)
+        data = self.data[inst_type]
+        if isinstance(data, Exception):
+            raise data
+        return {"code": "0", "data": list(data)}
+
+
+def _registry(**kwargs):
+    client = FakeClient({"SPOT": [BTC_SPOT, {"instType": "SPOT"}], "SWAP": [BTC_SWAP, ETH_SWAP_COIN]})
+    return InstrumentRegistry(client, **kwargs), client
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not met in time")
+
+
+def test_from_api_derives_ws_symbol_and_product_group():
+    swap = Instrument.from_api(BTC_SWAP)
+    assert (swap.ws_symbol, swap.product_group, swap.base_ccy, swap.quote_ccy) == ("BTCUSDT", "SwapU", "BTC", "USDT")
+    assert swap.tick_size == Decimal("0.1") and swap.ct_val == Decimal("0.001")
+    assert Instrument.from_api(ETH_SWAP_COIN).product_group == "Swap"
+
+    spot = Instrument.from_api(BTC_SPOT)
+    assert (spot.ws_symbol, spot.product_group, spot.min_size) == ("BTC/USDT", None, Decimal("0.0001"))
+    assert Instrument.from_api({"instId": "SOL-USDT-SWAP"}).inst_type == "SWAP"
+
+
+def test_lookup_by_rest_id_and_ws_symbol_is_lazy_and_case_insensitive():
+    registry, client = _registry()
+    assert client.calls == []
+
+    assert registry["BTCUSDT"].inst_id == "BTC-USDT-SWAP"
+    assert registry["btc-usdt-swap"] is registry["BTCUSDT"]
+    assert registry["BTC/USDT"].inst_id == "BTC-USDT"
+    assert registry.to_inst_id("BTCUSDT") == "BTC-USDT-SWAP"
+    assert registry.to_ws_symbol("BTC-USDT-SWAP") == "BTCUSDT"
+    assert registry.to_ws_symbol("BTC-USDT") == "BTC/USDT"
+    assert registry.product_group("ETHUSD") == "Swap"
+    assert client.calls == ["SPOT", "SWAP"]
+
+    assert len(registry) == 3                        # the entry without instId is skipped
+    assert [i.inst_id for i in registry.instruments("SWAP")] == ["BTC-USDT-SWAP", "ETH-USD-SWAP"]
+    assert "DOGEUSDT" not in registry and registry.get("DOGEUSDT") is None
+    with pytest.raises(KeyError):
+        registry.to_inst_id("DOGEUSDT")
+
+
+def test_rest_id_wins_when_it_collides_with_a_ws_symbol():
+    client = FakeClient({"SPOT": [{"instId": "BTCUSDT", "instType": "SPOT"}], "SWAP": [BTC_SWAP]})
+    registry = InstrumentRegistry(client)
+    assert registry["BTCUSDT"].inst_type == "SPOT"
+
+
+def test_background_refresh_every_ttl_keeps_the_last_good_index():
+    registry, client = _registry(ttl=0.01)
+    registry.start()
+    try:
+        assert registry.get("SOLUSDT") is None
+        client.data["SWAP"] = RuntimeError("down")
+        calls = len(client.calls)
+        _wait_for(lambda: len(client.calls) >= calls + 4)
+        assert registry["BTCUSDT"].inst_id == "BTC-USDT-SWAP"    # failed reloads keep the old data
+
+        client.data["SWAP"] = [BTC_SWAP, {"instId": "SOL-USDT-SWAP", "tickSz": "0.001"}]
+        _wait_for(lambda: "SOLUSDT" in registry)
+        assert "ETHUSD" not in registry
+    finally:
+        registry.stop()
+
+
+def test_refresh_on_demand_updates_loaded_at(monkeypatch):
+    registry, client = _registry()
+    monkeypatch.setattr(instruments, "time", SimpleNamespace(monotonic=lambda: 50.0))
+    registry.refresh()
+    assert registry.loaded_at == 50.0
+    len(registry)
+    assert client.calls == ["SPOT", "SWAP"]          # already loaded: no second fetch
+
+
+@pytest.mark.parametrize("step, value, rounding, expected", [
+    ("0.1", "100.25", None, "100.2"),                # half-even
+    ("0.1", "100.35", None, "100.4"),
+    ("0.1", 100.26, None, "100.3"),                  # floats go through str(), not binary expansion
+    ("0.05", "1.07", None, "1.05"),
+    ("0.05", "1.08", None, "1.10"),
+    ("0.05", "1.01", ROUND_UP, "1.05"),
+    ("5", "12", None, "10"),
+    ("1E+1", "17", None, "2E+1"),
+])
+def test_quantizer(step, value, rounding, expected):
+    quantize = Quantizer(Decimal(step))
+    result = quantize(value) if rounding is None else quantize(value, rounding)
+    assert result == Decimal(expected)
+    assert quantize.is_valid(result)
+
+
+def test_quantizer_rejects_non_positive_steps():
+    with pytest.raises(ValueError):
+        Quantizer(Decimal(0))
+
+
+def test_round_and_format_price_and_size():
+    swap = Instrument.from_api(BTC_SWAP)
+    assert swap.round_price("65000.04") == Decimal("65000.0")
+    assert swap.format_price(65000.06) == "65000.1"
+    assert swap.round_size("2.9") == Decimal("2")              # sizes round down by default
+    assert swap.format_size("2.9", ROUND_UP) == "3"
+
+    spot = Instrument.from_api(BTC_SPOT)
+    assert spot.format_size("0.123456") == "0.1234"
+    assert spot.format_price(Decimal("0.1")) == "0.10"
+    assert spot.format_size("1E-5") == "0.0000"
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from deepcoin.ws.enums import OverflowPolicy, WSAction
+from deepcoin.ws.loadgen import FeedMix, LoadGenerator, _GCWatch
+from deepcoin.ws.queued_dispatcher import QueuedMessageDispatcher
+
+MIX = FeedMix(weights={WSAction.PUSH_LAST_TX.value: 1.0}, symbols=5, pool_size=64)
+
+
+def test_direct_run_reuses_the_manager():
+    gen = LoadGenerator(MIX)
+    manager = gen.manager
+    reports = [gen.run(rate=2000, duration=0.1) for _ in range(2)]
+
+    assert gen.manager is manager
+    for report in reports:
+        assert report.sent == 200
+        assert report.received + report.dropped + report.in_flight == report.sent
+    assert gen.dispatcher.list_registered() == []
+
+
+def test_queue_drops_are_not_counted_as_in_flight():
+    release = threading.Event()
+    dispatcher = QueuedMessageDispatcher(maxsize=10, policy=OverflowPolicy.DROP_OLDEST)
+    dispatcher.register(WSAction.PUSH_LAST_TX, lambda message: release.wait(5))
+    gen = LoadGenerator(MIX, dispatcher=dispatcher, drain_timeout=0.05)
+
+    report = gen.run(rate=5000, duration=0.1)
+    release.set()
+    dispatcher.stop()
+
+    assert report.dropped > 0
+    assert report.received + report.dropped + report.in_flight == report.sent
+    assert report.in_flight <= 11     # at most the queue and the message being handled
+
+
+def test_gc_watch_pairs_start_and_stop_per_thread():
+    watch = _GCWatch()
+    watch("stop", {"generation": 2})            # started before the watch was installed
+    watch("start", {"generation": 0})
+    other = threading.Thread(target=lambda: (watch("start", {"generation": 1}), time.sleep(0.02),
+                                             watch("stop", {"generation": 1})))
+    other.start()
+    other.join()
+    watch("stop", {"generation": 0})
+
+    pauses = dict(watch.pauses)
+    assert sorted(pauses) == [0, 1]
+    assert pauses[1] >= 0.02
+    assert pauses[0] >= pauses[1]
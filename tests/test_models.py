@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+from deepcoin.models import Candle, Fill, Trade, typed_callback
+
+
+def test_json_numbers_decode_like_numeric_strings():
+    from_json = Trade.from_raw({"InstrumentID": "BTCUSDT", "TradeID": 17, "Price": 100, "Volume": 2, "TradeTime": 1.7e12})
+    from_strings = Trade.from_raw({"InstrumentID": "BTCUSDT", "TradeID": "17", "Price": "100", "Volume": "2", "TradeTime": "1700000000000"})
+
+    assert from_json.size == 2.0 and type(from_json.size) is float
+    assert type(from_json.price) is float
+    assert from_json.trade_id == "17"
+    assert from_json.ts == 1_700_000_000_000 and type(from_json.ts) is int
+    assert from_json == from_strings
+
+
+def test_decimal_mode_is_exact_for_json_numbers():
+    trade = Trade.from_raw({"Price": 0.1, "Volume": 3}, decimal=True)
+    assert trade.price == Decimal("0.1")
+    assert trade.size == Decimal(3) and type(trade.size) is Decimal
+
+
+def test_missing_and_empty_fields_are_none():
+    fill = Fill.from_raw({"instId": "BTC-USDT-SWAP", "fillPx": ""})
+    assert fill.fill_px is None
+    assert fill.fee is None
+    assert fill["inst_id"] == "BTC-USDT-SWAP"
+
+
+def test_list_records_and_push_messages():
+    candle = Candle.from_raw(["1700000000000", "1", "2", "0.5", "1.5", "10"])
+    assert (candle.ts, candle.close, candle.volume_ccy) == (1_700_000_000_000, 1.5, None)
+
+    received = []
+    on_push = typed_callback("PushMarketTrade", received.append)
+    on_push({"action": "PushMarketTrade", "result": [{"data": {"Price": "1"}}, {"data": {"Price": "2"}}]})
+    assert [t.price for t in received] == [1.0, 2.0]
+
+
+def test_models_are_hashable_by_value():
+    a = Trade.from_raw({"TradeID": "1", "Price": "100"})
+    b = Trade.from_raw({"TradeID": 1, "Price": 100})
+    assert a == b and hash(a) == hash(b)
+    assert len({a, b, Trade.from_raw({"TradeID": "2"})}) == 2
+    assert a != Fill.from_raw({"TradeID": "1", "Price": "100"})
@@ -0,0 +1,185 @@
+import threading
+import time
+
+import pytest
+
+from deepcoin.ws.enums import TopicID
+from deepcoin.ws.manager import DeepcoinWebsocketManager
+from deepcoin.ws.orderbook import LocalOrderBook, OrderBookManager
+from deepcoin.ws.subscriptions import Subscription
+
+
+def _row(direction, price, volume, symbol="BTCUSDT"):
+    return {"InstrumentID": symbol, "Direction": direction, "Price": price, "Volume": volume}
+
+
+def _push(*rows):
+    return {"action": "PushMarketOrder", "result": [{"table": "MarketOrder", "data": row} for row in rows]}
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError("condition not met in time")
+
+
+class FakeClient:
+    """get_order_book that fails ``failures`` times, then waits for ``release`` and returns ``snapshot``."""
+
+    def __init__(self, snapshot, failures=0):
+        self.snapshot = snapshot
+        self.failures = failures
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.requested = threading.Event()
+
+    def get_order_book(self, inst_id, sz):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("snapshot unavailable")
+        self.requested.set()
+        self.release.wait(5)
+        return {"code": "0", "data": self.snapshot}
+
+
+SNAPSHOT = {"bids": [["100", "1"], ["99", "2"]], "asks": [["101", "1"], ["102", "3"]]}
+
+
+def test_book_keeps_levels_sorted_best_first():
+    book = LocalOrderBook("BTCUSDT")
+    book.apply_snapshot([["99", "1"], ["100", "2"], ["98", "3"]], [["102", "1"], ["101", "2"]])
+    book.update("0", 100.5, 4)
+    book.update("1", 101, 0)
+
+    bids, asks = book.depth(10)
+    assert bids == [(100.5, 4), (100.0, 2.0), (99.0, 1.0), (98.0, 3.0)]
+    assert asks == [(102.0, 1.0)]
+    assert book.mid_price() == pytest.approx(101.25)
+    assert book.spread() == pytest.approx(1.5)
+    assert not book.is_crossed()
+
+    book.update("0", 102, 1)
+    assert book.is_crossed()
+
+
+def test_snapshot_then_incremental_rows():
+    books = OrderBookManager(FakeClient(SNAPSHOT))
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(lambda: book.is_synced)
+
+    books.on_message(_push(_row("0", 100, 0), _row("1", 100.5, 2)))
+    assert book.best_bid() == (99.0, 2.0)
+    assert book.best_ask() == (100.5, 2.0)
+
+
+def test_failed_snapshot_is_retried_and_stale_buffered_rows_dropped():
+    client = FakeClient(SNAPSHOT, failures=2)
+    client.release.clear()
+    books = OrderBookManager(client, retry_delay=0.05)
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+
+    # Arrives while the first attempts fail: older than the snapshot that finally succeeds.
+    books.on_message(_push(_row("0", 100, 7)))
+    _wait_for(client.requested.is_set)
+    # Arrives after the successful request went out: replayed on top of it.
+    books.on_message(_push(_row("1", 101, 5)))
+    assert not book.is_synced
+    client.release.set()
+    _wait_for(lambda: book.is_synced)
+
+    assert client.calls == 3
+    assert book.best_bid() == (100.0, 1.0)
+    assert book.best_ask() == (101.0, 5.0)
+    assert books.resync_count == 1
+
+
+def test_untracked_book_stops_retrying():
+    client = FakeClient(SNAPSHOT, failures=10**6)
+    books = OrderBookManager(client, retry_delay=0.01, max_retry_delay=0.01)
+    books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(lambda: client.calls >= 2)
+    books.untrack("BTCUSDT")
+    time.sleep(0.05)
+    calls = client.calls
+    time.sleep(0.05)
+    assert client.calls == calls
+
+
+def test_sequence_gap_triggers_resync():
+    client = FakeClient(SNAPSHOT)
+    books = OrderBookManager(client, sequence_getter=lambda message: message.get("seq"))
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(lambda: book.is_synced)
+
+    books.on_message({**_push(_row("0", 100, 3)), "seq": 1})
+    books.on_message({**_push(_row("0", 100, 4)), "seq": 2})
+    assert client.calls == 1
+    books.on_message({**_push(_row("0", 100, 5)), "seq": 4})
+    _wait_for(lambda: books.resync_count == 2)
+    assert client.calls == 2
+
+
+def test_crossed_book_triggers_resync():
+    client = FakeClient(SNAPSHOT)
+    books = OrderBookManager(client)
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(lambda: book.is_synced)
+
+    books.on_message(_push(_row("0", 105, 1)))
+    _wait_for(lambda: books.resync_count == 2)
+    assert not book.is_crossed()
+
+
+def test_reconnect_resyncs_attached_books():
+    client = FakeClient(SNAPSHOT)
+    books = OrderBookManager(client)
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(lambda: book.is_synced)
+
+    ws = DeepcoinWebsocketManager("ws://127.0.0.1:1/unused")
+    books.attach(ws)
+    assert ws.subscriptions() == [Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, "BTCUSDT")]
+
+    ws._on_open()          # first connect: nothing was missed
+    assert books.resync_count == 1
+    ws._on_close()
+    ws._on_open()          # reconnect: pushes may have been lost
+    _wait_for(lambda: books.resync_count == 2)
+    assert client.calls == 2
+
+
+def test_resync_requested_during_fetch_takes_another_snapshot():
+    client = FakeClient(SNAPSHOT)
+    client.release.clear()
+    books = OrderBookManager(client)
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(client.requested.is_set)
+
+    books.resync("BTCUSDT")            # e.g. a reconnect while the first snapshot is in flight
+    client.release.set()
+    _wait_for(lambda: book.is_synced)
+
+    assert client.calls == 2
+    assert books.resync_count == 1
+
+
+def test_crossed_book_found_while_resync_thread_finishes_is_not_lost():
+    client = FakeClient(SNAPSHOT)
+    crossed = []
+
+    def on_update(book):
+        # Runs on the resync thread right after the book is marked synced.
+        if not crossed:
+            crossed.append(True)
+            books.on_message(_push(_row("0", 105, 1)))
+
+    books = OrderBookManager(client, on_update=on_update)
+    book = books.track("BTCUSDT", inst_id="BTC-USDT-SWAP")
+    _wait_for(lambda: books.resync_count == 2)
+    _wait_for(lambda: book.is_synced)
+    assert not book.is_crossed()
+    assert client.calls == 2
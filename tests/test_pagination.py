@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+from deepcoin.client import Client
+from deepcoin.exceptions import DeepcoinRequestException
+from deepcoin.utils.pagination import page_records, paginate, paginate_async
+
+
+def _pages(records, size):
+    """fetch_page over ``records`` (newest first) where the cursor is the index to start from."""
+    calls = []
+
+    def fetch(cursor):
+        start = cursor or 0
+        calls.append(start)
+        return {"code": "0", "data": records[start:start + size]}
+
+    return fetch, calls
+
+
+def _next_index(size):
+    return lambda cursor, page: (cursor or 0) + size if len(page) >= size else None
+
+
+def test_page_records_shapes():
+    assert page_records({"data": [1, 2]}) == [1, 2]
+    assert page_records({"data": {"list": [3]}}) == [3]
+    assert page_records({"data": None}) == []
+    assert page_records([4]) == [4]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_paginate_follows_cursors_until_a_short_page(prefetch):
+    fetch, calls = _pages(list(range(25)), 10)
+    assert list(paginate(fetch, _next_index(10), prefetch=prefetch)) == list(range(25))
+    assert calls == [0, 10, 20]
+
+
+def test_paginate_is_lazy_and_prefetches_one_page():
+    fetch, calls = _pages(list(range(100)), 10)
+    records = paginate(fetch, _next_index(10))
+    assert [next(records) for _ in range(3)] == [0, 1, 2]
+    for _ in range(100):
+        if len(calls) == 2:
+            break
+        time.sleep(0.01)
+    assert calls == [0, 10]
+    records.close()
+
+
+def test_stop_and_duplicate_keys():
+    fetch, _ = _pages(list(range(30)), 10)
+    assert list(paginate(fetch, _next_index(10), stop=lambda r: r >= 15, prefetch=False)) == list(range(15))
+
+    pages = {None: [5, 4, 3], 3: [3, 2, 1], 1: [1]}
+    records = paginate(lambda c: {"data": pages[c]}, lambda c, page: page[-1], key=lambda r: r, prefetch=False)
+    assert list(records) == [5, 4, 3, 2, 1]
+
+
+def test_cursor_error_is_raised_after_the_page_is_yielded():
+    def next_cursor(cursor, page):
+        raise DeepcoinRequestException("stuck")
+
+    seen = []
+    with pytest.raises(DeepcoinRequestException):
+        for record in paginate(lambda c: {"data": [1, 2]}, next_cursor):
+            seen.append(record)
+    assert seen == [1, 2]
+
+
+def test_paginate_async():
+    records = list(range(25))
+
+    async def fetch(cursor):
+        start = cursor or 0
+        return {"data": records[start:start + 10]}
+
+    async def collect():
+        return [r async for r in paginate_async(fetch, _next_index(10))]
+
+    assert asyncio.run(collect()) == records
+
+
+def _bill(bill_id, ts):
+    return {"billId": str(bill_id), "ts": str(ts)}
+
+
+def _bills_client(bills, limit):
+    """Client whose get_bills serves ``bills`` (newest first) with an exclusive `after` timestamp."""
+    client = Client()
+    calls = []
+
+    def get_bills(inst_type, ccy=None, type=None, after=None, before=None, limit=None):
+        calls.append(after)
+        older = [b for b in bills if after is None or int(b["ts"]) < after]
+        return {"code": "0", "data": older[:limit]}
+
+    client.get_bills = get_bills
+    return client, calls
+
+
+def test_iter_bills_keeps_bills_sharing_the_page_boundary_millisecond():
+    bills = [_bill(9, 105), _bill(8, 104), _bill(7, 103), _bill(6, 103), _bill(5, 102), _bill(4, 102), _bill(3, 101)]
+    client, calls = _bills_client(bills, limit=3)
+    result = [b["billId"] for b in client.iter_bills("SWAP", limit=3, prefetch=False)]
+    assert result == ["9", "8", "7", "6", "5", "4", "3"]
+    assert calls == [None, 104, 103, 102]
+
+
+def test_iter_bills_raises_when_a_millisecond_holds_more_than_a_page():
+    bills = [_bill(9, 105)] + [_bill(i, 103) for i in range(8, 3, -1)] + [_bill(1, 101)]
+    client, _ = _bills_client(bills, limit=3)
+    seen = []
+    with pytest.raises(DeepcoinRequestException, match="share timestamp 103"):
+        for bill in client.iter_bills("SWAP", limit=3, prefetch=False):
+            seen.append(bill["billId"])
+    assert seen == ["9", "8", "7", "6"]
+
+
+def test_iter_funding_rate_history_pages_by_number():
+    client = Client()
+    pages = {1: [{"r": 1}, {"r": 2}], 2: [{"r": 3}, {"r": 4}], 3: [{"r": 5}]}
+    client.get_funding_rate_history = lambda inst_id, page, size: {"data": pages[page]}
+    assert [r["r"] for r in client.iter_funding_rate_history("BTC-USDT-SWAP", size=2)] == [1, 2, 3, 4, 5]
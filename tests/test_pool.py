@@ -0,0 +1,97 @@
+import threading
+
+from deepcoin.ws.enums import TopicID
+from deepcoin.ws.pool import DeepcoinWebsocketPool
+from deepcoin.ws.subscriptions import Subscription
+
+BOOK = Subscription(TopicID.ORDERBOOK_25_INCREMENTAL.value, "BTCUSDT")
+
+
+def _ack(payload):
+    return {"action": "RecvTopicAction", "result": [{"table": "Action", "data": {**payload, "ErrorID": 0, "ErrorMsg": ""}}]}
+
+
+def _pool(acks=True):
+    """Two-shard pool whose connections are faked: sends are recorded and (optionally) acked."""
+    pool = DeepcoinWebsocketPool("ws://127.0.0.1:1/unused", shards=2, rebalance_interval=None, ack_timeout=0.2)
+    sent = []
+    for index, (shard, front) in enumerate(zip(pool.shards, pool._fronts)):
+        def send(message, index=index, front=front):
+            action = message["SendTopicAction"]
+            sent.append((index, action["Action"], action["FilterValue"]))
+            if acks:
+                front.dispatch(_ack(action))
+        shard.connection.send = send
+        shard.connection.is_alive = lambda: True
+    return pool, sent
+
+
+def _make_hot(pool, hot):
+    cold = 1 - hot
+    pool._utilization[hot], pool._utilization[cold] = 0.9, 0.0
+    pool._rates[hot], pool._rates[cold] = 1000.0, 0.0
+    pool._key_rates = {("PushMarketOrder", "BTCUSDT"): 400.0}
+
+
+def test_rebalance_subscribes_before_unsubscribing_and_reports_the_gap():
+    pool, sent = _pool()
+    gaps = []
+    pool.add_gap_hook(gaps.append)
+    pool.subscribe_orderbook("BTCUSDT")
+    hot = pool.shard_of(TopicID.ORDERBOOK_25_INCREMENTAL, "BTCUSDT")
+    cold = 1 - hot
+    sent.clear()
+    _make_hot(pool, hot)
+
+    assert pool.rebalance()
+    assert sent == [(cold, "1", "DeepCoin_BTCUSDT"), (hot, "2", "DeepCoin_BTCUSDT")]
+    assert pool.shard_of(TopicID.ORDERBOOK_25_INCREMENTAL, "BTCUSDT") == cold
+    assert gaps == [[BOOK]]
+    assert pool.moves == 1
+
+
+def test_rebalance_without_ack_keeps_the_subscription():
+    pool, sent = _pool(acks=False)
+    gaps = []
+    pool.add_gap_hook(gaps.append)
+    pool.subscribe_orderbook("BTCUSDT")
+    hot = pool.shard_of(TopicID.ORDERBOOK_25_INCREMENTAL, "BTCUSDT")
+    cold = 1 - hot
+    sent.clear()
+    _make_hot(pool, hot)
+
+    assert not pool.rebalance()
+    assert sent == [(cold, "1", "DeepCoin_BTCUSDT"), (cold, "2", "DeepCoin_BTCUSDT")]
+    assert pool.shard_of(TopicID.ORDERBOOK_25_INCREMENTAL, "BTCUSDT") == hot
+    assert BOOK in pool.shards[hot].subscriptions()
+    assert BOOK not in pool.shards[cold].subscriptions()
+    assert gaps == []
+
+
+def test_shard_counters_are_consistent_under_concurrent_dispatch():
+    pool, _ = _pool()
+    pool.register_callback("PushMarketTrade", lambda message: None)
+    front = pool._fronts[0]
+    message = {"action": "PushMarketTrade", "result": [{"data": {"InstrumentID": "BTCUSDT"}}]}
+    taken = []
+    done = threading.Event()
+
+    def feed():
+        for _ in range(20_000):
+            front.dispatch(message)
+
+    def monitor():
+        while not done.is_set():
+            taken.append(front.take_counters()[0])
+
+    threads = [threading.Thread(target=feed) for _ in range(2)]
+    watcher = threading.Thread(target=monitor)
+    watcher.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    done.set()
+    watcher.join()
+    taken.append(front.take_counters()[0])
+    assert sum(taken) == 40_000
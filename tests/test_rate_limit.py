@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from deepcoin import rate_limit
+from deepcoin.exceptions import DeepcoinRateLimitException
+from deepcoin.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+def test_bucket_allows_a_burst_then_queues_waiters_in_order(clock):
+    bucket = TokenBucket(rate=10, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+    assert bucket.tokens == pytest.approx(-2)
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=3)
+    for _ in range(3):
+        bucket.reserve()
+    clock.now += 0.15
+    assert bucket.tokens == pytest.approx(1.5)
+    clock.now += 60
+    assert bucket.tokens == pytest.approx(3)
+
+
+def test_reserve_over_max_wait_takes_nothing(clock):
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.reserve()
+    assert bucket.reserve(max_wait=0.5) is None
+    assert bucket.tokens == pytest.approx(0)
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(1.0)
+
+
+def test_invalid_bucket():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+def test_longest_prefix_wins_and_unknown_paths_are_free(clock):
+    limiter = RateLimiter({"/deepcoin/": (100, 100), "/deepcoin/trade/": (1, 1)})
+    assert limiter.bucket_for("/deepcoin/trade/order") is limiter.buckets["/deepcoin/trade/"]
+    assert limiter.bucket_for("/deepcoin/market/tickers") is limiter.buckets["/deepcoin/"]
+    assert limiter.bucket_for("/other") is None
+    for _ in range(50):
+        limiter.acquire("/other")
+    assert clock.slept == []
+
+
+def test_blocking_acquire_sleeps_for_the_reserved_wait(clock):
+    limiter = RateLimiter({"/deepcoin/trade/": (2, 1)})
+    limiter.acquire("/deepcoin/trade/order")
+    limiter.acquire("/deepcoin/trade/order")
+    limiter.acquire("/deepcoin/trade/order")
+    assert clock.slept == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+def test_non_blocking_and_timeout_raise(clock):
+    limiter = RateLimiter({"/deepcoin/trade/": (2, 1)}, block=False)
+    limiter.acquire("/deepcoin/trade/order")
+    with pytest.raises(DeepcoinRateLimitException) as info:
+        limiter.acquire("/deepcoin/trade/order")
+    assert info.value.path == "/deepcoin/trade/order"
+    assert info.value.retry_after == pytest.approx(0.5)
+
+    limiter = RateLimiter({"/deepcoin/trade/": (2, 1)}, timeout=0.3)
+    limiter.acquire("/deepcoin/trade/order")
+    with pytest.raises(DeepcoinRateLimitException):
+        limiter.acquire("/deepcoin/trade/order")
+
+
+def test_acquire_async_waits_without_blocking(clock, monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter({"/deepcoin/market/": (4, 1)})
+
+    async def run():
+        await limiter.acquire_async("/deepcoin/market/books")
+        await limiter.acquire_async("/deepcoin/market/books")
+
+    asyncio.run(run())
+    assert waits == [pytest.approx(0.25)]
+    assert clock.slept == []
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from deepcoin.ws.dispatcher import MessageDispatcher
+from deepcoin.ws.recorder import FrameRecorder, FrameReplayer
+
+
+class FakeConnection:
+    def __init__(self):
+        self.hooks = ()
+
+    def add_message_hook(self, hook):
+        self.hooks += (hook,)
+
+    def remove_message_hook(self, hook):
+        self.hooks = tuple(h for h in self.hooks if h != hook)
+
+    def receive(self, raw):
+        for hook in self.hooks:
+            hook(raw)
+
+
+class FakeShard:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+
+class FakePool:
+    def __init__(self, n):
+        self.shards = [FakeShard() for _ in range(n)]
+
+
+def _push(symbol):
+    return json.dumps({"action": "PushMarketTrade", "result": [{"data": {"InstrumentID": symbol}}]})
+
+
+def test_round_trip_keeps_connection_index(tmp_path):
+    recorder = FrameRecorder(str(tmp_path), flush_interval=0.01)
+    pool = recorder.attach(FakePool(2))
+    pool.shards[0].connection.receive(_push("BTCUSDT"))
+    pool.shards[1].connection.receive(_push("ETHUSDT"))
+    pool.shards[1].connection.receive(b"\x00binary")
+    recorder.stop()
+
+    assert all(shard.connection.hooks == () for shard in pool.shards)
+    frames = list(FrameReplayer(str(tmp_path)).frames())
+    assert [(conn, raw) for _, conn, raw in frames] == [
+        (0, _push("BTCUSDT")), (1, _push("ETHUSDT")), (1, b"\x00binary"),
+    ]
+    assert frames[0][0] <= frames[1][0] <= frames[2][0]
+
+    received = []
+    dispatcher = MessageDispatcher()
+    dispatcher.register("PushMarketTrade", received.append)
+    assert FrameReplayer(str(tmp_path)).replay(dispatcher, speed=None, connection=1) == 1
+    assert received[0]["result"][0]["data"]["InstrumentID"] == "ETHUSDT"
+
+
+def test_full_queue_drops_and_counts(tmp_path):
+    recorder = FrameRecorder(str(tmp_path), max_queued=3)
+    for i in range(5):                       # writer not started: nothing drains the queue
+        recorder.record(f"frame {i}")
+    assert recorder.dropped == 2
+
+    recorder.start()
+    recorder.stop()
+    assert [raw for _, _, raw in FrameReplayer(str(tmp_path)).frames()] == ["frame 0", "frame 1", "frame 2"]
+
+
+def test_truncated_segment_is_read_up_to_last_complete_block(tmp_path):
+    recorder = FrameRecorder(str(tmp_path), block_bytes=1, flush_interval=0.01)
+    recorder.start()
+    for i in range(3):
+        recorder.record(f"frame {i}")
+    recorder.stop()
+    (path,) = recorder.segments
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    assert [raw for _, _, raw in FrameReplayer(path).frames()] == ["frame 0", "frame 1"]
+
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "frames-other.dcws"
+    path.write_bytes(b"NOTAREC!" + b"\0" * 16)
+    with pytest.raises(ValueError):
+        list(FrameReplayer(str(path)).frames())
@@ -0,0 +1,135 @@
+import json
+
+import pytest
+import requests
+
+from deepcoin import client as client_module
+from deepcoin.client import Client
+from deepcoin.exceptions import DeepcoinAPIException, DeepcoinRateLimitException, DeepcoinRequestException
+from deepcoin.retry import RetryPolicy
+
+
+def _response(status=200, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body if body is not None else {"code": "0", "data": []}).encode()
+    response.headers.update(headers or {})
+    return response
+
+
+def _api_error(code=None, status=200, headers=None):
+    response = _response(status, {"code": str(code) if code is not None else None, "msg": "x"}, headers)
+    return DeepcoinAPIException(response, status, response.text)
+
+
+class FakeSession:
+    """Returns (or raises) the queued outcomes in order and records every call."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def _call(self, method, uri, **kwargs):
+        self.calls.append((method, uri))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def get(self, uri, **kwargs):
+        return self._call("get", uri, **kwargs)
+
+    def post(self, uri, **kwargs):
+        return self._call("post", uri, **kwargs)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(client_module.time, "sleep", slept.append)
+    return slept
+
+
+def _client(session, **policy):
+    client = Client("key", "secret", "passphrase", retry_policy=RetryPolicy(**policy))
+    client.session = session
+    return client
+
+
+@pytest.mark.parametrize("error, kind", [
+    (_api_error(50102), "resign"),
+    (_api_error(50011), "rejected"),
+    (_api_error(status=429), "rejected"),
+    (_api_error(50013), "transient"),
+    (_api_error(status=503), "transient"),
+    (_api_error(51000), None),
+    (_api_error(status=400), None),
+    (requests.ConnectTimeout(), "rejected"),
+    (requests.ReadTimeout(), "transient"),
+    (requests.ConnectionError(), "transient"),
+    (DeepcoinRequestException("Invalid Response"), "transient"),
+    (DeepcoinRateLimitException("/deepcoin/trade/order", 1.0), None),
+    (ValueError("bug"), None),
+])
+def test_classify(error, kind):
+    assert RetryPolicy().classify(error) == kind
+
+
+def test_idempotent_get_is_retried_after_transient_errors(sleeps):
+    session = FakeSession(requests.ConnectionError(), _response(503, {"msg": "busy"}), _response())
+    client = _client(session, max_attempts=3)
+    assert client.get_tickers("SWAP") == {"code": "0", "data": []}
+    assert len(session.calls) == 3
+    assert len(sleeps) == 2 and all(0 < s <= 2.0 for s in sleeps)
+
+
+def test_non_idempotent_post_is_not_retried_when_outcome_unknown(sleeps):
+    session = FakeSession(requests.ReadTimeout(), _response())
+    client = _client(session)
+    with pytest.raises(requests.ReadTimeout):
+        client.place_order("BTC-USDT-SWAP", "cross", "buy", "limit", "1", px="1", pos_side="long", mrg_position="merge")
+    assert len(session.calls) == 1
+
+
+def test_post_with_client_order_id_is_retried(sleeps):
+    session = FakeSession(requests.ReadTimeout(), _response())
+    client = _client(session)
+    client.place_order("BTC-USDT-SWAP", "cross", "buy", "limit", "1", px="1", pos_side="long", mrg_position="merge", cl_ord_id="abc")
+    assert len(session.calls) == 2
+
+
+def test_rejected_requests_honour_retry_after_and_resign_is_immediate(sleeps):
+    session = FakeSession(
+        _response(429, {"code": "50011", "msg": "slow down"}, {"Retry-After": "1.5"}),
+        _response(200, {"code": "50102", "msg": "expired"}),
+        _response(),
+    )
+    client = _client(session, max_attempts=3, max_total_time=10)
+    client.get_tickers("SWAP")
+    assert sleeps == [1.5, 0.0]
+
+
+def test_fatal_errors_and_exhausted_attempts_raise(sleeps):
+    client = _client(FakeSession(_response(200, {"code": "51000", "msg": "bad param"})))
+    with pytest.raises(DeepcoinAPIException):
+        client.get_tickers("SWAP")
+    assert sleeps == []
+
+    session = FakeSession(*[requests.ConnectionError() for _ in range(3)])
+    client = _client(session, max_attempts=2)
+    with pytest.raises(requests.ConnectionError):
+        client.get_tickers("SWAP")
+    assert len(session.calls) == 2
+
+
+def test_no_retry_scheduled_past_the_deadline(sleeps):
+    session = FakeSession(_response(429, {"code": "50011"}, {"Retry-After": "30"}), _response())
+    client = _client(session, max_total_time=5)
+    with pytest.raises(DeepcoinAPIException):
+        client.get_tickers("SWAP")
+    assert len(session.calls) == 1
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)